@@ -1,9 +1,34 @@
-from .intelligent_client import IntelligentDriveClient
-from .executor import ScriptExecutor
-from .skill_loader import SkillLoader
-from .client import DriveClient
+"""
+Google Drive Forge.
 
-# Alias for branding
-ForgeClient = IntelligentDriveClient
+Public classes are imported on first access, so importing the package (or a light submodule
+such as skill_runtime) does not load the Google API client stack.
+"""
+import importlib
 
-__all__ = ["IntelligentDriveClient", "ForgeClient", "ScriptExecutor", "SkillLoader", "DriveClient"]
\ No newline at end of file
+_EXPORTS = {
+    "IntelligentDriveClient": ".intelligent_client",
+    "ForgeClient": ".intelligent_client",
+    "ScriptExecutor": ".executor",
+    "SkillLoader": ".skill_loader",
+    "DriveClient": ".client",
+    "MetadataMirror": ".mirror",
+    "TransferEngine": ".transfer",
+    "AsyncDriveClient": ".async_client",
+    "RequestScheduler": ".scheduler",
+}
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # Alias for branding
+    attr = "IntelligentDriveClient" if name == "ForgeClient" else name
+    value = getattr(importlib.import_module(module, __name__), attr)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(list(globals()) + list(_EXPORTS))
+
+__all__ = list(_EXPORTS)
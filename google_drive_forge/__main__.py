@@ -1,13 +1,16 @@
 import logging
 import os
 import sys
+import threading
 from mcp.server.fastmcp import FastMCP
-from .intelligent_client import IntelligentDriveClient
-from .tools import register_tools, register_intelligent_tools
+from .tools import register_tools, register_intelligent_tools, register_async_tools
 from .resources import register_resources
 from .executor import ScriptExecutor
+from .skill_runtime import ClientBroker
 from .skill_loader import SkillLoader
 from .audit import AuditLogger
+from .lazy import Lazy
+from .metrics import instrument_server, serve_prometheus
 
 # Configure logging
 logging.basicConfig()
@@ -33,18 +36,55 @@ if not PYTHON_EXE:
         PYTHON_EXE = sys.executable
 
 AUDIT_LOG = os.getenv("GOOGLE_DRIVE_AUDIT_LOG", os.path.join(PROJECT_ROOT, "docs/research/intelligent_audit.log"))
+MIRROR_DIR = os.getenv("GOOGLE_DRIVE_MIRROR_DIR")
+QUOTA_PER_MINUTE = os.getenv("GOOGLE_DRIVE_QUOTA_PER_MINUTE")
+SKILL_WORKERS = int(os.getenv("GOOGLE_DRIVE_SKILL_WORKERS", "2"))
+ASYNC_TOOLS = os.getenv("GOOGLE_DRIVE_ASYNC_TOOLS", "false").lower() in ("1", "true", "yes")
+METRICS_PORT = os.getenv("GOOGLE_DRIVE_METRICS_PORT")
+CONTENT_CACHE_DIR = os.getenv("GOOGLE_DRIVE_CONTENT_CACHE_DIR")
+CONTENT_CACHE_MB = int(os.getenv("GOOGLE_DRIVE_CONTENT_CACHE_MB", "1024"))
+
+def _build_scheduler():
+    from .scheduler import RequestScheduler
+    return RequestScheduler(quota_per_minute=float(QUOTA_PER_MINUTE)) if QUOTA_PER_MINUTE else RequestScheduler()
+
+def _build_content_cache():
+    from .content_cache import ContentCache, DEFAULT_CACHE_DIR
+    return ContentCache(CONTENT_CACHE_DIR or DEFAULT_CACHE_DIR, max_bytes=CONTENT_CACHE_MB * 1024 * 1024)
+
+def _build_client():
+    # Imported here: the Google API client stack is the slowest part of startup
+    from .intelligent_client import IntelligentDriveClient
+    from .mirror import MetadataMirror
+    mirror = MetadataMirror(MIRROR_DIR) if MIRROR_DIR else None
+    return IntelligentDriveClient(audit=audit, mirror=mirror, scheduler=scheduler.get(),
+                                  content_cache=content_cache.get() if content_cache else None)
+
+def _build_async_client():
+    from .async_client import AsyncDriveClient
+    # Shares the sync client's caches, path resolver and mirror, so writes through either are seen by both
+    return AsyncDriveClient(audit=audit, sync_client=client.get())
 
 try:
-    # Initialize Core Components
+    # Initialize Core Components. Tools are registered straight away; clients, credentials and
+    # skill workers are created on first use or by warm_up() once the server is running.
     audit = AuditLogger(AUDIT_LOG)
-    client = IntelligentDriveClient(audit=audit)
-    executor = ScriptExecutor(PYTHON_EXE, SKILLS_DIR)
+    scheduler = Lazy(_build_scheduler)
+    # Shared by the sync and async clients; GOOGLE_DRIVE_CONTENT_CACHE_MB=0 turns it off
+    content_cache = Lazy(_build_content_cache) if CONTENT_CACHE_MB > 0 else None
+    client = Lazy(_build_client)
+    # Skills reach the server's client (caches, rate limiter, audit) through the broker
+    broker = ClientBroker(client)
     loader = SkillLoader(SKILLS_DIR)
+    executor = ScriptExecutor(PYTHON_EXE, SKILLS_DIR, workers=SKILL_WORKERS, broker=broker, loader=loader)
     
-    # Register Components
-    register_tools(mcp, client)
+    # Register Components (every tool registered from here on is timed)
+    instrument_server(mcp)
+    # With async tools on, the tools that have an async version use it and the rest stay sync
+    async_tools = register_async_tools(mcp, Lazy(_build_async_client)) if ASYNC_TOOLS else frozenset()
+    register_tools(mcp, client, skip=async_tools)
     register_resources(mcp, client)
-    register_intelligent_tools(mcp, client, executor, loader, audit)
+    register_intelligent_tools(mcp, client, executor, loader, audit, skip=async_tools)
     
 except Exception as e:
     logger.error(f"Failed to initialize server components: {e}")
@@ -52,7 +92,27 @@ except Exception as e:
     def status() -> str:
         return f"Server failed to initialize: {str(e)}. Please check setup."
 
+def warm_up():
+    """
+    Loads credentials, imports the Drive stack and starts the mirror sync and skill workers.
+    Runs in the background so the MCP handshake is not held up; tools that arrive first
+    simply trigger the same initialization themselves.
+    """
+    try:
+        from googleapiclient import discovery  # noqa: F401
+        client.get().creds
+        client.start_mirror_sync()
+        executor.start()
+    except Exception as e:
+        logger.error(f"Background warm-up failed: {e}")
+
 def main():
+    if METRICS_PORT:
+        try:
+            serve_prometheus(int(METRICS_PORT))
+        except (OSError, ValueError) as e:
+            logger.error(f"Could not start the metrics endpoint on port {METRICS_PORT}: {e}")
+    threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
     mcp.run()
 
 if __name__ == "__main__":
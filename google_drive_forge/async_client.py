@@ -0,0 +1,515 @@
+import os
+import json
+import uuid
+import asyncio
+import logging
+import mimetypes
+from typing import List, Dict, Any, Optional, Union, AsyncIterator
+
+import httpx
+
+from .auth import get_credentials
+from .cache import TTLCache
+from .mirror import FILE_FIELDS
+from .audit import AuditLogger
+from .batch import TRANSIENT_STATUSES, RATE_LIMIT_REASONS
+from .scheduler import RequestScheduler, CALL_COST, EXPORT_COST, UPLOAD_COST
+from .metrics import METRICS, timed
+from .content_cache import ContentCache, VERSION_FIELDS, content_version
+from .paths import PathResolver, Lookup, FIND
+from .extract import EXTRACTED_FORMAT, export_format_for, extract_text
+from .intelligent_client import IntelligentDriveClient
+from .client import (
+    METADATA_FIELDS, MAX_PAGE_SIZE, DEFAULT_CHUNK_SIZE, DEFAULT_EXPORT_MIME_TYPES, FOLDER_MIME_TYPE,
+    escape_query_value, upload_session_path
+)
+
+logger = logging.getLogger(__name__)
+
+API_URL = "https://www.googleapis.com/drive/v3"
+UPLOAD_URL = "https://www.googleapis.com/upload/drive/v3"
+
+def _is_rate_limited(response: httpx.Response) -> bool:
+    if response.status_code == 429:
+        return True
+    return response.status_code == 403 and any(r in response.text for r in RATE_LIMIT_REASONS)
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    try:
+        return max(0.0, float(response.headers["Retry-After"]))
+    except (KeyError, ValueError):
+        return None
+
+_VERBS = {"GET": "get", "POST": "create", "PATCH": "update", "PUT": "update", "DELETE": "delete"}
+
+def _method_name(method: str, url: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """Names a REST call like the discovery client does, e.g. 'files.list' or 'files.export'."""
+    parts = httpx.URL(url).path.strip('/').split('/')
+    rest = parts[parts.index('v3') + 1:] if 'v3' in parts else parts
+    if not rest or not rest[0]:
+        return method
+    resource = rest[0]
+    if parts[0] == 'upload':
+        return f"{resource}.upload"
+    if len(rest) > 2:
+        return f"{resource}.{rest[2]}"
+    if method == "GET":
+        if len(rest) == 1:
+            return f"{resource}.list"
+        return f"{resource}.get_media" if (params or {}).get("alt") == "media" else f"{resource}.get"
+    return f"{resource}.{_VERBS.get(method, method.lower())}"
+
+class AsyncDriveClient:
+    """
+    Non-blocking Drive client on httpx, mirroring the DriveClient surface.
+    Requests share one connection pool, so many calls can be in flight on a single event loop.
+    Pass the sync client as `sync_client` to share its scheduler (so both count against the
+    same quota), metadata and path caches, content cache and metadata mirror: writes through
+    either client then invalidate what both have cached.
+    """
+    def __init__(self, audit: Optional[AuditLogger] = None, creds=None, api_url: str = API_URL,
+                 upload_url: str = UPLOAD_URL, max_connections: int = 20,
+                 metadata_cache_ttl: float = 300.0, path_cache_ttl: float = 300.0,
+                 scheduler: Optional[RequestScheduler] = None,
+                 content_cache: Optional[ContentCache] = None,
+                 sync_client: Optional[IntelligentDriveClient] = None):
+        self.audit = audit
+        self.sync_client = sync_client
+        self._creds = creds
+        self.api_url = api_url.rstrip('/')
+        self.upload_url = upload_url.rstrip('/')
+        self._http = httpx.AsyncClient(
+            timeout=httpx.Timeout(60.0, connect=10.0),
+            limits=httpx.Limits(max_connections=max_connections),
+        )
+        self._refresh_lock = asyncio.Lock()
+        if sync_client is not None:
+            self.scheduler = scheduler or sync_client.scheduler
+            self.content_cache = content_cache or sync_client.content_cache
+            self._metadata_cache = sync_client._metadata_cache
+            self.paths = sync_client.paths
+        else:
+            self.scheduler = scheduler or RequestScheduler()
+            self.content_cache = content_cache
+            self._metadata_cache = TTLCache(maxsize=256, ttl=metadata_cache_ttl)
+            self.paths = PathResolver(audit=audit, ttl=path_cache_ttl)
+
+    async def aclose(self):
+        await self._http.aclose()
+
+    async def _auth_headers(self) -> Dict[str, str]:
+        creds = self._creds
+        if creds is None:
+            # Loading may read token.json, refresh or even start a login; keep it off the event loop
+            creds = self._creds = await asyncio.to_thread(get_credentials)
+        if not creds.valid:
+            async with self._refresh_lock:
+                if not creds.valid:
+                    from google.auth.transport.requests import Request
+                    # google-auth refresh is blocking; keep it off the event loop
+                    await asyncio.to_thread(creds.refresh, Request())
+        return {"Authorization": f"Bearer {creds.token}"}
+
+    async def _request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None,
+                       cost: float = CALL_COST, max_retries: Optional[int] = None, **kwargs) -> httpx.Response:
+        """Sends a request under the rate limiter, retrying throttling, 5xx and dropped connections."""
+        max_retries = self.scheduler.max_retries if max_retries is None else max_retries
+        name = _method_name(method, url, kwargs.get("params"))
+        attempt = 0
+        while True:
+            attempt += 1
+            if attempt > 1:
+                METRICS.record_retry("api", name)
+            await self.scheduler.acquire_async(cost)
+            all_headers = await self._auth_headers()
+            all_headers.update(headers or {})
+            try:
+                with timed("api", name) as timer:
+                    response = await self._http.request(method, url, headers=all_headers, **kwargs)
+                    timer.failed = response.status_code >= 400 and response.status_code != 308
+            except httpx.TransportError:
+                if attempt > max_retries:
+                    raise
+                delay = self.scheduler.backoff(attempt)
+            else:
+                if response.status_code < 400 or response.status_code == 308:
+                    self.scheduler.record_success()
+                    return response
+                rate_limited = _is_rate_limited(response)
+                if attempt > max_retries or not (rate_limited or response.status_code in TRANSIENT_STATUSES):
+                    response.raise_for_status()
+                delay = self.scheduler.backoff(attempt, rate_limited=rate_limited, server_wait=_retry_after(response))
+            logger.warning(f"{method} {url} failed (attempt {attempt}); retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    # --- Listing ---
+
+    async def iter_files(self, query: Optional[str] = None, fields: str = FILE_FIELDS,
+                         page_size: int = MAX_PAGE_SIZE) -> AsyncIterator[Dict[str, Any]]:
+        """Streams files matching a query, fetching pages lazily. Trashed files are excluded."""
+        q = f"({query}) and trashed = false" if query else "trashed = false"
+        params = {"q": q, "pageSize": max(1, min(page_size, MAX_PAGE_SIZE)), "fields": f"nextPageToken, files({fields})"}
+        while True:
+            data = (await self._request("GET", f"{self.api_url}/files", params=params)).json()
+            for f in data.get('files', []):
+                yield f
+            if not data.get('nextPageToken'):
+                return
+            params["pageToken"] = data['nextPageToken']
+
+    async def _from_mirror(self, method: str, *args) -> Optional[List[Dict[str, Any]]]:
+        """
+        Answers a read from the sync client's metadata mirror, as DriveClient does, or returns
+        None when there is no populated mirror. SQLite and the mirror's catch-up sync are blocking,
+        so both run on a worker thread.
+        """
+        sync = self.sync_client
+        if sync is None or not sync.mirror:
+            return None
+
+        def read():
+            return getattr(sync.mirror, method)(*args) if sync._mirror_ready() else None
+        return await asyncio.to_thread(read)
+
+    async def list_files(self, query: str = None, limit: Optional[int] = 10) -> List[Dict[str, Any]]:
+        if not query:
+            mirrored = await self._from_mirror("recent", limit)
+            if mirrored is not None:
+                return mirrored
+        files = []
+        page_size = MAX_PAGE_SIZE if limit is None else limit
+        async for f in self.iter_files(query, page_size=page_size):
+            files.append(f)
+            if limit is not None and len(files) >= limit:
+                break
+        return files
+
+    async def list_folder_children(self, folder_id: str, limit: Optional[int] = 100) -> List[Dict[str, Any]]:
+        mirrored = await self._from_mirror("children", folder_id, limit)
+        if mirrored is not None:
+            return mirrored
+        return await self.list_files(query=f"'{folder_id}' in parents", limit=limit)
+
+    async def find_by_name(self, name: str, parent_id: Optional[str] = None, limit: Optional[int] = 10) -> List[Dict[str, Any]]:
+        mirrored = await self._from_mirror("find_by_name", name, parent_id, limit)
+        if mirrored is not None:
+            return mirrored
+        query = f"name = '{escape_query_value(name)}'"
+        if parent_id:
+            query += f" and '{parent_id}' in parents"
+        return await self.list_files(query=query, limit=limit)
+
+    async def search(self, text: str, limit: Optional[int] = 20) -> List[Dict[str, Any]]:
+        """Full-text search of the sync client's mirror when it is populated, otherwise a name search."""
+        mirrored = await self._from_mirror("search", text, limit)
+        if mirrored is not None:
+            return mirrored
+        return await self.list_files(query=f"name contains '{escape_query_value(text)}'", limit=limit)
+
+    async def get_file_metadata(self, file_id: str) -> Dict[str, Any]:
+        meta = self._metadata_cache.get(file_id)
+        if meta is None:
+            response = await self._request("GET", f"{self.api_url}/files/{file_id}", params={"fields": METADATA_FIELDS})
+            meta = response.json()
+            self._metadata_cache.set(file_id, meta)
+        return meta
+
+    # --- Content ---
+
+    async def _media_url(self, file_id: str, export_mime_type: Optional[str], mime_type: Optional[str] = None):
+        """Returns (url, params, is_export) for a file's content."""
+        if mime_type is None:
+            mime_type = (await self.get_file_metadata(file_id)).get('mimeType')
+        if mime_type in DEFAULT_EXPORT_MIME_TYPES:
+            target_mime = export_mime_type or DEFAULT_EXPORT_MIME_TYPES[mime_type]
+            return f"{self.api_url}/files/{file_id}/export", {"mimeType": target_mime}, True
+        return f"{self.api_url}/files/{file_id}", {"alt": "media"}, False
+
+    async def download_file(self, file_id: str, export_mime_type: Optional[str] = None) -> bytes:
+        mime_type = version = None
+        if self.content_cache is not None:
+            # One cheap call decides whether the cached copy is still current (see DriveClient.download_file)
+            response = await self._request("GET", f"{self.api_url}/files/{file_id}", params={"fields": VERSION_FIELDS})
+            meta = response.json()
+            mime_type, version = meta.get('mimeType'), content_version(meta)
+        url, params, is_export = await self._media_url(file_id, export_mime_type, mime_type=mime_type)
+        export_format = params.get("mimeType")
+        if version:
+            content = await asyncio.to_thread(self.content_cache.get, file_id, version, export_format)
+            if content is not None:
+                return content
+        content = (await self._request("GET", url, params=params, cost=EXPORT_COST if is_export else CALL_COST)).content
+        METRICS.add_bytes("download", len(content))
+        if version:
+            await asyncio.to_thread(self.content_cache.put, file_id, version, content, export_format)
+        return content
+
+    async def extract_text(self, file_id: str) -> Optional[Dict[str, Any]]:
+        """Plain text of a file, cached per revision; see DriveClient.extract_text."""
+        response = await self._request("GET", f"{self.api_url}/files/{file_id}", params={"fields": VERSION_FIELDS})
+        meta = response.json()
+        mime_type, version = meta.get('mimeType'), content_version(meta)
+        if self.content_cache is not None:
+            cached = await asyncio.to_thread(self.content_cache.get, file_id, version, EXTRACTED_FORMAT)
+            if cached is not None:
+                return {"name": meta.get('name'), "mimeType": mime_type, "text": cached.decode('utf-8')}
+        content = await self.download_file(file_id, export_mime_type=export_format_for(mime_type))
+        # Parsing a large PDF or workbook is CPU-bound; keep it off the event loop
+        text = await asyncio.to_thread(extract_text, mime_type, content)
+        if text is None:
+            return None
+        if self.content_cache is not None:
+            await asyncio.to_thread(self.content_cache.put, file_id, version, text.encode('utf-8'), EXTRACTED_FORMAT)
+        return {"name": meta.get('name'), "mimeType": mime_type, "text": text}
+
+    async def download_range(self, file_id: str, offset: int = 0, length: Optional[int] = None,
+                             export_mime_type: Optional[str] = None, mime_type: Optional[str] = None) -> bytes:
+        """Bytes [offset, offset + length) of a file; see DriveClient.download_range."""
+        if length == 0:
+            return b''
+        url, params, is_export = await self._media_url(file_id, export_mime_type, mime_type=mime_type)
+        if is_export:
+            content = await self.download_file(file_id, export_mime_type=export_mime_type)
+            return content[offset:None if length is None else offset + length]
+        end = '' if length is None else offset + length - 1
+        try:
+            response = await self._request("GET", url, params=params, headers={"Range": f"bytes={offset}-{end}"})
+        except httpx.HTTPStatusError as error:
+            if error.response.status_code == 416:
+                return b''
+            raise
+        METRICS.add_bytes("download", len(response.content))
+        return response.content
+
+    async def download_to_path(self, file_id: str, dest_path: str, export_mime_type: Optional[str] = None,
+                               chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, Any]:
+        """
+        Streams content to `<dest_path>.part` and renames it into place once it holds the whole
+        object. Throttling, 5xx and dropped connections are retried like _request; binary
+        downloads resume from the bytes already in the .part file, exports restart from zero.
+        """
+        # Uncached: the size decides whether the .part file is complete
+        meta = (await self._request("GET", f"{self.api_url}/files/{file_id}", params={"fields": VERSION_FIELDS})).json()
+        url, params, is_export = await self._media_url(file_id, export_mime_type, mime_type=meta.get('mimeType'))
+        expected = int(meta['size']) if not is_export and 'size' in meta else None
+        part_path = dest_path + '.part'
+        cost = EXPORT_COST if is_export else CALL_COST
+        name = _method_name("GET", url, params)
+        failures = 0
+        while True:
+            offset = os.path.getsize(part_path) if not is_export and os.path.exists(part_path) else 0
+            await self.scheduler.acquire_async(cost)
+            headers = await self._auth_headers()
+            if offset:
+                headers["Range"] = f"bytes={offset}-"
+            try:
+                with timed("api", name) as timer:
+                    async with self._http.stream("GET", url, params=params, headers=headers) as response:
+                        if response.status_code == 416 and offset:
+                            if offset == expected:
+                                break  # The .part file already holds the whole object
+                            # Left over from an older revision of the file; start again
+                            os.remove(part_path)
+                            continue
+                        if response.status_code >= 400:
+                            timer.failed = True
+                            await response.aread()
+                            rate_limited = _is_rate_limited(response)
+                            if failures >= self.scheduler.max_retries or not (
+                                    rate_limited or response.status_code in TRANSIENT_STATUSES):
+                                response.raise_for_status()
+                            delay = self.scheduler.backoff(failures + 1, rate_limited=rate_limited,
+                                                           server_wait=_retry_after(response))
+                        else:
+                            self.scheduler.record_success()
+                            # 206 continues the partial file; a 200 means the server sent everything again
+                            mode = 'ab' if response.status_code == 206 else 'wb'
+                            with open(part_path, mode) as fh:
+                                async for chunk in response.aiter_bytes(chunk_size):
+                                    fh.write(chunk)
+                                    METRICS.add_bytes("download", len(chunk))
+                            break
+            except httpx.TransportError:
+                # Chunks already written stay in the .part file and the retry continues after them
+                if failures >= self.scheduler.max_retries:
+                    raise
+                delay = self.scheduler.backoff(failures + 1)
+            failures += 1
+            METRICS.record_retry("api", name)
+            logger.warning(f"Download of {file_id} failed (attempt {failures}); retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+        size = os.path.getsize(part_path)
+        if expected is not None and size != expected:
+            os.remove(part_path)
+            raise IOError(f"Download of {file_id} holds {size} bytes but the file has {expected}; discarded it")
+        os.replace(part_path, dest_path)
+        return {"path": dest_path, "bytes": size}
+
+    # --- Writes ---
+
+    def _invalidate(self, file_ids: List[str] = (), parents: List[str] = ()):
+        """
+        Drops what a write made stale: metadata and paths, plus the sync client's listings and
+        mirror when one is shared (see DriveClient._invalidate).
+        """
+        if self.sync_client is not None:
+            self.sync_client._invalidate(file_ids=file_ids, parents=parents)
+        else:
+            for file_id in file_ids:
+                self._metadata_cache.pop(file_id)
+        for file_id in file_ids:
+            self.paths.invalidate(file_id=file_id)
+        for parent_id in parents:
+            self.paths.invalidate(parent_id=parent_id)
+
+    async def create_folder(self, name: str, parent_id: str = 'root') -> Dict[str, Any]:
+        body = {'name': name, 'mimeType': FOLDER_MIME_TYPE, 'parents': [parent_id]}
+        response = await self._request("POST", f"{self.api_url}/files", params={"fields": "id, name, webViewLink"}, json=body)
+        self._invalidate(parents=[parent_id])
+        return response.json()
+
+    async def upload_file(self, name: str, content: Union[str, bytes], parent_id: str = 'root', mime_type: str = 'text/plain') -> Dict[str, Any]:
+        """Multipart upload of in-memory content."""
+        data = content.encode('utf-8') if isinstance(content, str) else content
+        boundary = uuid.uuid4().hex
+        metadata = json.dumps({'name': name, 'parents': [parent_id]}).encode('utf-8')
+        body = b"".join([
+            f"--{boundary}\r\nContent-Type: application/json; charset=UTF-8\r\n\r\n".encode(), metadata,
+            f"\r\n--{boundary}\r\nContent-Type: {mime_type}\r\n\r\n".encode(), data,
+            f"\r\n--{boundary}--".encode(),
+        ])
+        response = await self._request(
+            "POST", f"{self.upload_url}/files",
+            params={"uploadType": "multipart", "fields": "id, name, webViewLink"},
+            headers={"Content-Type": f"multipart/related; boundary={boundary}"},
+            content=body,
+            cost=UPLOAD_COST,
+        )
+        METRICS.add_bytes("upload", len(data))
+        self._invalidate(parents=[parent_id])
+        return response.json()
+
+    async def upload_from_local(self, local_path: str, parent_id: str = 'root', name: Optional[str] = None,
+                                mime_type: Optional[str] = None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, Any]:
+        """
+        Resumable chunked upload streamed from disk.
+        The session URI is saved under UPLOAD_SESSION_DIR, keyed like DriveClient.upload_from_local,
+        so an interrupted upload of the same unchanged file continues where it stopped.
+        """
+        name = name or os.path.basename(local_path)
+        mime_type = mime_type or mimetypes.guess_type(local_path)[0] or 'application/octet-stream'
+        stat = os.stat(local_path)
+        total = stat.st_size
+        session_file = upload_session_path(
+            f"create|{os.path.abspath(local_path)}|{total}|{stat.st_mtime_ns}|{parent_id}|{name}")
+
+        async def start_session() -> str:
+            start = await self._request(
+                "POST", f"{self.upload_url}/files",
+                params={"uploadType": "resumable", "fields": "id, name, webViewLink, size, md5Checksum"},
+                headers={"X-Upload-Content-Type": mime_type, "X-Upload-Content-Length": str(total)},
+                json={'name': name, 'parents': [parent_id]},
+                cost=UPLOAD_COST,
+            )
+            with open(session_file, 'w') as f:
+                json.dump({'uri': start.headers["Location"]}, f)
+            return start.headers["Location"]
+
+        try:
+            with open(session_file) as f:
+                session_uri = json.load(f)['uri']
+        except (OSError, ValueError, KeyError):
+            session_uri = await start_session()
+            query = False
+        else:
+            logger.info(f"Resuming upload session for {local_path}")
+            # Ask the session how many bytes it already has before sending any
+            query = True
+
+        offset = 0
+        failures = 0
+        with open(local_path, 'rb') as fh:
+            while True:
+                fh.seek(offset)
+                chunk = b'' if query else fh.read(chunk_size)
+                end = offset + len(chunk) - 1
+                content_range = f"bytes {offset}-{end}/{total}" if chunk else f"bytes */{total}"
+                try:
+                    # Not retried blindly: after a failure Drive may hold part of the chunk
+                    response = await self._request("PUT", session_uri, headers={"Content-Range": content_range},
+                                                   content=chunk, cost=UPLOAD_COST, max_retries=0)
+                except (httpx.TransportError, httpx.HTTPStatusError) as error:
+                    status = getattr(getattr(error, 'response', None), 'status_code', None)
+                    if status in (404, 410):
+                        # Session expired (they last about a week); start a fresh one
+                        logger.warning(f"Upload session for {local_path} expired. Restarting upload.")
+                        session_uri = await start_session()
+                        offset, query = 0, False
+                        continue
+                    if status is not None and status not in TRANSIENT_STATUSES:
+                        raise
+                    failures += 1
+                    if failures > self.scheduler.max_retries:
+                        raise
+                    await asyncio.sleep(self.scheduler.backoff(failures, rate_limited=status == 429))
+                    query = True
+                    continue
+                failures = 0
+                query = False
+                METRICS.add_bytes("upload", len(chunk))
+                if response.status_code in (200, 201):
+                    break
+                # 308 Resume Incomplete: the Range header holds the committed bytes
+                committed = response.headers.get("Range")
+                offset = int(committed.split('-')[1]) + 1 if committed else 0
+
+        try:
+            os.remove(session_file)
+        except OSError:
+            pass
+        self._invalidate(parents=[parent_id])
+        return response.json()
+
+    async def trash_file(self, file_id: str) -> Dict[str, Any]:
+        response = await self._request(
+            "PATCH", f"{self.api_url}/files/{file_id}", params={"fields": "id, name, parents"}, json={'trashed': True}
+        )
+        result = response.json()
+        self._invalidate(file_ids=[file_id], parents=result.get('parents', []))
+        return result
+
+    async def move_file(self, file_id: str, new_parent_id: str) -> Dict[str, Any]:
+        meta = (await self._request("GET", f"{self.api_url}/files/{file_id}", params={"fields": "parents"})).json()
+        params = {
+            "addParents": new_parent_id,
+            "removeParents": ",".join(meta.get('parents', [])),
+            "fields": "id, name, parents",
+        }
+        response = await self._request("PATCH", f"{self.api_url}/files/{file_id}", params=params, json={})
+        self._invalidate(file_ids=[file_id], parents=meta.get('parents', []) + [new_parent_id])
+        return response.json()
+
+    # --- Paths ---
+
+    async def _lookup(self, lookup: Lookup) -> List[Dict[str, Any]]:
+        """Answers a PathResolver lookup."""
+        if lookup[0] == FIND:
+            return await self.find_by_name(lookup[1], parent_id=lookup[2])
+        return await self.list_folder_children(lookup[1], limit=None)
+
+    async def find_and_heal_path(self, path: str) -> Optional[str]:
+        return (await self.resolve_path(path))["id"]
+
+    async def resolve_path(self, path: str, suggestions: int = 5, heal: bool = True) -> Dict[str, Any]:
+        """
+        Resolves a human-readable path to a file ID; see IntelligentDriveClient.resolve_path.
+        Uses the same PathResolver, so the result and the caches are shared with the sync client.
+        """
+        steps = self.paths.resolve(path, suggestions=suggestions, heal=heal)
+        try:
+            lookup = next(steps)
+            while True:
+                lookup = steps.send(await self._lookup(lookup))
+        except StopIteration as done:
+            return done.value
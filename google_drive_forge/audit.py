@@ -1,27 +1,176 @@
 import os
+import json
+import time
+import queue
+import struct
+import atexit
+import bisect
 import datetime
 import logging
+import threading
+from collections import deque
+from typing import Any, Dict, List, Optional
 
 logger = logging.getLogger(__name__)
 
+# Index entries are (epoch seconds, byte offset of the record), appended to "<log>.idx"
+INDEX_ENTRY = struct.Struct("<dQ")
+# A new index entry is written once this many bytes of records follow the previous one
+INDEX_INTERVAL_BYTES = 64 * 1024
+
 class AuditLogger:
-    def __init__(self, audit_log_path: str):
+    """
+    Non-blocking audit log. log_event() only puts the record on a queue; a background thread
+    writes queued records in batches as JSON Lines, with one fsync per batch.
+    The file is rotated when it reaches `max_bytes` or is older than `rotate_interval`
+    seconds, keeping `backups` old files. A sparse (time, offset) index next to each file
+    lets query() seek straight to the start of a time range.
+    """
+    def __init__(self, audit_log_path: str, max_bytes: int = 10 * 1024 * 1024,
+                 rotate_interval: float = 24 * 3600, backups: int = 5):
         self.audit_log_path = audit_log_path
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.backups = backups
         # Ensure directory exists
         os.makedirs(os.path.dirname(audit_log_path), exist_ok=True)
 
-    def log_event(self, event_type: str, details: str, status: str = "INFO"):
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        # File state, only touched by the writer thread (and query() for reading the index)
+        self._file = None
+        self._index = None
+        self._size = 0
+        self._last_indexed = -INDEX_INTERVAL_BYTES
+        self._started_at: Optional[float] = None
+
+    # --- Writing ---
+
+    def log_event(self, event_type: str, details: str, status: str = "INFO", **fields: Any):
         """
-        Logs an intelligent operation event.
+        Logs an intelligent operation event. Extra keyword fields are stored with the record.
         """
-        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        log_entry = f"[{timestamp}] [{status}] [{event_type}] {details}\n"
-        
-        try:
-            with open(self.audit_log_path, "a") as f:
-                f.write(log_entry)
-        except Exception as e:
-            logger.error(f"Failed to write to audit log: {e}")
+        now = time.time()
+        record = {
+            "ts": datetime.datetime.fromtimestamp(now).astimezone().isoformat(timespec="milliseconds"),
+            "epoch": now,
+            "status": status,
+            "event": event_type,
+            "details": details,
+        }
+        if fields:
+            record["fields"] = fields
+        self._ensure_writer()
+        self._queue.put(record)
+
+    def _ensure_writer(self):
+        if self._writer is None:
+            with self._writer_lock:
+                if self._writer is None:
+                    self._writer = threading.Thread(target=self._write_loop, name="audit-writer", daemon=True)
+                    self._writer.start()
+                    atexit.register(self.close)
+
+    def _write_loop(self):
+        while True:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            records = [r for r in batch if r is not None]
+            try:
+                if records:
+                    self._write_batch(records)
+            except Exception as e:
+                logger.error(f"Failed to write to audit log: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if len(records) < len(batch):
+                self._close_files()
+                return
+
+    def _write_batch(self, records: List[Dict[str, Any]]):
+        if self._file is None:
+            self._open()
+        for record in records:
+            if self._should_rotate(record["epoch"]):
+                self._rotate()
+                self._open()
+            line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+            if self._size - self._last_indexed >= INDEX_INTERVAL_BYTES:
+                self._index.write(INDEX_ENTRY.pack(record["epoch"], self._size))
+                self._last_indexed = self._size
+            if self._started_at is None:
+                self._started_at = record["epoch"]
+            self._file.write(line)
+            self._size += len(line)
+        self._file.flush()
+        self._index.flush()
+        os.fsync(self._file.fileno())
+        os.fsync(self._index.fileno())
+
+    def _open(self):
+        index_path = self._index_path(self.audit_log_path)
+        has_records = os.path.exists(self.audit_log_path) and os.path.getsize(self.audit_log_path) > 0
+        if has_records and not os.path.exists(index_path):
+            # Plain-text log from an older version: move it out of the way
+            self._rotate()
+        self._file = open(self.audit_log_path, "ab")
+        self._index = open(index_path, "ab")
+        self._size = self._file.tell()
+        self._last_indexed = -INDEX_INTERVAL_BYTES
+        self._started_at = None
+        entries = self._read_index(index_path)
+        if entries:
+            self._started_at = entries[0][0]
+            self._last_indexed = entries[-1][1]
+
+    def _should_rotate(self, now: float) -> bool:
+        if self._size == 0:
+            return False
+        if self._size >= self.max_bytes:
+            return True
+        return self._started_at is not None and now - self._started_at >= self.rotate_interval
+
+    def _rotate(self):
+        """Shifts <log> to <log>.1, <log>.1 to <log>.2 and so on, together with their indexes."""
+        self._close_files()
+        for suffix in ("", ".idx"):
+            numbered = lambda i: f"{self.audit_log_path}.{i}{suffix}"
+            if os.path.exists(numbered(self.backups)):
+                os.remove(numbered(self.backups))
+            for i in range(self.backups - 1, 0, -1):
+                if os.path.exists(numbered(i)):
+                    os.replace(numbered(i), numbered(i + 1))
+            current = self.audit_log_path + suffix
+            if os.path.exists(current):
+                if self.backups > 0:
+                    os.replace(current, numbered(1))
+                else:
+                    os.remove(current)
+
+    def _close_files(self):
+        for f in (self._file, self._index):
+            if f:
+                f.close()
+        self._file = self._index = None
+
+    def flush(self):
+        """Blocks until every queued record has been written."""
+        if self._writer is not None:
+            self._queue.join()
+
+    def close(self):
+        """Writes the remaining records and stops the writer thread."""
+        with self._writer_lock:
+            writer, self._writer = self._writer, None
+        if writer is not None and writer.is_alive():
+            self._queue.put(None)
+            writer.join(timeout=10)
 
     def log_recovery(self, original_id: str, recovered_name: str, success: bool):
         """
@@ -35,3 +184,72 @@ class AuditLogger:
         Specific log for new skill forging.
         """
         self.log_event("SKILL_FORGE", f"New capability created: {skill_name}")
+
+    # --- Querying ---
+
+    @staticmethod
+    def _index_path(log_path: str) -> str:
+        return log_path + ".idx"
+
+    @staticmethod
+    def _read_index(index_path: str) -> List[tuple]:
+        try:
+            with open(index_path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return []
+        usable = len(data) - len(data) % INDEX_ENTRY.size
+        return list(INDEX_ENTRY.iter_unpack(data[:usable]))
+
+    def _log_files(self) -> List[str]:
+        """Current and rotated log files, oldest first."""
+        files = [f"{self.audit_log_path}.{i}" for i in range(self.backups, 0, -1)]
+        files.append(self.audit_log_path)
+        return [f for f in files if os.path.exists(f)]
+
+    def query(self, event_type: Optional[str] = None, since: Optional[float] = None,
+              until: Optional[float] = None, status: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Returns the most recent `limit` records (oldest first) matching the filters.
+        `since` and `until` are epoch seconds.
+        """
+        self.flush()
+        matches: deque = deque(maxlen=limit)
+        for path in self._log_files():
+            entries = self._read_index(self._index_path(path))
+            if entries and until is not None and entries[0][0] > until:
+                # Every later file starts later still
+                break
+            offset = 0
+            if entries and since is not None:
+                # Last indexed record at or before `since`; earlier records cannot match
+                position = bisect.bisect_right([epoch for epoch, _ in entries], since) - 1
+                if position >= 0:
+                    offset = entries[position][1]
+            if self._scan(path, offset, matches, event_type, since, until, status):
+                break
+        return list(matches)
+
+    @staticmethod
+    def _scan(path: str, offset: int, matches: deque, event_type: Optional[str], since: Optional[float],
+              until: Optional[float], status: Optional[str]) -> bool:
+        """Adds matching records from `path` to `matches`. Returns True once past `until`."""
+        with open(path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    epoch = record["epoch"]
+                except (ValueError, KeyError, TypeError):
+                    # Partially written line or an old plain-text entry
+                    continue
+                if since is not None and epoch < since:
+                    continue
+                if until is not None and epoch > until:
+                    return True
+                if event_type and record.get("event") != event_type:
+                    continue
+                if status and record.get("status") != status:
+                    continue
+                matches.append(record)
+        return False
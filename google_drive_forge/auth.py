@@ -1,9 +1,11 @@
 import os
 import json
 import logging
+import threading
+from typing import Optional
 from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
+# google_auth_oauthlib and google.auth.transport.requests (which pulls in requests) are
+# imported where they are used: most runs only need them to refresh or log in.
 
 # Configure logger for this module
 logger = logging.getLogger(__name__)
@@ -16,9 +18,25 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 TOKEN_PATH = os.path.join(BASE_DIR, 'token.json')
 CREDENTIALS_PATH = os.path.join(BASE_DIR, 'credentials.json')
 
+# Credentials are loaded once per process and shared by every client in it
+_credentials: Optional[Credentials] = None
+_credentials_lock = threading.Lock()
+
 def get_credentials() -> Credentials:
     """
-    Retrieves OAuth2 credentials.
+    Retrieves OAuth2 credentials, reusing the ones already loaded in this process.
+    Expired access tokens are refreshed in place by the transport, so the cached object stays
+    usable; token.json is only read again if the cached credentials cannot be refreshed.
+    """
+    global _credentials
+    with _credentials_lock:
+        if _credentials is None or not (_credentials.valid or _credentials.refresh_token):
+            _credentials = _load_credentials()
+        return _credentials
+
+def _load_credentials() -> Credentials:
+    """
+    Loads OAuth2 credentials from token.json.
     Refreshes expired tokens if possible, or triggers a new login flow.
     """
     creds = None
@@ -36,6 +54,7 @@ def get_credentials() -> Credentials:
         if creds and creds.expired and creds.refresh_token:
             logger.info("Refreshing access token...")
             try:
+                from google.auth.transport.requests import Request
                 creds.refresh(Request())
             except Exception as e:
                  logger.warning(f"Error refreshing token: {e}. Initiating new login.")
@@ -59,6 +78,7 @@ def _login_flow() -> Credentials:
             "Please download it from Google Cloud Console and place it there."
         )
 
+    from google_auth_oauthlib.flow import InstalledAppFlow
     flow = InstalledAppFlow.from_client_secrets_file(CREDENTIALS_PATH, SCOPES)
     
     # Check for headless environment
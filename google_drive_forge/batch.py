@@ -0,0 +1,119 @@
+import time
+import logging
+from typing import Any, Callable, Dict, Optional
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from .metrics import METRICS, timed
+
+logger = logging.getLogger(__name__)
+
+# Drive rejects batches with more than 100 sub-requests
+MAX_BATCH_SIZE = 100
+TRANSIENT_STATUSES = {429, 500, 502, 503, 504}
+RATE_LIMIT_REASONS = {"userRateLimitExceeded", "rateLimitExceeded"}
+# Dropped connections and DNS failures. Other httplib2 errors (such as an unexpected redirect) are
+# protocol problems that a retry would only repeat.
+TRANSPORT_ERRORS = (OSError, httplib2.ServerNotFoundError)
+
+def is_transient(error: Exception) -> bool:
+    """True for errors worth retrying: throttling and server-side failures."""
+    if not isinstance(error, HttpError):
+        return False
+    status = error.resp.status
+    if status in TRANSIENT_STATUSES:
+        return True
+    if status == 403:
+        details = getattr(error, "error_details", None) or []
+        reasons = {d.get("reason") for d in details if isinstance(d, dict)}
+        return bool(reasons & RATE_LIMIT_REASONS) or any(r.encode() in (error.content or b"") for r in RATE_LIMIT_REASONS)
+    return False
+
+def retry_after(error: Exception) -> Optional[float]:
+    """Seconds from an HttpError's Retry-After header, if the server sent one."""
+    if not isinstance(error, HttpError):
+        return None
+    value = error.resp.get('retry-after')
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except ValueError:
+        return None
+
+def is_rate_limited(error: Exception) -> bool:
+    """True for 429s and 403s whose reason is a rate limit (quota walls, not permission errors)."""
+    return isinstance(error, HttpError) and is_transient(error) and error.resp.status in (403, 429)
+
+def execute_batched(service, requests: Dict[str, Callable[[], Any]], batch_size: int = MAX_BATCH_SIZE,
+                    max_retries: int = 3, scheduler=None) -> Dict[str, Dict[str, Any]]:
+    """
+    Runs many Drive requests through batch HTTP requests.
+    `requests` maps a key (usually a file ID) to a factory that builds the HttpRequest,
+    so failed items can be rebuilt and retried in a smaller follow-up batch.
+    With a RequestScheduler, every sub-request is charged against the quota and retry
+    delays follow its adaptive backoff.
+    A batch request that fails as a whole only affects its own chunk, whose items are retried
+    (or failed) like item errors.
+    Returns {"succeeded": {key: response}, "failed": {key: error message}}.
+    """
+    batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+    succeeded: Dict[str, Any] = {}
+    failed: Dict[str, str] = {}
+    pending = dict(requests)
+    attempt = 0
+
+    while pending:
+        retry: Dict[str, Exception] = {}
+
+        def callback(request_id, response, exception):
+            if exception is None:
+                succeeded[request_id] = response
+            elif is_transient(exception):
+                retry[request_id] = exception
+            else:
+                failed[request_id] = str(exception)
+
+        keys = list(pending)
+        for start in range(0, len(keys), batch_size):
+            batch = service.new_batch_http_request(callback=callback)
+            chunk = keys[start:start + batch_size]
+            for key in chunk:
+                batch.add(pending[key](), request_id=key)
+            if scheduler:
+                # Drive counts each sub-request of a batch against the quota
+                scheduler.acquire(len(chunk))
+            try:
+                with timed("api", "batch"):
+                    batch.execute()
+            except Exception as error:
+                # The batch request itself failed (a 5xx for the whole batch, a dropped connection):
+                # its items get no callback, so retry them like transient item errors or fail them,
+                # and carry on with the other chunks
+                logger.warning(f"Batch of {len(chunk)} requests failed: {error}")
+                unanswered = [k for k in chunk if k not in succeeded and k not in failed and k not in retry]
+                if is_transient(error) or isinstance(error, TRANSPORT_ERRORS):
+                    retry.update(dict.fromkeys(unanswered, error))
+                else:
+                    failed.update(dict.fromkeys(unanswered, str(error)))
+        if scheduler and succeeded:
+            scheduler.record_success()
+
+        if not retry:
+            break
+        attempt += 1
+        if attempt > max_retries:
+            failed.update({k: str(e) for k, e in retry.items()})
+            break
+        for _ in retry:
+            METRICS.record_retry("api", "batch")
+        if scheduler:
+            # One throttle signal per round, not one per failed item
+            sample = next((e for e in retry.values() if is_rate_limited(e)), next(iter(retry.values())))
+            delay = scheduler.retry_delay(sample, attempt)
+        else:
+            delay = min(2 ** attempt, 30)
+        logger.info(f"Retrying {len(retry)} batched requests in {delay:.1f}s (attempt {attempt}/{max_retries})")
+        time.sleep(delay)
+        pending = {k: requests[k] for k in retry}
+
+    return {"succeeded": succeeded, "failed": failed}
@@ -1,93 +1,498 @@
 import io
+import os
+import json
+import fnmatch
+import shutil
+import socket
+import time
+import hashlib
+import tempfile
+import mimetypes
 import logging
 import functools
-from typing import List, Dict, Any, Optional, Union
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseDownload, MediaFileUpload
+import itertools
+import threading
+from concurrent.futures import as_completed
+from typing import List, Dict, Any, Optional, Union, Iterator, Iterable
+import httplib2
 from googleapiclient.errors import HttpError
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+# googleapiclient.discovery and googleapiclient.http are imported on first use; they are the
+# slowest part of the Drive stack to import and are not needed to start the server.
 
 from .auth import get_credentials
+from .mirror import MetadataMirror, FILE_FIELDS
+from .batch import execute_batched, MAX_BATCH_SIZE
+from .cache import TTLCache
+from .content_cache import ContentCache, VERSION_FIELDS, content_version
+from .extract import EXTRACTED_FORMAT, export_format_for, extract_text
+from .scheduler import RequestScheduler, CALL_COST, EXPORT_COST, UPLOAD_COST, TRANSPORT_ERRORS, method_name
+from .metrics import METRICS, ContextThreadPoolExecutor, timed
 
 # Setup basic logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+METADATA_FIELDS = "id, name, mimeType, parents, owners, modifiedTime, webViewLink, size, exportLinks"
+# Largest pageSize files.list accepts
+MAX_PAGE_SIZE = 1000
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+UPLOAD_SESSION_DIR = os.path.join(tempfile.gettempdir(), "google_drive_forge", "upload_sessions")
+
+FOLDER_MIME_TYPE = 'application/vnd.google-apps.folder'
+
+# Per-entry fields returned by walk() unless the caller asks for others
+WALK_FIELDS = "id, name, mimeType, parents, size, md5Checksum, modifiedTime"
+# Folders OR'd into one files.list query by walk(); keeps the query well under URL limits
+WALK_PARENTS_PER_QUERY = 50
+
+# Where the discovery document points every request, batch and upload URL
+GOOGLE_API_ROOT = "https://www.googleapis.com"
+
+# Export formats used for Google Workspace documents when the caller does not choose one
+DEFAULT_EXPORT_MIME_TYPES = {
+    'application/vnd.google-apps.document': 'application/pdf',
+    'application/vnd.google-apps.spreadsheet': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'application/vnd.google-apps.presentation': 'application/pdf',
+}
+
+def escape_query_value(value: str) -> str:
+    """Escapes a value for a single-quoted string in a files.list query."""
+    return value.replace('\\', '\\\\').replace("'", "\\'")
+
+def upload_session_path(session_key: str) -> str:
+    """File under UPLOAD_SESSION_DIR that holds the resumable session URI of an upload."""
+    os.makedirs(UPLOAD_SESSION_DIR, exist_ok=True)
+    return os.path.join(UPLOAD_SESSION_DIR, hashlib.sha1(session_key.encode()).hexdigest() + ".json")
+
+class _EndpointHttp(httplib2.Http):
+    """httplib2 transport that sends requests meant for googleapis.com to another endpoint."""
+    def __init__(self, endpoint: str, **kwargs):
+        # Set up like googleapiclient.http.build_http: a socket timeout, and 308 excluded from the
+        # redirect codes because resumable uploads answer every incomplete chunk with it
+        from googleapiclient.http import DEFAULT_HTTP_TIMEOUT_SEC
+        kwargs.setdefault('timeout', socket.getdefaulttimeout() or DEFAULT_HTTP_TIMEOUT_SEC)
+        super().__init__(**kwargs)
+        self.redirect_codes = self.redirect_codes - {308}
+        self.endpoint = endpoint.rstrip('/')
+
+    def request(self, uri, *args, **kwargs):
+        if uri.startswith(GOOGLE_API_ROOT):
+            uri = self.endpoint + uri[len(GOOGLE_API_ROOT):]
+        return super().request(uri, *args, **kwargs)
+
 class DriveClient:
-    def __init__(self):
-        self.creds = get_credentials()
-        self.service = build('drive', 'v3', credentials=self.creds)
-
-    @functools.lru_cache(maxsize=128)
-    def _cached_list_files(self, q: str, limit: int) -> List[Dict[str, Any]]:
-        """Internal cached method for listing files."""
-        results = self.service.files().list(
-            q=q,
-            pageSize=limit,
-            fields="nextPageToken, files(id, name, mimeType, parents, owners, modifiedTime, webViewLink, size)"
-        ).execute()
-        return results.get('files', [])
-
-    @retry(
-        retry=retry_if_exception_type(HttpError),
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10)
-    )
-    def list_files(self, query: str = None, limit: int = 10) -> List[Dict[str, Any]]:
-        """
-        Lists files with retry logic.
+    """
+    Drive v3 client. `creds` overrides the process-wide OAuth credentials and `api_endpoint`
+    sends every request (including batches and uploads) to another server, such as
+    fake_drive.FakeDriveServer. With a `content_cache`, downloads of unchanged files are served
+    from disk after a single metadata call.
+    """
+    def __init__(self, mirror: Optional[MetadataMirror] = None, list_cache_ttl: float = 60.0,
+                 metadata_cache_ttl: float = 300.0, scheduler: Optional[RequestScheduler] = None,
+                 creds=None, api_endpoint: Optional[str] = None,
+                 content_cache: Optional[ContentCache] = None):
+        self._local = threading.local()
+        self._creds = creds
+        self.api_endpoint = api_endpoint
+        self.mirror = mirror
+        # Shared by every thread so the whole process stays within one quota
+        self.scheduler = scheduler or RequestScheduler()
+        # (query, limit) -> list of files
+        self._list_cache = TTLCache(maxsize=128, ttl=list_cache_ttl)
+        # file_id -> metadata
+        self._metadata_cache = TTLCache(maxsize=256, ttl=metadata_cache_ttl)
+        self.content_cache = content_cache
+
+    @property
+    def creds(self):
+        """OAuth credentials, loaded on first use (see auth.get_credentials)."""
+        return self._creds or get_credentials()
+
+    @property
+    def service(self):
         """
-        try:
-            # Default query to not show trashed files if no query provided
-            if not query:
-                q = "trashed = false"
+        Drive service for the calling thread.
+        httplib2 connections are not thread-safe, so each thread builds and keeps its own.
+        """
+        service = getattr(self._local, 'service', None)
+        if service is None:
+            from googleapiclient.discovery import build
+            if self.api_endpoint:
+                from google_auth_httplib2 import AuthorizedHttp
+                http = AuthorizedHttp(self.creds, http=_EndpointHttp(self.api_endpoint))
+                service = build('drive', 'v3', http=http)
             else:
-                q = f"({query}) and trashed = false"
+                service = build('drive', 'v3', credentials=self.creds)
+            self._local.service = service
+        return service
+
+    def _execute(self, request, cost: float = CALL_COST) -> Any:
+        """Runs an API request through the rate limiter, retrying transient failures."""
+        return self.scheduler.execute(request, cost=cost)
+
+    def _invalidate(self, file_ids: Iterable[str] = (), parents: Iterable[str] = ()):
+        """
+        Drops cached state made stale by a write: metadata of the written files, listings scoped
+        to any affected folder, and unscoped listings/searches (which may include the files).
+        """
+        file_ids = set(file_ids)
+        parents = set(p for p in parents if p)
+        for file_id in file_ids:
+            self._metadata_cache.pop(file_id)
+        scopes = [f"'{fid}' in parents" for fid in file_ids | parents]
+
+        def affected(key, _value) -> bool:
+            query = key[0] or ""
+            return "in parents" not in query or any(scope in query for scope in scopes)
+
+        self._list_cache.invalidate_where(affected)
+        if self.mirror:
+            self.mirror.mark_stale()
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit, miss and eviction counters for the client caches."""
+        stats = {"list": self._list_cache.stats(), "metadata": self._metadata_cache.stats()}
+        if self.content_cache:
+            stats["content"] = self.content_cache.stats()
+        return stats
+
+    def _mirror_ready(self) -> bool:
+        """Returns True if reads can be answered from the local metadata mirror."""
+        if not self.mirror or not self.mirror.is_populated():
+            return False
+        try:
+            self.mirror.refresh(self.service, execute=self._execute)
+        except HttpError as error:
+            logger.warning(f"Metadata mirror sync failed, falling back to the API: {error}")
+            return False
+        return True
+
+    def sync_mirror(self, full: bool = False) -> Dict[str, Any]:
+        """
+        Crawls the drive into the metadata mirror, or applies pending changes if already populated.
+        """
+        if not self.mirror:
+            raise RuntimeError("Metadata mirror is not configured.")
+        if full or not self.mirror.is_populated():
+            return {"crawled": self.mirror.crawl(self.service, execute=self._execute)}
+        return {"changes": self.mirror.sync(self.service, execute=self._execute)}
+
+    def start_mirror_sync(self) -> Optional[threading.Thread]:
+        """Populates or updates the mirror in a background thread (which gets its own service)."""
+        if not self.mirror:
+            return None
+
+        def _run():
+            try:
+                self.sync_mirror()
+            except Exception as e:
+                logger.error(f"Background mirror sync failed: {e}")
 
-            return self._cached_list_files(q, limit)
+        thread = threading.Thread(target=_run, name="mirror-sync", daemon=True)
+        thread.start()
+        return thread
+
+    def iter_files(self, query: Optional[str] = None, fields: str = FILE_FIELDS,
+                   page_size: int = MAX_PAGE_SIZE, include_trashed: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        Streams files matching a query, fetching the next page only when the previous one is consumed.
+        `fields` is the per-file field mask; stop iterating early to avoid fetching further pages.
+        """
+        if include_trashed:
+            q = query
+        elif not query:
+            q = "trashed = false"
+        else:
+            q = f"({query}) and trashed = false"
+
+        page_token = None
+        while True:
+            results = self._execute(self.service.files().list(
+                q=q,
+                pageSize=max(1, min(page_size, MAX_PAGE_SIZE)),
+                pageToken=page_token,
+                fields=f"nextPageToken, files({fields})"
+            ))
+            yield from results.get('files', [])
+            page_token = results.get('nextPageToken')
+            if not page_token:
+                return
+
+    def walk(self, folder_id: str, max_depth: Optional[int] = None, fields: str = WALK_FIELDS,
+             workers: int = 8) -> Iterator[Dict[str, Any]]:
+        """
+        Yields every file and folder below folder_id, breadth-first, one level at a time.
+        Each level is listed with combined queries ('a' in parents or 'b' in parents ...) of up
+        to WALK_PARENTS_PER_QUERY folders, and those queries run on `workers` threads, so a tree
+        of thousands of folders takes a few hundred requests rather than one per folder.
+        Entries carry `path` (names from folder_id down, joined with '/'), `depth` (1 for direct
+        children) and `parent_id`. Parents are always yielded before their children; an entry
+        with several parents in the tree is yielded once. max_depth=1 lists direct children only.
+        """
+        required = {'id', 'name', 'mimeType', 'parents'}
+        field_list = [f.strip() for f in fields.split(',')]
+        fields = ", ".join(field_list + sorted(required - set(field_list)))
+
+        def list_group(parent_ids: List[str]) -> List[Dict[str, Any]]:
+            query = " or ".join(f"'{pid}' in parents" for pid in parent_ids)
+            return list(self.iter_files(query, fields=fields))
+
+        level = {folder_id: ""}
+        seen = {folder_id}
+        depth = 0
+        pool = ContextThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="drive-walk")
+        try:
+            while level and (max_depth is None or depth < max_depth):
+                depth += 1
+                ids = list(level)
+                futures = [
+                    pool.submit(list_group, ids[start:start + WALK_PARENTS_PER_QUERY])
+                    for start in range(0, len(ids), WALK_PARENTS_PER_QUERY)
+                ]
+                next_level = {}
+                for future in as_completed(futures):
+                    for entry in future.result():
+                        if entry['id'] in seen:
+                            continue
+                        seen.add(entry['id'])
+                        # Listings report real IDs, so an alias such as 'root' only matches at depth 1
+                        parent_id = next((p for p in entry.get('parents', []) if p in level),
+                                         folder_id if depth == 1 else None)
+                        if parent_id is None:
+                            continue
+                        entry['parent_id'] = parent_id
+                        entry['path'] = f"{level[parent_id]}/{entry['name']}".lstrip('/')
+                        entry['depth'] = depth
+                        if entry.get('mimeType') == FOLDER_MIME_TYPE:
+                            next_level[entry['id']] = entry['path']
+                        yield entry
+                level = next_level
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _cached_list_files(self, query: Optional[str], limit: Optional[int]) -> List[Dict[str, Any]]:
+        """Internal cached method for listing files. A limit of None returns every match."""
+        key = (query, limit)
+        files = self._list_cache.get(key)
+        if files is None:
+            page_size = MAX_PAGE_SIZE if limit is None else limit
+            files = list(itertools.islice(self.iter_files(query, page_size=page_size), limit))
+            self._list_cache.set(key, files)
+        return files
+
+    def list_files(self, query: str = None, limit: Optional[int] = 10) -> List[Dict[str, Any]]:
+        """
+        Lists files, following pages until `limit` results (or all, if None).
+        Trashed files are excluded. Transient failures are retried per page by the scheduler.
+        """
+        try:
+            if not query and self._mirror_ready():
+                return self.mirror.recent(limit)
+
+            return self._cached_list_files(query, limit)
         except HttpError as error:
             logger.error(f"An error occurred: {error}")
             raise
 
-    @functools.lru_cache(maxsize=256)
     def get_file_metadata(self, file_id: str) -> Dict[str, Any]:
         """Get detailed metadata for a file."""
-        return self.service.files().get(
-            fileId=file_id,
-            fields="id, name, mimeType, parents, owners, modifiedTime, webViewLink, size, exportLinks"
-        ).execute()
+        meta = self._metadata_cache.get(file_id)
+        if meta is None:
+            meta = self._execute(self.service.files().get(fileId=file_id, fields=METADATA_FIELDS))
+            self._metadata_cache.set(file_id, meta)
+        return meta
+
+    @staticmethod
+    def _export_format(mime_type: Optional[str], export_mime_type: Optional[str] = None) -> Optional[str]:
+        """The MIME type a Google Workspace document is exported as, or None for binary files."""
+        if mime_type in DEFAULT_EXPORT_MIME_TYPES:
+            return export_mime_type or DEFAULT_EXPORT_MIME_TYPES[mime_type]
+        return None
+
+    def _media_request(self, file_id: str, export_mime_type: Optional[str] = None, mime_type: Optional[str] = None):
+        """
+        Builds the content request for a file: an export for Google Workspace documents,
+        a plain media download otherwise. Returns (request, is_export).
+        Pass the file's mime_type when already known to skip the metadata lookup.
+        """
+        if mime_type is None:
+            mime_type = self.get_file_metadata(file_id).get('mimeType')
+
+        # Handle Google Workspace documents (Docs, Sheets, Slides)
+        target_mime = self._export_format(mime_type, export_mime_type)
+        if target_mime:
+            return self.service.files().export_media(fileId=file_id, mimeType=target_mime), True
+
+        # Standard binary download
+        return self.service.files().get_media(fileId=file_id), False
+
+    def _content_version(self, file_id: str) -> Dict[str, Any]:
+        """
+        Fetches the fields identifying the current revision of a file's content.
+        This bypasses the metadata cache: a stale answer would serve stale content.
+        """
+        return self._execute(self.service.files().get(fileId=file_id, fields=VERSION_FIELDS))
 
     def download_file(self, file_id: str, export_mime_type: Optional[str] = None) -> bytes:
         """
         Downloads a file's content.
         Handles binary downloads and Google Workspace document exports.
         """
+        if self.content_cache is None:
+            return self._fetch_content(file_id, export_mime_type)
+        meta = self._content_version(file_id)
+        export_format = self._export_format(meta.get('mimeType'), export_mime_type)
+        version = content_version(meta)
+        content = self.content_cache.get(file_id, version, export_format)
+        if content is None:
+            content = self._fetch_content(file_id, export_mime_type, mime_type=meta.get('mimeType'))
+            self.content_cache.put(file_id, version, content, export_format)
+        return content
+
+    def _fetch_content(self, file_id: str, export_mime_type: Optional[str] = None,
+                       mime_type: Optional[str] = None) -> bytes:
         try:
-            meta = self.get_file_metadata(file_id)
-            mime_type = meta.get('mimeType')
-
-            # Handle Google Workspace documents (Docs, Sheets, Slides)
-            if mime_type == 'application/vnd.google-apps.document':
-                # Default to text/plain if requested or for general text-based use
-                target_mime = export_mime_type or 'application/pdf'
-                request = self.service.files().export_media(fileId=file_id, mimeType=target_mime)
-            elif mime_type == 'application/vnd.google-apps.spreadsheet':
-                target_mime = export_mime_type or 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-                request = self.service.files().export_media(fileId=file_id, mimeType=target_mime)
-            elif mime_type == 'application/vnd.google-apps.presentation':
-                target_mime = export_mime_type or 'application/pdf'
-                request = self.service.files().export_media(fileId=file_id, mimeType=target_mime)
-            else:
-                # Standard binary download
-                request = self.service.files().get_media(fileId=file_id)
+            from googleapiclient.http import MediaIoBaseDownload
+            request, is_export = self._media_request(file_id, export_mime_type, mime_type=mime_type)
+            cost = EXPORT_COST if is_export else CALL_COST
 
             file_io = io.BytesIO()
             downloader = MediaIoBaseDownload(file_io, request)
             done = False
             while done is False:
-                status, done = downloader.next_chunk()
+                # A failed chunk leaves the downloader's progress untouched, so it can be retried as is
+                status, done = self.scheduler.call(downloader.next_chunk, cost=cost, name=method_name(request))
             
-            return file_io.getvalue()
+            content = file_io.getvalue()
+            METRICS.add_bytes("download", len(content))
+            return content
+        except HttpError as error:
+            logger.error(f"Error downloading file {file_id}: {error}")
+            raise
+
+    def extract_text(self, file_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Plain text of a document, PDF, spreadsheet or presentation (see extract.extract_text).
+        With a content cache the text is kept per revision, so a reread costs one metadata call
+        and no export or parsing. Returns {"name", "mimeType", "text"}, or None if the file has
+        no text form.
+        """
+        meta = self._content_version(file_id)
+        mime_type, version = meta.get('mimeType'), content_version(meta)
+        text = None
+        if self.content_cache is not None:
+            cached = self.content_cache.get(file_id, version, EXTRACTED_FORMAT)
+            if cached is not None:
+                text = cached.decode('utf-8')
+        if text is None:
+            export_mime_type = export_format_for(mime_type)
+            if self.content_cache is not None:
+                content = self.download_file(file_id, export_mime_type=export_mime_type)
+            else:
+                content = self._fetch_content(file_id, export_mime_type, mime_type=mime_type)
+            text = extract_text(mime_type, content)
+            if text is None:
+                return None
+            if self.content_cache is not None:
+                self.content_cache.put(file_id, version, text.encode('utf-8'), EXTRACTED_FORMAT)
+            if self.mirror:
+                # Makes the text searchable through search()
+                self.mirror.index_text(file_id, text, meta.get('modifiedTime'))
+        return {"name": meta.get('name'), "mimeType": mime_type, "text": text}
+
+    def download_range(self, file_id: str, offset: int = 0, length: Optional[int] = None,
+                       export_mime_type: Optional[str] = None, mime_type: Optional[str] = None) -> bytes:
+        """
+        Returns `length` bytes of a file's content starting at `offset` (to the end if length is None).
+        Binary files are read with an HTTP Range request, so only the requested bytes are transferred.
+        Exports cannot be ranged; those are downloaded whole (through the content cache) and sliced.
+        """
+        if length == 0:
+            return b''
+        if mime_type is None:
+            mime_type = self.get_file_metadata(file_id).get('mimeType')
+        if self._export_format(mime_type, export_mime_type):
+            content = self.download_file(file_id, export_mime_type=export_mime_type)
+            return content[offset:None if length is None else offset + length]
+
+        request = self.service.files().get_media(fileId=file_id)
+        end = '' if length is None else offset + length - 1
+        request.headers['Range'] = f"bytes={offset}-{end}"
+        try:
+            content = self._execute(request)
+        except HttpError as error:
+            if error.resp.status == 416:
+                # Offset at or past the end of the file
+                return b''
+            logger.error(f"Error downloading file {file_id}: {error}")
+            raise
+        METRICS.add_bytes("download", len(content))
+        return content
+
+    def download_to_path(self, file_id: str, dest_path: str, export_mime_type: Optional[str] = None,
+                         chunk_size: int = DEFAULT_CHUNK_SIZE, max_reconnects: int = 5,
+                         mime_type: Optional[str] = None, version: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Streams a file's content to disk in chunks, so memory use does not grow with file size.
+        Data is written to `<dest_path>.part` and renamed into place once complete. Binary
+        downloads resume from the bytes already in the .part file, both after a dropped
+        connection and across calls. Exports cannot be resumed and restart from zero.
+        With a content cache, pass `version` (see content_cache.content_version) along with
+        `mime_type` when both are already known to skip the version check.
+        """
+        from googleapiclient.http import MediaIoBaseDownload
+        part_path = dest_path + '.part'
+        export_format = None
+        if self.content_cache is not None:
+            if mime_type is None or version is None:
+                meta = self._content_version(file_id)
+                mime_type, version = meta.get('mimeType'), content_version(meta)
+            export_format = self._export_format(mime_type, export_mime_type)
+            cached_path = self.content_cache.lookup(file_id, version, export_format)
+            if cached_path:
+                shutil.copyfile(cached_path, part_path)
+                os.replace(part_path, dest_path)
+                return {"path": dest_path, "bytes": os.path.getsize(dest_path), "cached": True}
+        try:
+            request, is_export = self._media_request(file_id, export_mime_type, mime_type=mime_type)
+            offset = os.path.getsize(part_path) if not is_export and os.path.exists(part_path) else 0
+            if offset:
+                logger.info(f"Resuming download of {file_id} at byte {offset}")
+            cost = EXPORT_COST if is_export else CALL_COST
+            name = method_name(request)
+
+            with open(part_path, 'ab' if offset else 'wb') as fh:
+                downloader = MediaIoBaseDownload(fh, request, chunksize=chunk_size)
+                # MediaIoBaseDownload requests its next Range from _progress
+                downloader._progress = offset
+                done = False
+                failures = 0
+                while not done:
+                    try:
+                        self.scheduler.acquire(cost)
+                        with timed("api", name):
+                            status, done = downloader.next_chunk()
+                        self.scheduler.record_success()
+                        failures = 0
+                    except (HttpError, *TRANSPORT_ERRORS) as error:
+                        if isinstance(error, HttpError) and error.resp.status == 416 and offset:
+                            # The .part file already holds the whole object
+                            break
+                        delay = self.scheduler.retry_delay(error, failures + 1)
+                        if delay is None or failures >= max_reconnects:
+                            raise
+                        failures += 1
+                        METRICS.record_retry("api", name)
+                        # Chunks are only written once fully received, so progress stays consistent
+                        logger.warning(f"Download of {file_id} interrupted at byte {downloader._progress}: {error}. Retrying in {delay:.1f}s")
+                        time.sleep(delay)
+
+            os.replace(part_path, dest_path)
+            size = os.path.getsize(dest_path)
+            METRICS.add_bytes("download", size - offset)
+            if self.content_cache is not None:
+                self.content_cache.put_file(file_id, version, dest_path, export_format)
+            return {"path": dest_path, "bytes": size}
         except HttpError as error:
             logger.error(f"Error downloading file {file_id}: {error}")
             raise
@@ -96,10 +501,12 @@ class DriveClient:
         """Create a new folder."""
         file_metadata = {
             'name': name,
-            'mimeType': 'application/vnd.google-apps.folder',
+            'mimeType': FOLDER_MIME_TYPE,
             'parents': [parent_id]
         }
-        return self.service.files().create(body=file_metadata, fields='id, name, webViewLink').execute()
+        result = self._execute(self.service.files().create(body=file_metadata, fields='id, name, webViewLink'))
+        self._invalidate(parents=[parent_id])
+        return result
 
     def upload_file(self, name: str, content: Union[str, bytes], parent_id: str = 'root', mime_type: str = 'text/plain') -> Dict[str, Any]:
         """Upload a file."""
@@ -117,24 +524,257 @@ class DriveClient:
         from googleapiclient.http import MediaIoBaseUpload
         media = MediaIoBaseUpload(content_bytes, mimetype=mime_type, resumable=True)
 
-        return self.service.files().create(
+        result = self._execute(self.service.files().create(
             body=file_metadata,
             media_body=media,
             fields='id, name, webViewLink'
-        ).execute()
+        ), cost=UPLOAD_COST)
+        METRICS.add_bytes("upload", len(content_bytes.getbuffer()))
+        self._invalidate(parents=[parent_id])
+        return result
+
+    def _execute_resumable(self, request, session_key: str, max_reconnects: int = 5) -> Dict[str, Any]:
+        """
+        Drives a chunked resumable upload to completion.
+        The session URI is saved under UPLOAD_SESSION_DIR after the first chunk, so a later call
+        with the same session_key asks Drive how many bytes it already has and continues from there.
+        """
+        session_file = upload_session_path(session_key)
+        resumed = False
+        if os.path.exists(session_file):
+            with open(session_file) as f:
+                request.resumable_uri = json.load(f)['uri']
+            # In error state, next_chunk first queries the server for the committed byte range
+            request._in_error_state = True
+            resumed = True
+            logger.info(f"Resuming upload session for {session_key}")
+
+        response = None
+        failures = 0
+        name = method_name(request)
+        sent = request.resumable_progress
+        while response is None:
+            try:
+                self.scheduler.acquire(UPLOAD_COST)
+                with timed("api", name):
+                    status, response = request.next_chunk()
+                self.scheduler.record_success()
+                if response is not None:
+                    METRICS.add_bytes("upload", request.resumable.size() - sent)
+                else:
+                    METRICS.add_bytes("upload", request.resumable_progress - sent)
+                    sent = request.resumable_progress
+                failures = 0
+                if response is None and not resumed and request.resumable_uri:
+                    with open(session_file, 'w') as f:
+                        json.dump({'uri': request.resumable_uri}, f)
+                    resumed = True
+            except HttpError as error:
+                if error.resp.status in (404, 410) and request.resumable_uri:
+                    # Session expired (they last about a week); start a fresh one
+                    logger.warning(f"Upload session for {session_key} expired. Restarting upload.")
+                    request.resumable_uri = None
+                    request.resumable_progress = sent = 0
+                    request._in_error_state = False
+                    resumed = False
+                    continue
+                delay = self.scheduler.retry_delay(error, failures + 1)
+                if delay is None or failures >= max_reconnects:
+                    raise
+                failures += 1
+                METRICS.record_retry("api", name)
+                time.sleep(delay)
+            except TRANSPORT_ERRORS as error:
+                delay = self.scheduler.retry_delay(error, failures + 1)
+                if failures >= max_reconnects or not request.resumable_uri:
+                    raise
+                failures += 1
+                METRICS.record_retry("api", name)
+                logger.warning(f"Connection dropped uploading {session_key} at byte {request.resumable_progress}: {error}. Retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+        if os.path.exists(session_file):
+            os.remove(session_file)
+        return response
+
+    def upload_from_local(self, local_path: str, parent_id: str = 'root', name: Optional[str] = None,
+                          mime_type: Optional[str] = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                          file_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Upload a local file by streaming it from disk in resumable chunks.
+        An interrupted upload of the same unchanged file continues where it stopped.
+        With file_id, the file is uploaded as a new revision of that Drive file instead.
+        """
+        from googleapiclient.http import MediaFileUpload
+        name = name or os.path.basename(local_path)
+        mime_type = mime_type or mimetypes.guess_type(local_path)[0] or 'application/octet-stream'
+        stat = os.stat(local_path)
+        media = MediaFileUpload(local_path, mimetype=mime_type, chunksize=chunk_size, resumable=True)
+        fields = 'id, name, mimeType, webViewLink, size, md5Checksum, modifiedTime'
+        if file_id:
+            request = self.service.files().update(fileId=file_id, media_body=media, fields=fields)
+            session_key = f"update|{os.path.abspath(local_path)}|{stat.st_size}|{stat.st_mtime_ns}|{file_id}"
+        else:
+            request = self.service.files().create(
+                body={'name': name, 'parents': [parent_id]},
+                media_body=media,
+                fields=fields
+            )
+            session_key = f"create|{os.path.abspath(local_path)}|{stat.st_size}|{stat.st_mtime_ns}|{parent_id}|{name}"
+        result = self._execute_resumable(request, session_key)
+        self._invalidate(file_ids=[file_id] if file_id else [], parents=[parent_id])
+        return result
 
     def trash_file(self, file_id: str) -> Dict[str, Any]:
         """Move a file to trash."""
         body = {'trashed': True}
-        return self.service.files().update(fileId=file_id, body=body).execute()
+        result = self._execute(self.service.files().update(fileId=file_id, body=body, fields='id, name, parents'))
+        self._invalidate(file_ids=[file_id], parents=result.get('parents', []))
+        return result
+
+    def move_file(self, file_id: str, new_parent_id: str) -> Dict[str, Any]:
+        """Move a file into another folder, detaching it from its current parents."""
+        meta = self._execute(self.service.files().get(fileId=file_id, fields='parents'))
+        previous_parents = ",".join(meta.get('parents', []))
+        result = self._execute(self.service.files().update(
+            fileId=file_id,
+            addParents=new_parent_id,
+            removeParents=previous_parents,
+            fields='id, name, parents'
+        ))
+        self._invalidate(file_ids=[file_id], parents=meta.get('parents', []) + [new_parent_id])
+        return result
+
+    # --- Bulk operations (batched, up to 100 sub-requests per HTTP round trip) ---
+
+    def get_metadata_many(self, file_ids: List[str], fields: str = METADATA_FIELDS,
+                          batch_size: int = MAX_BATCH_SIZE) -> Dict[str, Dict[str, Any]]:
+        """
+        Get metadata for many files in batched requests.
+        Returns {"succeeded": {file_id: metadata}, "failed": {file_id: error}}.
+        """
+        files = self.service.files()
+        requests = {fid: functools.partial(files.get, fileId=fid, fields=fields) for fid in file_ids}
+        return execute_batched(self.service, requests, batch_size=batch_size, scheduler=self.scheduler)
+
+    def update_many(self, updates: Dict[str, Dict[str, Any]], batch_size: int = MAX_BATCH_SIZE) -> Dict[str, Dict[str, Any]]:
+        """
+        Apply files.update to many files in batched requests.
+        `updates` maps a file ID to keyword arguments for files().update (body, addParents, removeParents, fields).
+        """
+        files = self.service.files()
+        requests = {
+            fid: functools.partial(files.update, fileId=fid, **{'fields': 'id, name, parents', **kwargs})
+            for fid, kwargs in updates.items()
+        }
+        result = execute_batched(self.service, requests, batch_size=batch_size, scheduler=self.scheduler)
+        if result["succeeded"]:
+            parents = set()
+            for fid, response in result["succeeded"].items():
+                parents.update(response.get('parents', []))
+                parents.update(updates[fid].get('removeParents', '').split(','))
+            self._invalidate(file_ids=result["succeeded"], parents=parents)
+        return result
+
+    def trash_many(self, file_ids: List[str], batch_size: int = MAX_BATCH_SIZE) -> Dict[str, Dict[str, Any]]:
+        """Move many files to trash in batched requests."""
+        return self.update_many({fid: {'body': {'trashed': True}} for fid in file_ids}, batch_size=batch_size)
 
-    def list_folder_children(self, folder_id: str, limit: int = 100) -> List[Dict[str, Any]]:
+    def move_many(self, file_ids: List[str], new_parent_id: str, batch_size: int = MAX_BATCH_SIZE) -> Dict[str, Dict[str, Any]]:
+        """
+        Move many files into a folder in batched requests.
+        Current parents are looked up in a batch first; lookup failures are reported as failed moves.
+        """
+        lookup = self.get_metadata_many(file_ids, fields='id, parents', batch_size=batch_size)
+        updates = {
+            fid: {'addParents': new_parent_id, 'removeParents': ",".join(meta.get('parents', []))}
+            for fid, meta in lookup["succeeded"].items()
+        }
+        result = self.update_many(updates, batch_size=batch_size)
+        result["failed"].update(lookup["failed"])
+        return result
+
+    def move_files(self, source_folder_id: str, dest_folder_id: str, mime_type: Optional[str] = None,
+                   name_glob: Optional[str] = None, modified_before: Optional[str] = None,
+                   modified_after: Optional[str] = None, dry_run: bool = False, workers: int = 4,
+                   batch_size: int = MAX_BATCH_SIZE) -> Dict[str, Any]:
+        """
+        Moves the children of a folder that match every given filter into another folder.
+        mime_type and the modifiedTime bounds (RFC 3339) are applied by the listing query,
+        name_glob (fnmatch syntax, case-sensitive) locally. Files only leave the source folder;
+        other parents are kept. Updates go out in batches, `workers` batches at a time.
+        With dry_run, returns the plan without changing anything.
+        """
+        started = time.monotonic()
+        query = f"'{source_folder_id}' in parents"
+        if mime_type:
+            query += f" and mimeType = '{escape_query_value(mime_type)}'"
+        if modified_before:
+            query += f" and modifiedTime < '{escape_query_value(modified_before)}'"
+        if modified_after:
+            query += f" and modifiedTime > '{escape_query_value(modified_after)}'"
+
+        plan = [
+            f for f in self.iter_files(query, fields="id, name, mimeType, parents, modifiedTime")
+            if f['id'] != dest_folder_id and (not name_glob or fnmatch.fnmatchcase(f['name'], name_glob))
+        ]
+        summary = {"source": source_folder_id, "destination": dest_folder_id, "matched": len(plan)}
+        if dry_run:
+            summary.update(dry_run=True, plan=plan)
+            return summary
+
+        source_id = source_folder_id
+        if source_id == 'root':
+            # An alias; removeParents needs the real ID, or the file would keep its place in My Drive
+            source_id = self._execute(self.service.files().get(fileId='root', fields='id'))['id']
+        updates = {f['id']: {'addParents': dest_folder_id, 'removeParents': source_id} for f in plan}
+        file_ids = list(updates)
+        groups = [
+            {fid: updates[fid] for fid in file_ids[start:start + batch_size]}
+            for start in range(0, len(file_ids), batch_size)
+        ]
+        succeeded: Dict[str, Any] = {}
+        failed: Dict[str, str] = {}
+        # Each worker thread sends its batches on its own Drive service (see service)
+        with ContextThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="drive-move") as pool:
+            for result in pool.map(lambda group: self.update_many(group, batch_size=batch_size), groups):
+                succeeded.update(result["succeeded"])
+                failed.update(result["failed"])
+
+        names = {f['id']: f['name'] for f in plan}
+        summary.update(
+            moved=len(succeeded),
+            failed=len(failed),
+            seconds=round(time.monotonic() - started, 2),
+            results={
+                "succeeded": {fid: names[fid] for fid in succeeded},
+                "failed": {fid: {"name": names[fid], "error": error} for fid, error in failed.items()},
+            },
+        )
+        return summary
+
+    def list_folder_children(self, folder_id: str, limit: Optional[int] = 100) -> List[Dict[str, Any]]:
         """List all children of a specific folder."""
+        if self._mirror_ready():
+            return self.mirror.children(folder_id, limit)
         query = f"'{folder_id}' in parents"
         return self.list_files(query=query, limit=limit)
 
-    def search(self, text: str, limit: int = 20) -> List[Dict[str, Any]]:
-        """Perform a semantic/name search."""
-        # Simple name contains search for now, can be expanded
-        query = f"name contains '{text}'"
+    def find_by_name(self, name: str, parent_id: Optional[str] = None, limit: Optional[int] = 10) -> List[Dict[str, Any]]:
+        """Find files with an exact name, optionally within a parent folder."""
+        if self._mirror_ready():
+            return self.mirror.find_by_name(name, parent_id, limit)
+        query = f"name = '{escape_query_value(name)}'"
+        if parent_id:
+            query += f" and '{parent_id}' in parents"
+        return self.list_files(query=query, limit=limit)
+
+    def search(self, text: str, limit: Optional[int] = 20) -> List[Dict[str, Any]]:
+        """
+        Searches files. With a populated mirror this is a local, ranked full-text search over
+        names, paths and any extracted text (see MetadataMirror.search); otherwise a name search.
+        """
+        if self._mirror_ready():
+            return self.mirror.search(text, limit)
+        query = f"name contains '{escape_query_value(text)}'"
         return self.list_files(query=query, limit=limit)
@@ -0,0 +1,174 @@
+import os
+import shutil
+import hashlib
+import logging
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join(tempfile.gettempdir(), "google_drive_forge", "content")
+
+# Fields needed to decide whether cached content is still current
+VERSION_FIELDS = "id, name, mimeType, md5Checksum, modifiedTime, size"
+
+def content_version(meta: Dict[str, Any]) -> Optional[str]:
+    """
+    Identifies a revision of a file's content: the md5Checksum for binary files, the
+    modifiedTime for Google Workspace documents (which have no checksum). None if unknown.
+    """
+    return meta.get('md5Checksum') or meta.get('modifiedTime')
+
+def _digest(value: str, length: int) -> str:
+    return hashlib.sha1(value.encode('utf-8')).hexdigest()[:length]
+
+class ContentCache:
+    """
+    Size-capped on-disk LRU cache of file contents.
+    Entries are stored as `<file_id>.<format hash>.<version hash>` files, where the format is the
+    export MIME type (empty for plain downloads), so a new revision of a file replaces the old
+    one instead of sitting beside it. Recency survives restarts through the files' mtimes.
+    Files larger than `max_entry_bytes` are not cached.
+    """
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = 1024 * 1024 * 1024,
+                 max_entry_bytes: Optional[int] = None):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes if max_entry_bytes is not None else max_bytes // 4
+        self._lock = threading.Lock()
+        # entry name -> size, least recently used first
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes_saved = 0
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load()
+
+    def _load(self):
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and not entry.name.endswith('.tmp'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.name, stat.st_size))
+        for _, name, size in sorted(entries):
+            self._entries[name] = size
+            self._bytes += size
+        self._evict()
+
+    @staticmethod
+    def _name(file_id: str, version: str, export_mime_type: Optional[str]) -> str:
+        return f"{file_id}.{_digest(export_mime_type or '', 8)}.{_digest(version, 16)}"
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.cache_dir, name)
+
+    def lookup(self, file_id: str, version: Optional[str], export_mime_type: Optional[str] = None) -> Optional[str]:
+        """Path of the cached content for this version, or None. Counts as a use for LRU."""
+        if not version:
+            return None
+        name = self._name(file_id, version, export_mime_type)
+        with self._lock:
+            size = self._entries.get(name)
+            if size is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(name)
+            self.hits += 1
+            self.bytes_saved += size
+        path = self._path(name)
+        try:
+            os.utime(path)
+        except OSError:
+            # Removed behind our back
+            with self._lock:
+                if self._entries.pop(name, None) is not None:
+                    self._bytes -= size
+            return None
+        return path
+
+    def get(self, file_id: str, version: Optional[str], export_mime_type: Optional[str] = None) -> Optional[bytes]:
+        path = self.lookup(file_id, version, export_mime_type)
+        if path is None:
+            return None
+        try:
+            with open(path, 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def put(self, file_id: str, version: Optional[str], data: bytes, export_mime_type: Optional[str] = None):
+        if not version or len(data) > self.max_entry_bytes:
+            return
+        name = self._name(file_id, version, export_mime_type)
+        tmp_path = self._path(name) + f".{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+        except OSError as e:
+            logger.warning(f"Could not write to the content cache: {e}")
+            return
+        self._commit(name, tmp_path, len(data))
+
+    def put_file(self, file_id: str, version: Optional[str], src_path: str, export_mime_type: Optional[str] = None):
+        """Caches a copy of a downloaded file."""
+        size = os.path.getsize(src_path)
+        if not version or size > self.max_entry_bytes:
+            return
+        name = self._name(file_id, version, export_mime_type)
+        tmp_path = self._path(name) + f".{threading.get_ident()}.tmp"
+        try:
+            shutil.copyfile(src_path, tmp_path)
+        except OSError as e:
+            logger.warning(f"Could not write to the content cache: {e}")
+            return
+        self._commit(name, tmp_path, size)
+
+    def _commit(self, name: str, tmp_path: str, size: int):
+        os.replace(tmp_path, self._path(name))
+        stale_prefix = name.rsplit('.', 1)[0] + '.'
+        with self._lock:
+            # Older revisions of the same file and format are no longer useful
+            for other in [n for n in self._entries if n.startswith(stale_prefix) and n != name]:
+                self._remove(other)
+            previous = self._entries.pop(name, None)
+            if previous is not None:
+                self._bytes -= previous
+            self._entries[name] = size
+            self._bytes += size
+            self._evict()
+
+    def _remove(self, name: str):
+        self._bytes -= self._entries.pop(name)
+        try:
+            os.remove(self._path(name))
+        except OSError:
+            pass
+
+    def _evict(self):
+        while self._bytes > self.max_bytes and self._entries:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def invalidate(self, file_id: str):
+        """Drops every cached version and format of a file."""
+        with self._lock:
+            for name in [n for n in self._entries if n.startswith(file_id + '.')]:
+                self._remove(name)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else None,
+                "evictions": self.evictions,
+                "bytes_saved": self.bytes_saved,
+            }
@@ -1,14 +1,121 @@
 import subprocess
 import os
-import sys
+import json
+import queue
 import logging
+import threading
+import time
+from typing import Optional, Dict, Any, Callable
+
+from .skill_runtime import ClientBroker
+from .skill_loader import SkillLoader
 
 logger = logging.getLogger(__name__)
 
+# __file__ is inside google_drive_forge/, so go up one level to get the package root
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+OutputCallback = Callable[[str], None]
+ProgressCallback = Callable[[Dict[str, Any]], None]
+
+def _skill_env() -> Dict[str, str]:
+    """Environment for skill processes: PYTHONPATH includes the package root so scripts can import google_drive_forge."""
+    env = os.environ.copy()
+    current_pythonpath = env.get("PYTHONPATH", "")
+    if current_pythonpath:
+        env["PYTHONPATH"] = f"{PACKAGE_ROOT}{os.pathsep}{current_pythonpath}"
+    else:
+        env["PYTHONPATH"] = PACKAGE_ROOT
+    return env
+
+def _format_output(stdout: str, stderr: str) -> str:
+    output = stdout
+    if stderr:
+        output += f"\n--- Errors/Warnings ---\n{stderr}"
+    return output if output.strip() else "Script executed successfully with no output."
+
+class _Worker:
+    """A warm skill_worker process. Not thread-safe; the pool hands each worker to one caller at a time."""
+    def __init__(self, python_exe: str):
+        self.runs = 0
+        self.process = subprocess.Popen(
+            [python_exe, "-m", "google_drive_forge.skill_worker"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            env=_skill_env(),
+            cwd=PACKAGE_ROOT,
+        )
+        # Responses are read on a thread so callers can wait with a timeout
+        self._responses: "queue.Queue[Optional[str]]" = queue.Queue()
+        threading.Thread(target=self._read, name="skill-worker-reader", daemon=True).start()
+        self._ready = False
+
+    def _read(self):
+        for line in self.process.stdout:
+            self._responses.put(line)
+        self._responses.put(None)
+
+    def _receive(self, deadline: float) -> Dict[str, Any]:
+        line = self._responses.get(timeout=max(0.0, deadline - time.monotonic()))
+        if line is None:
+            raise RuntimeError(f"skill worker exited with code {self.process.wait()}")
+        return json.loads(line)
+
+    def run(self, script_path: str, args: list, timeout: float, env: Dict[str, str],
+            on_output: Optional[OutputCallback] = None, on_progress: Optional[ProgressCallback] = None) -> Dict[str, Any]:
+        """Runs one script, relaying output and progress events as they arrive. Raises queue.Empty on timeout."""
+        deadline = time.monotonic() + timeout
+        if not self._ready:
+            self._receive(deadline)
+            self._ready = True
+        self.runs += 1
+        self.process.stdin.write(json.dumps({"script": script_path, "args": args, "env": env}) + "\n")
+        self.process.stdin.flush()
+
+        output = {"stdout": "", "stderr": ""}
+        while True:
+            event = self._receive(deadline)
+            kind = event.pop("event")
+            if kind == "done":
+                output["exit_code"] = event["exit_code"]
+                return output
+            if kind == "progress":
+                if on_progress:
+                    on_progress(event)
+            else:
+                output[kind] += event["data"]
+                if on_output:
+                    on_output(event["data"])
+
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def stop(self):
+        if self.alive():
+            self.process.kill()
+        self.process.wait()
+
 class ScriptExecutor:
-    def __init__(self, python_path: str, skills_dir: str):
+    """
+    Runs forged skills. By default skills run in a pool of warm worker processes that have the
+    Drive stack imported and credentials loaded, so a short skill starts in milliseconds.
+    Workers are started by start() (or the first run) and replaced after `max_runs_per_worker`
+    runs, a crash or a timeout.
+    With `workers=0` every run starts a fresh interpreter instead.
+    With a ClientBroker, skills calling skill_runtime.get_client() use the server's client.
+    With a SkillLoader, skills are looked up in its index instead of on disk.
+    """
+    def __init__(self, python_path: str, skills_dir: str, workers: int = 2,
+                 max_runs_per_worker: int = 50, timeout: float = 600.0,
+                 broker: Optional[ClientBroker] = None, loader: Optional[SkillLoader] = None):
         self.skills_dir = skills_dir
-        
+        self.loader = loader
+        self.broker = broker
+        self.workers = workers
+        self.max_runs_per_worker = max_runs_per_worker
+        self.timeout = timeout
+
         # Resolve the actual python executable
         if os.path.isfile(python_path):
             self.python_exe = python_path
@@ -22,52 +129,128 @@ class ScriptExecutor:
                 if not os.path.exists(bin_path):
                     # Second fallback: check if python is in the folder directly
                     bin_path = os.path.join(python_path, "python")
-            
+
             self.python_exe = bin_path if os.path.exists(bin_path) else python_path
-            
+
         logger.info(f"ScriptExecutor initialized with Python: {self.python_exe}")
 
-    def run_skill(self, skill_name: str, args: list = None) -> str:
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._started = False
+        self._start_lock = threading.Lock()
+
+    def start(self):
+        """Starts the client broker and the worker processes, if not already running."""
+        with self._start_lock:
+            if self._started:
+                return
+            self._started = True
+            if self.broker and not self.broker.address:
+                self.broker.start()
+            for _ in range(self.workers):
+                self._spawn()
+
+    def _spawn(self):
+        try:
+            self._idle.put(_Worker(self.python_exe))
+        except OSError as e:
+            logger.error(f"Could not start skill worker: {e}")
+
+    def _respawn_async(self):
+        """Starts a replacement worker without delaying the caller."""
+        threading.Thread(target=self._spawn, name="skill-worker-spawn", daemon=True).start()
+
+    def shutdown(self):
+        """Stops all idle workers."""
+        while True:
+            try:
+                self._idle.get_nowait().stop()
+            except queue.Empty:
+                return
+
+    def run_skill(self, skill_name: str, args: list = None, on_output: Optional[OutputCallback] = None,
+                  on_progress: Optional[ProgressCallback] = None) -> str:
         """
         Runs a skill's main script.
         Assumes the skill is in a folder: skills_dir/skill_name/script.py
+        `on_output` receives stdout/stderr text and `on_progress` the skill's progress() updates
+        while it runs; the complete output is also returned at the end.
         """
-        script_path = os.path.join(self.skills_dir, skill_name, "script.py")
-        
-        if not os.path.exists(script_path):
-            return f"Error: Skill script not found at {script_path}"
+        script_path = self.loader.get_script_path(skill_name) if self.loader else None
+        if script_path is None:
+            # Not in the index (e.g. no valid SKILL.md frontmatter): the folder's script.py still runs
+            script_path = os.path.join(self.skills_dir, skill_name, "script.py")
+            if not os.path.exists(script_path):
+                return f"Error: Skill script not found at {os.path.abspath(script_path)}"
+        script_path = os.path.abspath(script_path)
+
+        self.start()
+        if self.workers <= 0:
+            return self._run_subprocess(script_path, args, on_output)
+
+        try:
+            worker = self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            return f"Failed to execute skill: no skill worker became available within {self.timeout}s"
+        if not worker.alive():
+            # Died while idle; replace it before running
+            worker.stop()
+            worker = _Worker(self.python_exe)
 
-        cmd = [self.python_exe, script_path]
+        try:
+            env = self.broker.env() if self.broker else {}
+            result = worker.run(script_path, args or [], self.timeout, env, on_output, on_progress)
+        except queue.Empty:
+            worker.stop()
+            self._respawn_async()
+            return f"Failed to execute skill: timed out after {self.timeout}s"
+        except Exception as e:
+            # The worker died (e.g. the skill called os._exit or crashed the interpreter)
+            worker.stop()
+            self._respawn_async()
+            return f"Failed to execute skill: {str(e)}"
+
+        if worker.runs >= self.max_runs_per_worker:
+            worker.stop()
+            self._respawn_async()
+        else:
+            self._idle.put(worker)
+        return _format_output(result["stdout"], result["stderr"])
+
+    def _run_subprocess(self, script_path: str, args: Optional[list], on_output: Optional[OutputCallback] = None) -> str:
+        """Runs a skill in a fresh interpreter, relaying stdout line by line."""
+        cmd = [self.python_exe, "-u", script_path]
         if args:
             cmd.extend(args)
+        env = _skill_env()
+        if self.broker:
+            env.update(self.broker.env())
 
         try:
-            # Add the current project directory to PYTHONPATH so scripts can import google_drive_forge
-            env = os.environ.copy()
-            # __file__ is inside google_drive_forge/, so go up one level to get the package root
-            package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            
-            # Ensure the skills can find the modules by importing 'google_drive_forge'
-            current_pythonpath = env.get("PYTHONPATH", "")
-            if current_pythonpath:
-                env["PYTHONPATH"] = f"{package_root}{os.pathsep}{current_pythonpath}"
-            else:
-                env["PYTHONPATH"] = package_root
-
-            result = subprocess.run(
+            process = subprocess.Popen(
                 cmd,
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
                 text=True,
-                check=False,
                 env=env,
-                cwd=mcp_root
+                cwd=PACKAGE_ROOT,
             )
-            
-            output = result.stdout
-            if result.stderr:
-                output += f"\n--- Errors/Warnings ---\n{result.stderr}"
-            
-            return output if output.strip() else "Script executed successfully with no output."
+            # Drained on a thread so a chatty stderr cannot block the script
+            stderr_lines = []
+            drain = threading.Thread(target=lambda: stderr_lines.extend(process.stderr), daemon=True)
+            drain.start()
+            timer = threading.Timer(self.timeout, process.kill)
+            timer.start()
+            stdout_lines = []
+            try:
+                for line in process.stdout:
+                    stdout_lines.append(line)
+                    if on_output:
+                        on_output(line)
+                process.wait()
+            finally:
+                timer.cancel()
+            drain.join()
+            return _format_output("".join(stdout_lines), "".join(stderr_lines))
 
         except Exception as e:
             return f"Failed to execute skill: {str(e)}"
@@ -0,0 +1,111 @@
+import io
+import csv
+import importlib.util
+from typing import List, Optional
+
+# Content cache format under which extracted text is stored, next to the raw downloads
+EXTRACTED_FORMAT = "text/x-forge-extracted"
+# Characters per chunk served to agents; roughly 2,000 tokens
+DEFAULT_CHUNK_CHARS = 8000
+
+GOOGLE_DOC = 'application/vnd.google-apps.document'
+GOOGLE_SHEET = 'application/vnd.google-apps.spreadsheet'
+GOOGLE_SLIDES = 'application/vnd.google-apps.presentation'
+PDF = 'application/pdf'
+XLSX = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+# Formats that are not text as downloaded and go through extract_text
+STRUCTURED_TYPES = {GOOGLE_SHEET, GOOGLE_SLIDES, PDF, XLSX}
+
+def _available(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+def export_format_for(mime_type: str) -> Optional[str]:
+    """The export MIME type to download a Google Workspace document in for extraction."""
+    if mime_type in (GOOGLE_DOC, GOOGLE_SLIDES):
+        return 'text/plain'
+    if mime_type == GOOGLE_SHEET:
+        # Every sheet through openpyxl (the `extract` extra); otherwise Drive's CSV export of the first sheet
+        return XLSX if _available('openpyxl') else 'text/csv'
+    return None
+
+def _pdf_text(data: bytes) -> str:
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        raise RuntimeError("Reading PDFs needs pypdf: pip install 'google-drive-forge[extract]'")
+    reader = PdfReader(io.BytesIO(data))
+    pages = []
+    for number, page in enumerate(reader.pages, start=1):
+        pages.append(f"--- Page {number} ---\n{(page.extract_text() or '').strip()}")
+    return "\n\n".join(pages)
+
+def _xlsx_text(data: bytes) -> str:
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise RuntimeError("Reading spreadsheets needs openpyxl: pip install 'google-drive-forge[extract]'")
+    workbook = load_workbook(io.BytesIO(data), read_only=True, data_only=True)
+    sheets = []
+    for sheet in workbook.worksheets:
+        out = io.StringIO()
+        writer = csv.writer(out, lineterminator="\n")
+        for row in sheet.iter_rows(values_only=True):
+            if any(cell is not None for cell in row):
+                writer.writerow(["" if cell is None else cell for cell in row])
+        sheets.append(f"--- Sheet: {sheet.title} ---\n{out.getvalue().rstrip()}")
+    workbook.close()
+    return "\n\n".join(sheets)
+
+def extract_text(mime_type: str, data: bytes) -> Optional[str]:
+    """
+    Turns downloaded (or exported) content into plain text.
+    Returns None for content that is neither a supported format nor UTF-8 text.
+    Raises RuntimeError when the optional library for a supported format is missing.
+    """
+    if mime_type == PDF:
+        return _pdf_text(data)
+    if mime_type == XLSX or (mime_type == GOOGLE_SHEET and data[:2] == b'PK'):
+        return _xlsx_text(data)
+    try:
+        # Exports (Docs, Slides, CSV) and text files; a BOM is dropped
+        return data.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        return None
+
+def chunk_text(text: str, chunk_chars: int = DEFAULT_CHUNK_CHARS) -> List[str]:
+    """
+    Splits text into chunks of at most chunk_chars, preferring paragraph, then line, then
+    word boundaries. The split is deterministic, so chunk numbers are stable for a revision.
+    """
+    if chunk_chars < 1:
+        raise ValueError(f"chunk_chars must be at least 1, got {chunk_chars}")
+    chunks = []
+    start = 0
+    while len(text) - start > chunk_chars:
+        end = start + chunk_chars
+        for separator in ("\n\n", "\n", " "):
+            cut = text.rfind(separator, start + chunk_chars // 2, end)
+            if cut != -1:
+                end = cut + len(separator)
+                break
+        chunks.append(text[start:end])
+        start = end
+    if start < len(text) or not chunks:
+        chunks.append(text[start:])
+    return chunks
+
+def check_chunk_args(chunk: int, chunk_chars: int):
+    """Raises ValueError for a chunk number or chunk size that cannot be served."""
+    if chunk < 1:
+        raise ValueError(f"chunk numbers start at 1, got {chunk}")
+    if chunk_chars < 1:
+        raise ValueError(f"chunk_chars must be at least 1, got {chunk_chars}")
+
+def format_chunk(chunks: List[str], number: int, name: str) -> str:
+    """One chunk for an agent, numbered from 1, with a pointer to the next one."""
+    if not 1 <= number <= len(chunks):
+        return f"Error: '{name}' has {len(chunks)} chunk(s); chunk {number} does not exist."
+    header = f"[{name}: chunk {number} of {len(chunks)}]\n"
+    footer = f"\n[continue with chunk={number + 1}]" if number < len(chunks) else "\n[end of document]"
+    return header + chunks[number - 1] + footer
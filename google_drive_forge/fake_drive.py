@@ -0,0 +1,910 @@
+"""
+Local stand-in for the subset of the Drive v3 REST API this package uses, for tests and
+benchmarks without a Google account.
+
+Supported: files.list (with `q` parsing, paging and `fields` masks), files.get, get_media
+(with Range), export, files.create / update / delete (metadata, multipart, media and
+resumable uploads), batch requests and the changes feed. Latency, bandwidth, random
+failures and a server-side quota can be injected, and synthetic trees of up to millions
+of files are generated in memory.
+
+    from google_drive_forge.client import DriveClient
+    from google_drive_forge.fake_drive import FakeDrive, FakeDriveServer, fake_credentials
+
+    drive = FakeDrive()
+    drive.generate_tree(files=100_000)
+    with FakeDriveServer(drive, latency=0.02) as server:
+        client = DriveClient(creds=fake_credentials(), api_endpoint=server.url)
+        client.list_files(limit=None)
+
+Run `python -m google_drive_forge.fake_drive --files 100000` to serve a tree on its own.
+"""
+import re
+import json
+import time
+import uuid
+import random
+import hashlib
+import logging
+import argparse
+import datetime
+import threading
+from collections import deque
+from email.parser import BytesParser
+from email.policy import HTTP as HTTP_POLICY
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit, parse_qs, quote
+
+logger = logging.getLogger(__name__)
+
+FOLDER_MIME_TYPE = 'application/vnd.google-apps.folder'
+GOOGLE_APPS_PREFIX = 'application/vnd.google-apps.'
+ROOT_ID = '0AFakeRootFolder'
+OWNER = {"displayName": "Fake Owner", "emailAddress": "owner@example.com"}
+
+# Mime types and extensions for generated files; Google documents are exported, not downloaded
+SYNTHETIC_TYPES = [
+    ('text/plain', '.txt'),
+    ('application/pdf', '.pdf'),
+    ('text/csv', '.csv'),
+    ('image/png', '.png'),
+    ('application/vnd.google-apps.document', ''),
+    ('application/vnd.google-apps.spreadsheet', ''),
+]
+
+EXPORT_FORMATS = {
+    'application/vnd.google-apps.document': {'application/pdf', 'text/plain', 'text/html',
+                                             'application/vnd.openxmlformats-officedocument.wordprocessingml.document'},
+    'application/vnd.google-apps.spreadsheet': {'text/csv', 'application/pdf',
+                                                'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'},
+    'application/vnd.google-apps.presentation': {'application/pdf', 'text/plain',
+                                                 'application/vnd.openxmlformats-officedocument.presentationml.presentation'},
+}
+
+DEFAULT_FIELDS = "kind, id, name, mimeType"
+DEFAULT_LIST_FIELDS = "kind, nextPageToken, incompleteSearch, files(kind, id, name, mimeType)"
+
+def fake_credentials(token: str = "fake-token"):
+    """Credentials that are always valid; the fake server ignores the token."""
+    from google.oauth2.credentials import Credentials
+    return Credentials(token=token)
+
+def _rfc3339(epoch: float) -> str:
+    return datetime.datetime.fromtimestamp(epoch, datetime.timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z'
+
+def _parse_time(value: str) -> float:
+    return datetime.datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+
+class DriveApiError(Exception):
+    """An error response in Drive's JSON error format."""
+    def __init__(self, status: int, reason: str, message: str, headers: Optional[Dict[str, str]] = None):
+        super().__init__(message)
+        self.status = status
+        self.reason = reason
+        self.headers = headers or {}
+
+    def body(self) -> bytes:
+        return json.dumps({"error": {
+            "code": self.status, "message": str(self),
+            "errors": [{"domain": "global", "reason": self.reason, "message": str(self)}],
+        }}).encode()
+
+class FakeFile:
+    __slots__ = ('id', 'name', 'mime_type', 'parents', 'size', 'modified', 'created', 'trashed', 'content', '_md5')
+
+    def __init__(self, file_id: str, name: str, mime_type: str, parents: List[str], size: int = 0,
+                 modified: Optional[float] = None, content: Optional[bytes] = None):
+        self.id = file_id
+        self.name = name
+        self.mime_type = mime_type
+        self.parents = parents
+        self.content = content
+        self.size = len(content) if content is not None else size
+        self.modified = modified if modified is not None else time.time()
+        self.created = self.modified
+        self.trashed = False
+        self._md5: Optional[str] = None
+
+    @property
+    def is_folder(self) -> bool:
+        return self.mime_type == FOLDER_MIME_TYPE
+
+    @property
+    def is_google_type(self) -> bool:
+        return self.mime_type.startswith(GOOGLE_APPS_PREFIX)
+
+    def data(self) -> bytes:
+        """The file's bytes; generated files get deterministic content derived from their ID."""
+        if self.content is not None:
+            return self.content
+        pattern = f"{self.id}:{self.name}\n".encode()
+        return (pattern * (self.size // len(pattern) + 1))[:self.size]
+
+    def set_content(self, content: bytes):
+        self.content = content
+        self.size = len(content)
+        self._md5 = None
+
+    def md5(self) -> str:
+        if self._md5 is None:
+            self._md5 = hashlib.md5(self.data()).hexdigest()
+        return self._md5
+
+    def resource(self, mask: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """The files resource, limited to the fields in `mask` (None for all fields)."""
+        getters: Dict[str, Callable[[], Any]] = {
+            'kind': lambda: 'drive#file',
+            'id': lambda: self.id,
+            'name': lambda: self.name,
+            'mimeType': lambda: self.mime_type,
+            'parents': lambda: list(self.parents),
+            'modifiedTime': lambda: _rfc3339(self.modified),
+            'createdTime': lambda: _rfc3339(self.created),
+            'trashed': lambda: self.trashed,
+            'owners': lambda: [dict(OWNER)],
+            'webViewLink': lambda: f"https://drive.example.com/file/d/{self.id}/view",
+        }
+        if not self.is_folder and not self.is_google_type:
+            getters['size'] = lambda: str(self.size)
+            getters['md5Checksum'] = self.md5
+        if self.is_google_type and self.mime_type in EXPORT_FORMATS:
+            getters['exportLinks'] = lambda: {m: f"https://drive.example.com/export/{self.id}?mimeType={quote(m)}"
+                                              for m in sorted(EXPORT_FORMATS[self.mime_type])}
+        keys = getters.keys() if mask is None else [k for k in mask if k in getters]
+        return {k: getters[k]() for k in keys}
+
+# --- Field masks ---
+
+def parse_fields(fields: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Parses a partial-response mask like "nextPageToken, files(id, name)" into nested dicts."""
+    if fields is None or fields.strip() in ('', '*'):
+        return None
+    mask: Dict[str, Any] = {}
+    stack = [mask]
+    token = ''
+    last = None
+    for ch in fields + ',':
+        if ch in ',()':
+            token = token.strip()
+            if token:
+                stack[-1][token] = None
+                last = token
+            token = ''
+            if ch == '(':
+                child: Dict[str, Any] = {}
+                stack[-1][last] = child
+                stack.append(child)
+            elif ch == ')':
+                stack.pop()
+        else:
+            token += ch
+    return mask
+
+def apply_mask(value: Dict[str, Any], mask: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    if mask is None:
+        return value
+    result = {}
+    for key, sub in mask.items():
+        if key not in value:
+            continue
+        item = value[key]
+        if sub is not None and isinstance(item, list):
+            item = [apply_mask(i, sub) if isinstance(i, dict) else i for i in item]
+        elif sub is not None and isinstance(item, dict):
+            item = apply_mask(item, sub)
+        result[key] = item
+    return result
+
+# --- Search queries ---
+
+_TOKEN = re.compile(r"\s*(?:(?P<str>'(?:\\.|[^'\\])*')|(?P<op>!=|<=|>=|=|<|>|\(|\))|(?P<word>[A-Za-z_][A-Za-z0-9_.]*))")
+
+def _tokenize(q: str) -> List[Tuple[str, str]]:
+    tokens = []
+    pos = 0
+    q = q.rstrip()
+    while pos < len(q):
+        match = _TOKEN.match(q, pos)
+        if not match:
+            raise DriveApiError(400, 'invalid', f"Invalid Value: cannot parse query near '{q[pos:pos + 20]}'")
+        pos = match.end()
+        if match.group('str') is not None:
+            tokens.append(('str', re.sub(r"\\(.)", r"\1", match.group('str')[1:-1])))
+        elif match.group('op'):
+            tokens.append(('op', match.group('op')))
+        else:
+            tokens.append(('word', match.group('word')))
+    return tokens
+
+class _QueryParser:
+    """
+    Recursive-descent parser for Drive search queries. Produces nested tuples:
+    ('or', [..]), ('and', [..]), ('not', node), ('in', value, collection), ('cmp', field, op, value).
+    """
+    FIELDS = {'name', 'mimeType', 'trashed', 'modifiedTime', 'createdTime', 'fullText', 'starred', 'sharedWithMe'}
+
+    def __init__(self, q: str):
+        self.tokens = _tokenize(q)
+        self.pos = 0
+
+    def _peek(self) -> Optional[Tuple[str, str]]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _next(self) -> Tuple[str, str]:
+        token = self._peek()
+        if token is None:
+            raise DriveApiError(400, 'invalid', "Invalid Value: unexpected end of query")
+        self.pos += 1
+        return token
+
+    def _keyword(self, word: str) -> bool:
+        token = self._peek()
+        if token and token[0] == 'word' and token[1].lower() == word:
+            self.pos += 1
+            return True
+        return False
+
+    def parse(self):
+        node = self._or()
+        if self._peek() is not None:
+            raise DriveApiError(400, 'invalid', f"Invalid Value: unexpected '{self._peek()[1]}'")
+        return node
+
+    def _or(self):
+        nodes = [self._and()]
+        while self._keyword('or'):
+            nodes.append(self._and())
+        return nodes[0] if len(nodes) == 1 else ('or', nodes)
+
+    def _and(self):
+        nodes = [self._factor()]
+        while self._keyword('and'):
+            nodes.append(self._factor())
+        return nodes[0] if len(nodes) == 1 else ('and', nodes)
+
+    def _factor(self):
+        if self._keyword('not'):
+            return ('not', self._factor())
+        if self._peek() == ('op', '('):
+            self.pos += 1
+            node = self._or()
+            if self._next() != ('op', ')'):
+                raise DriveApiError(400, 'invalid', "Invalid Value: missing ')'")
+            return node
+        kind, value = self._next()
+        if kind == 'str':
+            if not self._keyword('in'):
+                raise DriveApiError(400, 'invalid', "Invalid Value: expected 'in'")
+            collection = self._next()[1]
+            if collection not in ('parents', 'owners', 'writers', 'readers'):
+                raise DriveApiError(400, 'invalid', f"Invalid Value: unsupported collection '{collection}'")
+            return ('in', value, collection)
+        if kind != 'word' or value not in self.FIELDS:
+            raise DriveApiError(400, 'invalid', f"Invalid Value: unsupported query term '{value}'")
+        op_kind, op = self._next()
+        if op_kind == 'word' and op.lower() == 'contains':
+            op = 'contains'
+        elif op_kind != 'op':
+            raise DriveApiError(400, 'invalid', f"Invalid Value: unexpected '{op}'")
+        operand_kind, operand = self._next()
+        if operand_kind == 'word' and operand.lower() in ('true', 'false'):
+            return ('cmp', value, op, operand.lower() == 'true')
+        if operand_kind != 'str':
+            raise DriveApiError(400, 'invalid', f"Invalid Value: expected a quoted value after {value} {op}")
+        return ('cmp', value, op, operand)
+
+_OPS = {
+    '=': lambda a, b: a == b, '!=': lambda a, b: a != b,
+    '<': lambda a, b: a < b, '<=': lambda a, b: a <= b,
+    '>': lambda a, b: a > b, '>=': lambda a, b: a >= b,
+}
+
+def compile_query(node, resolve: Callable[[str], str]) -> Callable[[FakeFile], bool]:
+    """Turns a parsed query into a predicate. `resolve` maps aliases like 'root' to file IDs."""
+    kind = node[0]
+    if kind in ('and', 'or'):
+        predicates = [compile_query(n, resolve) for n in node[1]]
+        combine = all if kind == 'and' else any
+        return lambda f: combine(p(f) for p in predicates)
+    if kind == 'not':
+        inner = compile_query(node[1], resolve)
+        return lambda f: not inner(f)
+    if kind == 'in':
+        _, value, collection = node
+        if collection == 'parents':
+            parent_id = resolve(value)
+            return lambda f: parent_id in f.parents
+        return lambda f: value == OWNER['emailAddress']
+
+    _, field, op, value = node
+    if field in ('name', 'fullText'):
+        if op == 'contains':
+            needle = value.lower()
+            return lambda f: needle in f.name.lower()
+        compare = _OPS[op]
+        return lambda f: compare(f.name, value)
+    if field == 'mimeType':
+        if op not in ('=', '!='):
+            raise DriveApiError(400, 'invalid', "Invalid Value: mimeType supports = and !=")
+        compare = _OPS[op]
+        return lambda f: compare(f.mime_type, value)
+    if field in ('modifiedTime', 'createdTime'):
+        threshold = _parse_time(value)
+        compare = _OPS[op]
+        attr = 'modified' if field == 'modifiedTime' else 'created'
+        return lambda f: compare(getattr(f, attr), threshold)
+    if field == 'trashed':
+        expected = bool(value)
+        return (lambda f: f.trashed == expected) if op == '=' else (lambda f: f.trashed != expected)
+    # starred / sharedWithMe: nothing in the fake drive is either
+    return lambda f: (op == '=') != bool(value)
+
+def _conjuncts(node) -> List[Any]:
+    return node[1] if node[0] == 'and' else [node]
+
+# --- The drive ---
+
+class FakeDrive:
+    """In-memory file tree with a changes feed. Safe to use from several server threads."""
+    def __init__(self):
+        self.files: Dict[str, FakeFile] = {}
+        # parent ID -> child IDs, in creation order
+        self.children: Dict[str, List[str]] = {}
+        self.by_name: Dict[str, List[str]] = {}
+        # Every ID ever created, for stable paging over full listings
+        self.order: List[str] = []
+        self.changes: List[str] = []
+        self._lock = threading.RLock()
+        self._counter = 0
+        root = FakeFile(ROOT_ID, 'My Drive', FOLDER_MIME_TYPE, [])
+        self.files[ROOT_ID] = root
+        self.children[ROOT_ID] = []
+
+    def resolve(self, file_id: str) -> str:
+        return ROOT_ID if file_id == 'root' else file_id
+
+    def get(self, file_id: str) -> FakeFile:
+        f = self.files.get(self.resolve(file_id))
+        if f is None:
+            raise DriveApiError(404, 'notFound', f"File not found: {file_id}.")
+        return f
+
+    def _new_id(self) -> str:
+        self._counter += 1
+        return f"fake{self._counter:09d}"
+
+    def add(self, name: str, mime_type: str = 'application/octet-stream', parents: Optional[List[str]] = None,
+            size: int = 0, content: Optional[bytes] = None, modified: Optional[float] = None,
+            record_change: bool = True) -> FakeFile:
+        with self._lock:
+            parents = [self.resolve(p) for p in (parents or [ROOT_ID])]
+            for p in parents:
+                if p not in self.files:
+                    raise DriveApiError(404, 'notFound', f"File not found: {p}.")
+            f = FakeFile(self._new_id(), name, mime_type, parents, size=size, modified=modified, content=content)
+            self.files[f.id] = f
+            self.order.append(f.id)
+            self.by_name.setdefault(name, []).append(f.id)
+            for p in parents:
+                self.children.setdefault(p, []).append(f.id)
+            if f.is_folder:
+                self.children.setdefault(f.id, [])
+            if record_change:
+                self.changes.append(f.id)
+            return f
+
+    def update(self, file_id: str, metadata: Dict[str, Any], add_parents: List[str] = (),
+               remove_parents: List[str] = ()) -> FakeFile:
+        with self._lock:
+            f = self.get(file_id)
+            if 'name' in metadata and metadata['name'] != f.name:
+                self.by_name[f.name].remove(f.id)
+                f.name = metadata['name']
+                self.by_name.setdefault(f.name, []).append(f.id)
+            if 'trashed' in metadata:
+                f.trashed = bool(metadata['trashed'])
+            if 'mimeType' in metadata:
+                f.mime_type = metadata['mimeType']
+            for p in remove_parents:
+                p = self.resolve(p)
+                if p in f.parents:
+                    f.parents.remove(p)
+                    self.children[p].remove(f.id)
+            for p in add_parents:
+                p = self.resolve(p)
+                self.get(p)
+                if p not in f.parents:
+                    f.parents.append(p)
+                    self.children.setdefault(p, []).append(f.id)
+            f.modified = time.time()
+            self.changes.append(f.id)
+            return f
+
+    def delete(self, file_id: str):
+        with self._lock:
+            f = self.get(file_id)
+            for child_id in list(self.children.get(f.id, [])):
+                self.delete(child_id)
+            del self.files[f.id]
+            self.by_name[f.name].remove(f.id)
+            for p in f.parents:
+                if f.id in self.children.get(p, []):
+                    self.children[p].remove(f.id)
+            self.children.pop(f.id, None)
+            self.changes.append(f.id)
+
+    def generate_tree(self, files: int = 10_000, folder_fanout: int = 10, files_per_folder: int = 100,
+                      max_size: int = 64 * 1024, seed: int = 0) -> Dict[str, int]:
+        """
+        Adds `files` synthetic files under a balanced tree of folders (each folder holds up to
+        `folder_fanout` subfolders and about `files_per_folder` files). Deterministic for a seed.
+        Content is generated on demand, so a million files take a few hundred MB.
+        """
+        rng = random.Random(seed)
+        base_time = time.time() - 365 * 24 * 3600
+        folder_count = max(1, -(-files // files_per_folder))
+        folders = [ROOT_ID]
+        with self._lock:
+            index = 0
+            while len(folders) - 1 < folder_count:
+                parent = folders[index]
+                index += 1
+                for _ in range(folder_fanout):
+                    if len(folders) - 1 >= folder_count:
+                        break
+                    folder = self.add(f"folder_{len(folders):06d}", FOLDER_MIME_TYPE, [parent],
+                                      modified=base_time, record_change=False)
+                    folders.append(folder.id)
+            for n in range(files):
+                mime_type, ext = SYNTHETIC_TYPES[rng.randrange(len(SYNTHETIC_TYPES))]
+                size = 0 if mime_type.startswith(GOOGLE_APPS_PREFIX) else rng.randint(1, max_size)
+                self.add(f"file_{n:07d}{ext}", mime_type, [folders[1 + n % folder_count]], size=size,
+                         modified=base_time + rng.random() * 365 * 24 * 3600, record_change=False)
+        return {"folders": folder_count, "files": files}
+
+    def path_of(self, file_id: str) -> str:
+        """Slash-separated path from the root, for picking benchmark targets."""
+        parts = []
+        f = self.get(file_id)
+        while f.parents:
+            parts.append(f.name)
+            f = self.get(f.parents[0])
+        return '/'.join(reversed(parts))
+
+    def query(self, q: Optional[str], page_size: int, page_token: Optional[str]) -> Tuple[List[FakeFile], Optional[str]]:
+        """One page of files matching `q`. The page token is a position in the candidate list."""
+        node = _QueryParser(q).parse() if q and q.strip() else None
+        predicate = compile_query(node, self.resolve) if node else (lambda f: True)
+        with self._lock:
+            candidates = self.order
+            if node:
+                # Use the parent or name index when the query requires one
+                for term in _conjuncts(node):
+                    if term[0] == 'in' and term[2] == 'parents':
+                        candidates = self.children.get(self.resolve(term[1]), [])
+                        break
+                    if term[0] == 'or' and all(t[0] == 'in' and t[2] == 'parents' for t in term[1]):
+                        # walk() lists several folders at once; a file in two of them is listed once
+                        ids = (c for t in term[1] for c in self.children.get(self.resolve(t[1]), []))
+                        candidates = list(dict.fromkeys(ids))
+                        break
+                    if term[0] == 'cmp' and term[1] == 'name' and term[2] == '=':
+                        candidates = self.by_name.get(term[3], [])
+                        break
+            position = int(page_token) if page_token else 0
+            page = []
+            while position < len(candidates) and len(page) < page_size:
+                f = self.files.get(candidates[position])
+                position += 1
+                if f is not None and f.id != ROOT_ID and predicate(f):
+                    page.append(f)
+            next_token = str(position) if position < len(candidates) else None
+            return page, next_token
+
+# --- HTTP ---
+
+class _Response:
+    def __init__(self, status: int = 200, body: Any = b'', headers: Optional[Dict[str, str]] = None):
+        self.status = status
+        self.headers = headers or {}
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body).encode()
+            self.headers.setdefault('Content-Type', 'application/json; charset=UTF-8')
+        self.body = body
+
+class _UploadSession:
+    def __init__(self, file_id: Optional[str], metadata: Dict[str, Any], total: Optional[int], fields: Optional[str]):
+        self.file_id = file_id
+        self.metadata = metadata
+        self.total = total
+        self.fields = fields
+        self.data = bytearray()
+
+class FakeDriveServer:
+    """
+    Serves a FakeDrive over HTTP on 127.0.0.1. `latency` (+ up to `jitter`) seconds are added to
+    every request; `bandwidth` (bytes/s) throttles media; `failure_rate` and `rate_limit_rate` are
+    the chances of a 503 or a 403 userRateLimitExceeded; `quota_per_minute` enforces a quota.
+    """
+    def __init__(self, drive: Optional[FakeDrive] = None, host: str = '127.0.0.1', port: int = 0,
+                 latency: float = 0.0, jitter: float = 0.0, bandwidth: Optional[float] = None,
+                 failure_rate: float = 0.0, rate_limit_rate: float = 0.0,
+                 quota_per_minute: Optional[float] = None, seed: Optional[int] = None):
+        self.drive = drive or FakeDrive()
+        self.latency = latency
+        self.jitter = jitter
+        self.bandwidth = bandwidth
+        self.failure_rate = failure_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.quota_per_minute = quota_per_minute
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._quota_window: deque = deque()
+        self._sessions: Dict[str, _UploadSession] = {}
+        self.requests = 0
+        self.injected_failures = 0
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeDriveServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fake-drive", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FakeDriveServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # --- Injection ---
+
+    def _delay(self, nbytes: int = 0):
+        delay = self.latency
+        if self.jitter:
+            with self._rng_lock:
+                delay += self._rng.random() * self.jitter
+        if self.bandwidth and nbytes:
+            delay += nbytes / self.bandwidth
+        if delay > 0:
+            time.sleep(delay)
+
+    def _inject_failure(self):
+        with self._rng_lock:
+            self.requests += 1
+            if self.quota_per_minute:
+                now = time.monotonic()
+                window = self._quota_window
+                while window and window[0] < now - 60:
+                    window.popleft()
+                if len(window) >= self.quota_per_minute:
+                    self.injected_failures += 1
+                    raise DriveApiError(403, 'userRateLimitExceeded', "User Rate Limit Exceeded", {'Retry-After': '1'})
+                window.append(now)
+            roll = self._rng.random()
+        if roll < self.failure_rate:
+            self.injected_failures += 1
+            raise DriveApiError(503, 'backendError', "Backend Error")
+        if roll < self.failure_rate + self.rate_limit_rate:
+            self.injected_failures += 1
+            raise DriveApiError(403, 'userRateLimitExceeded', "User Rate Limit Exceeded")
+
+    # --- Routing ---
+
+    def handle(self, method: str, target: str, headers: Dict[str, str], body: bytes, base_url: str) -> _Response:
+        """Answers one request (also used for each part of a batch)."""
+        try:
+            self._inject_failure()
+            return self._route(method, target, headers, body, base_url)
+        except DriveApiError as e:
+            return _Response(e.status, e.body(), dict(e.headers, **{'Content-Type': 'application/json; charset=UTF-8'}))
+
+    def _route(self, method: str, target: str, headers: Dict[str, str], body: bytes, base_url: str) -> _Response:
+        parts = urlsplit(target)
+        params = {k: v[-1] for k, v in parse_qs(parts.query, keep_blank_values=True).items()}
+        path = parts.path.rstrip('/')
+        drive = self.drive
+
+        if path == '/batch/drive/v3' and method == 'POST':
+            return self._batch(headers, body, base_url)
+        if path == '/drive/v3/changes/startPageToken' and method == 'GET':
+            return _Response(body={"kind": "drive#startPageToken", "startPageToken": str(len(drive.changes) + 1)})
+        if path == '/drive/v3/changes' and method == 'GET':
+            return self._changes(params)
+        if path == '/drive/v3/files':
+            if method == 'GET':
+                return self._list(params)
+            if method == 'POST':
+                metadata = json.loads(body or b'{}')
+                return self._created(self._create(metadata), params)
+        if path == '/upload/drive/v3/files' and method == 'POST':
+            return self._upload(None, params, headers, body, base_url)
+        if path == '/upload/drive/v3/files' and method == 'PUT':
+            return self._upload_chunk(params, headers, body)
+
+        match = re.fullmatch(r'/(upload/)?drive/v3/files/([^/]+)(/export)?', path)
+        if not match:
+            raise DriveApiError(404, 'notFound', f"Not Found: {method} {path}")
+        is_upload, file_id, is_export = match.groups()
+        if is_upload:
+            if method in ('PATCH', 'PUT'):
+                return self._upload(file_id, params, headers, body, base_url)
+            raise DriveApiError(405, 'methodNotAllowed', f"{method} not allowed")
+        if is_export:
+            return self._export(file_id, params)
+        if method == 'GET':
+            if params.get('alt') == 'media':
+                return self._media(file_id, headers)
+            return _Response(body=drive.get(file_id).resource(parse_fields(params.get('fields', DEFAULT_FIELDS))))
+        if method == 'PATCH':
+            metadata = json.loads(body or b'{}')
+            f = drive.update(file_id, metadata, self._ids(params.get('addParents')), self._ids(params.get('removeParents')))
+            return _Response(body=f.resource(parse_fields(params.get('fields', DEFAULT_FIELDS))))
+        if method == 'DELETE':
+            drive.delete(file_id)
+            return _Response(204)
+        raise DriveApiError(405, 'methodNotAllowed', f"{method} not allowed")
+
+    @staticmethod
+    def _ids(value: Optional[str]) -> List[str]:
+        return [v for v in (value or '').split(',') if v]
+
+    def _list(self, params: Dict[str, str]) -> _Response:
+        page_size = max(1, min(int(params.get('pageSize', 100)), 1000))
+        files, next_token = self.drive.query(params.get('q'), page_size, params.get('pageToken'))
+        mask = parse_fields(params.get('fields', DEFAULT_LIST_FIELDS))
+        file_mask = mask.get('files') if mask else None
+        result: Dict[str, Any] = {"kind": "drive#fileList", "incompleteSearch": False,
+                                  "files": [f.resource(file_mask) for f in files]}
+        if next_token:
+            result["nextPageToken"] = next_token
+        return _Response(body=apply_mask(result, mask))
+
+    def _changes(self, params: Dict[str, str]) -> _Response:
+        drive = self.drive
+        try:
+            start = int(params['pageToken'])
+        except (KeyError, ValueError):
+            raise DriveApiError(400, 'invalid', "Invalid Value: pageToken")
+        page_size = max(1, min(int(params.get('pageSize', 100)), 1000))
+        mask = parse_fields(params.get('fields'))
+        file_mask = None
+        if mask and isinstance(mask.get('changes'), dict) and isinstance(mask['changes'].get('file'), dict):
+            file_mask = mask['changes']['file']
+        with drive._lock:
+            ids = drive.changes[start - 1:start - 1 + page_size]
+            changes = []
+            for file_id in ids:
+                f = drive.files.get(file_id)
+                change: Dict[str, Any] = {"kind": "drive#change", "changeType": "file", "fileId": file_id,
+                                          "removed": f is None, "time": _rfc3339(time.time())}
+                if f is not None:
+                    change["file"] = f.resource(file_mask)
+                changes.append(change)
+            end = start + len(ids)
+            result: Dict[str, Any] = {"kind": "drive#changeList", "changes": changes}
+            if end <= len(drive.changes):
+                result["nextPageToken"] = str(end)
+            else:
+                result["newStartPageToken"] = str(len(drive.changes) + 1)
+        return _Response(body=apply_mask(result, mask))
+
+    def _create(self, metadata: Dict[str, Any], content: Optional[bytes] = None) -> FakeFile:
+        return self.drive.add(metadata.get('name', 'Untitled'), metadata.get('mimeType', 'application/octet-stream'),
+                              metadata.get('parents'), content=content if content is not None else b'')
+
+    def _created(self, f: FakeFile, params: Dict[str, str]) -> _Response:
+        return _Response(body=f.resource(parse_fields(params.get('fields', DEFAULT_FIELDS))))
+
+    def _media(self, file_id: str, headers: Dict[str, str]) -> _Response:
+        f = self.drive.get(file_id)
+        if f.is_folder or f.is_google_type:
+            raise DriveApiError(403, 'fileNotDownloadable', "Only files with binary content can be downloaded. Use Export with Docs Editors files.")
+        data = f.data()
+        range_header = headers.get('range')
+        if range_header:
+            match = re.fullmatch(r'bytes=(\d+)-(\d*)', range_header.strip())
+            if match:
+                start = int(match.group(1))
+                end = int(match.group(2)) if match.group(2) else len(data) - 1
+                if start >= len(data):
+                    return _Response(416, b'', {'Content-Range': f'bytes */{len(data)}'})
+                end = min(end, len(data) - 1)
+                self._delay(end - start + 1)
+                return _Response(206, data[start:end + 1], {'Content-Type': 'application/octet-stream',
+                                                            'Content-Range': f'bytes {start}-{end}/{len(data)}'})
+        self._delay(len(data))
+        return _Response(200, data, {'Content-Type': f.mime_type})
+
+    def _export(self, file_id: str, params: Dict[str, str]) -> _Response:
+        f = self.drive.get(file_id)
+        target = params.get('mimeType')
+        if target not in EXPORT_FORMATS.get(f.mime_type, ()):
+            raise DriveApiError(403, 'fileNotExportable', "Export only supports Docs Editors files.")
+        if f.content is not None:
+            data = f.content
+        else:
+            data = (f"Exported {f.name} ({f.id}) as {target}\n" * 64).encode()
+        self._delay(len(data))
+        return _Response(200, data, {'Content-Type': target})
+
+    # --- Uploads ---
+
+    def _upload(self, file_id: Optional[str], params: Dict[str, str], headers: Dict[str, str], body: bytes,
+                base_url: str) -> _Response:
+        upload_type = params.get('uploadType', 'media')
+        if upload_type == 'resumable':
+            metadata = json.loads(body or b'{}')
+            total = headers.get('x-upload-content-length')
+            session_id = uuid.uuid4().hex
+            self._sessions[session_id] = _UploadSession(file_id, metadata, int(total) if total else None,
+                                                        params.get('fields'))
+            location = f"{base_url}/upload/drive/v3/files?uploadType=resumable&upload_id={session_id}"
+            return _Response(200, b'', {'Location': location})
+
+        if upload_type == 'multipart':
+            metadata, content = self._parse_multipart(headers.get('content-type', ''), body)
+        else:
+            metadata, content = {}, body
+        self._delay(len(content))
+        return self._finish_upload(file_id, metadata, content, params.get('fields'))
+
+    def _finish_upload(self, file_id: Optional[str], metadata: Dict[str, Any], content: bytes,
+                       fields: Optional[str]) -> _Response:
+        if file_id is None:
+            f = self._create(metadata, content)
+        else:
+            f = self.drive.update(file_id, metadata)
+            with self.drive._lock:
+                f.set_content(content)
+        return _Response(200, f.resource(parse_fields(fields or DEFAULT_FIELDS)))
+
+    @staticmethod
+    def _parse_multipart(content_type: str, body: bytes) -> Tuple[Dict[str, Any], bytes]:
+        message = BytesParser(policy=HTTP_POLICY).parsebytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode() + body)
+        parts = list(message.iter_parts())
+        if len(parts) != 2:
+            raise DriveApiError(400, 'badContent', "Multipart upload needs a metadata part and a media part")
+        metadata = json.loads(parts[0].get_payload(decode=True) or b'{}')
+        return metadata, parts[1].get_payload(decode=True) or b''
+
+    def _upload_chunk(self, params: Dict[str, str], headers: Dict[str, str], body: bytes) -> _Response:
+        session = self._sessions.get(params.get('upload_id', ''))
+        if session is None:
+            raise DriveApiError(404, 'notFound', "Upload session not found or expired")
+        content_range = headers.get('content-range', '')
+        match = re.fullmatch(r'bytes (?:(\d+)-(\d+)|\*)/(\d+|\*)', content_range.strip()) if content_range else None
+        if content_range and not match:
+            raise DriveApiError(400, 'badContent', f"Invalid Content-Range: {content_range}")
+        if match and match.group(3) != '*':
+            session.total = int(match.group(3))
+        if match and match.group(1) is not None:
+            start = int(match.group(1))
+            if start != len(session.data):
+                # The client is out of step (e.g. after a dropped chunk); it should query the status
+                return self._incomplete(session)
+            session.data += body
+            self._delay(len(body))
+        elif not content_range:
+            session.data += body
+            session.total = len(session.data)
+        if session.total is not None and len(session.data) >= session.total:
+            for key, value in list(self._sessions.items()):
+                if value is session:
+                    del self._sessions[key]
+            return self._finish_upload(session.file_id, session.metadata, bytes(session.data), session.fields)
+        return self._incomplete(session)
+
+    @staticmethod
+    def _incomplete(session: _UploadSession) -> _Response:
+        headers = {'Content-Length': '0'}
+        if session.data:
+            headers['Range'] = f'bytes=0-{len(session.data) - 1}'
+        return _Response(308, b'', headers)
+
+    # --- Batch ---
+
+    def _batch(self, headers: Dict[str, str], body: bytes, base_url: str) -> _Response:
+        message = BytesParser(policy=HTTP_POLICY).parsebytes(
+            f"Content-Type: {headers.get('content-type', '')}\r\n\r\n".encode() + body)
+        if not message.is_multipart():
+            raise DriveApiError(400, 'badRequest', "Batch requests must be multipart/mixed")
+        boundary = f"batch_{uuid.uuid4().hex}"
+        out = []
+        for part in message.iter_parts():
+            inner = part.get_payload(decode=True) or b''
+            # googleapiclient separates the embedded request's lines with bare \n
+            head, inner_body = (re.split(rb'\r?\n\r?\n', inner, maxsplit=1) + [b''])[:2]
+            lines = re.split(r'\r?\n', head.decode('utf-8', 'replace'))
+            method, target = lines[0].split(' ')[:2]
+            inner_headers = {}
+            for line in lines[1:]:
+                if ':' in line:
+                    key, value = line.split(':', 1)
+                    inner_headers[key.strip().lower()] = value.strip()
+            target = urlsplit(target)._replace(scheme='', netloc='').geturl()
+            response = self.handle(method, target, inner_headers, inner_body, base_url)
+            content_id = part.get('Content-ID', '')
+            response_id = f"<response-{content_id[1:]}" if content_id.startswith('<') else content_id
+            status_line = f"HTTP/1.1 {response.status} {BaseHTTPRequestHandler.responses.get(response.status, ('',))[0]}"
+            response_headers = ''.join(f"{k}: {v}\r\n" for k, v in response.headers.items())
+            out.append(
+                f"--{boundary}\r\nContent-Type: application/http\r\nContent-ID: {response_id}\r\n\r\n"
+                f"{status_line}\r\n{response_headers}Content-Length: {len(response.body)}\r\n\r\n".encode()
+                + response.body + b"\r\n"
+            )
+        out.append(f"--{boundary}--\r\n".encode())
+        return _Response(200, b''.join(out), {'Content-Type': f'multipart/mixed; boundary={boundary}'})
+
+    def _handler_class(self):
+        server = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def _serve(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length) if length else b''
+                headers = {k.lower(): v for k, v in self.headers.items()}
+                base_url = f"http://{self.headers.get('Host') or server.url.split('://', 1)[1]}"
+                server._delay()
+                response = server.handle(self.command, self.path, headers, body, base_url)
+                self.send_response(response.status)
+                for key, value in response.headers.items():
+                    if key.lower() != 'content-length':
+                        self.send_header(key, value)
+                self.send_header('Content-Length', str(len(response.body)))
+                self.end_headers()
+                if self.command != 'HEAD':
+                    self.wfile.write(response.body)
+
+            do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _serve
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+        return _Handler
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a synthetic Drive v3 API on localhost.")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--files", type=int, default=10_000, help="Number of synthetic files to generate")
+    parser.add_argument("--files-per-folder", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random latency, up to this many seconds")
+    parser.add_argument("--bandwidth", type=float, default=None, help="Media throughput limit in bytes/s")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Chance of a 503 per request")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Chance of a 403 rate limit per request")
+    parser.add_argument("--quota-per-minute", type=float, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    drive = FakeDrive()
+    started = time.perf_counter()
+    drive.generate_tree(files=args.files, files_per_folder=args.files_per_folder, seed=args.seed)
+    logger.info(f"Generated {args.files} files in {time.perf_counter() - started:.1f}s")
+    server = FakeDriveServer(drive, port=args.port, latency=args.latency, jitter=args.jitter,
+                             bandwidth=args.bandwidth, failure_rate=args.failure_rate,
+                             rate_limit_rate=args.rate_limit_rate, quota_per_minute=args.quota_per_minute,
+                             seed=args.seed)
+    logger.info(f"Fake Drive API at {server.url}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,13 @@
 import logging
 import functools
-from typing import List, Dict, Any, Optional, Callable
+from typing import List, Dict, Any, Optional, Callable, Union
 from googleapiclient.errors import HttpError
 from .client import DriveClient
-
+from .mirror import MetadataMirror
 from .audit import AuditLogger
+from .scheduler import RequestScheduler
+from .content_cache import ContentCache
+from .paths import PathResolver, Lookup, FIND
 
 logger = logging.getLogger(__name__)
 
@@ -34,9 +37,78 @@ class IntelligentDriveClient(DriveClient):
     """
     An advanced Drive client that implements autonomous patterns and self-healing.
     """
-    def __init__(self, audit: Optional[AuditLogger] = None):
-        super().__init__()
+    def __init__(self, audit: Optional[AuditLogger] = None, mirror: Optional[MetadataMirror] = None,
+                 path_cache_ttl: float = 300.0, scheduler: Optional[RequestScheduler] = None,
+                 creds=None, api_endpoint: Optional[str] = None,
+                 content_cache: Optional[ContentCache] = None):
+        super().__init__(mirror=mirror, scheduler=scheduler, creds=creds, api_endpoint=api_endpoint,
+                         content_cache=content_cache)
         self.audit = audit
+        self.paths = PathResolver(audit=audit, ttl=path_cache_ttl)
+
+    def _invalidate_paths(self, file_id: Optional[str] = None, parent_id: Optional[str] = None):
+        self.paths.invalidate(file_id=file_id, parent_id=parent_id)
+
+    def cache_stats(self) -> Dict[str, Any]:
+        stats = super().cache_stats()
+        stats.update(self.paths.stats())
+        return stats
+
+    def _lookup(self, lookup: Lookup) -> List[Dict[str, Any]]:
+        """Answers a PathResolver lookup."""
+        if lookup[0] == FIND:
+            return self.find_by_name(lookup[1], parent_id=lookup[2])
+        return self.list_folder_children(lookup[1], limit=None)
+
+    def create_folder(self, name: str, parent_id: str = 'root') -> Dict[str, Any]:
+        result = super().create_folder(name, parent_id)
+        self._invalidate_paths(parent_id=parent_id)
+        return result
+
+    def upload_file(self, name: str, content: Union[str, bytes], parent_id: str = 'root', mime_type: str = 'text/plain') -> Dict[str, Any]:
+        result = super().upload_file(name, content, parent_id=parent_id, mime_type=mime_type)
+        self._invalidate_paths(parent_id=parent_id)
+        return result
+
+    def upload_from_local(self, local_path: str, parent_id: str = 'root', **kwargs) -> Dict[str, Any]:
+        result = super().upload_from_local(local_path, parent_id=parent_id, **kwargs)
+        self._invalidate_paths(parent_id=parent_id)
+        return result
+
+    def trash_file(self, file_id: str) -> Dict[str, Any]:
+        result = super().trash_file(file_id)
+        self._invalidate_paths(file_id=file_id)
+        return result
+
+    def move_file(self, file_id: str, new_parent_id: str) -> Dict[str, Any]:
+        result = super().move_file(file_id, new_parent_id)
+        self._invalidate_paths(file_id=file_id, parent_id=new_parent_id)
+        return result
+
+    def update_many(self, updates: Dict[str, Dict[str, Any]], **kwargs) -> Dict[str, Dict[str, Any]]:
+        result = super().update_many(updates, **kwargs)
+        folders = set()
+        for file_id in result["succeeded"]:
+            self._invalidate_paths(file_id=file_id)
+            update = updates[file_id]
+            for key in ('addParents', 'removeParents'):
+                folders.update(p for p in (update.get(key) or '').split(',') if p)
+        # The folders files moved into or out of list different children now
+        for folder_id in folders:
+            self._invalidate_paths(parent_id=folder_id)
+        return result
+
+    def move_many(self, file_ids: List[str], new_parent_id: str, **kwargs) -> Dict[str, Dict[str, Any]]:
+        result = super().move_many(file_ids, new_parent_id, **kwargs)
+        self._invalidate_paths(parent_id=new_parent_id)
+        return result
+
+    def move_files(self, source_folder_id: str, dest_folder_id: str, **kwargs) -> Dict[str, Any]:
+        result = super().move_files(source_folder_id, dest_folder_id, **kwargs)
+        if result.get("moved"):
+            self._invalidate_paths(parent_id=dest_folder_id)
+            self._invalidate_paths(parent_id=source_folder_id)
+        return result
     
     @self_healing_recovery
     def get_file_metadata(self, file_id: str) -> Dict[str, Any]:
@@ -55,49 +127,56 @@ class IntelligentDriveClient(DriveClient):
             logger.error(f"Intelligent Download failed for {file_id}: {error}")
             raise
 
+    @self_healing_recovery
+    def extract_text(self, file_id: str) -> Optional[Dict[str, Any]]:
+        return super().extract_text(file_id)
+
+    @self_healing_recovery
+    def download_range(self, file_id: str, offset: int = 0, length: Optional[int] = None, **kwargs) -> bytes:
+        return super().download_range(file_id, offset=offset, length=length, **kwargs)
+
+    @self_healing_recovery
+    def download_to_path(self, file_id: str, dest_path: str, **kwargs) -> Dict[str, Any]:
+        return super().download_to_path(file_id, dest_path, **kwargs)
+
     def find_and_heal_path(self, path: str) -> Optional[str]:
         """
         Autonomous Path Discovery with Active Healing. 
         If a path like /Project/2026/Budgt fails, it auto-corrects to the closest match.
+        Returns the file ID, or None if the path cannot be resolved (see resolve_path for suggestions).
+        """
+        return self.resolve_path(path)["id"]
+
+    def resolve_path(self, path: str, suggestions: int = 5, heal: bool = True) -> Dict[str, Any]:
+        """
+        Resolves a human-readable path to a file ID, healing misspelt components.
+        Resolved prefixes are cached under their real names, so only components below the longest
+        cached prefix are looked up.
+        A component without an exact match is compared with every child of its folder (see
+        name_index.NameIndex) and replaced by the best candidate if it is a clear winner.
+        With heal=False only exact matches are accepted; use it for folders that will be written to.
+        Returns {"id", "path", "healed"}; on failure "id" is None and the result names the
+        "missing" component, the "resolved" prefix and the closest "suggestions".
+        """
+        steps = self.paths.resolve(path, suggestions=suggestions, heal=heal)
+        try:
+            lookup = next(steps)
+            while True:
+                lookup = steps.send(self._lookup(lookup))
+        except StopIteration as done:
+            return done.value
+
+    def ensure_folder_path(self, path: str) -> str:
+        """
+        Returns the ID of the folder at path, resolved exactly (never healed), creating the
+        folders that do not exist yet.
         """
+        result = self.resolve_path(path, heal=False)
+        if result["id"]:
+            return result["id"]
         parts = [p for p in path.split('/') if p]
-        current_parent = 'root'
-        healed_path_parts = []
-        
-        for part in parts:
-            # Try exact match first
-            results = self.list_files(query=f"name = '{part}' and '{current_parent}' in parents")
-            
-            if results:
-                current_parent = results[0]['id']
-                healed_path_parts.append(part)
-                continue
-                
-            # Exact match failed. Attempt Active Healing.
-            # 1. Get all children of the current parent
-            children = self.list_files(query=f"'{current_parent}' in parents")
-            
-            # 2. Simple fuzzy match: case-insensitive match or name contains
-            matches = [c for c in children if part.lower() in c['name'].lower()]
-            
-            if len(matches) == 1:
-                # High confidence recovery
-                healed_name = matches[0]['name']
-                old_id = current_parent
-                current_parent = matches[0]['id']
-                
-                logger.info(f"Active Healing: Resolved '{part}' -> '{healed_name}' in folder {old_id}")
-                if self.audit:
-                    self.audit.log_recovery(part, healed_name, True)
-                
-                healed_path_parts.append(healed_name)
-            else:
-                # No definitive match
-                if self.audit:
-                    self.audit.log_recovery(part, "Ambiguous/Not Found", False)
-                
-                suggestion_names = [c["name"] for c in children]
-                logger.warning(f"Path break at '{part}'. Suggestions: {suggestion_names}")
-                return None
-            
-        return current_parent
+        existing = [p for p in result["resolved"].split('/') if p]
+        parent_id = self.resolve_path(result["resolved"], heal=False)["id"]
+        for name in parts[len(existing):]:
+            parent_id = self.create_folder(name, parent_id)['id']
+        return parent_id
@@ -0,0 +1,29 @@
+import threading
+from typing import Any, Callable, Generic, TypeVar
+
+T = TypeVar("T")
+
+class Lazy(Generic[T]):
+    """
+    Stand-in for an object that is expensive to create (or to import the code for).
+    The factory runs once, on the first attribute access or call to get(), from whichever
+    thread gets there first; every attribute is then forwarded to the real object.
+    """
+    def __init__(self, factory: Callable[[], T]):
+        self._factory = factory
+        self._instance = None
+        self._lock = threading.Lock()
+
+    def get(self) -> T:
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = self._factory()
+        return self._instance
+
+    @property
+    def created(self) -> bool:
+        return self._instance is not None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.get(), name)
@@ -0,0 +1,277 @@
+"""
+In-process metrics: call counts, latency histograms, bytes transferred and retries, recorded
+per MCP tool and per Drive API method. Everything records into the module-level METRICS registry,
+which the server_stats tool and resource report and serve_prometheus() exposes for scraping.
+"""
+import time
+import asyncio
+import bisect
+import logging
+import functools
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Latency bucket upper bounds in seconds (Prometheus client defaults, extended for cache hits and slow exports)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+# The tool being run, so Drive API calls can be attributed to it
+_current_tool: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("current_tool", default=None)
+
+class Histogram:
+    """Fixed-bucket latency histogram; quantiles are interpolated within a bucket."""
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        # One extra bucket for observations above the last bound
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                if i == len(self.buckets):
+                    return self.max
+                # Never report more than was actually observed
+                return min(self.max, lower + (self.buckets[i] - lower) * (rank - seen) / n)
+            seen += n
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        def _ms(value: Optional[float]) -> Optional[float]:
+            return round(value * 1000, 1) if value is not None else None
+        return {
+            "count": self.count,
+            "mean_ms": _ms(self.sum / self.count) if self.count else None,
+            "p50_ms": _ms(self.quantile(0.5)),
+            "p95_ms": _ms(self.quantile(0.95)),
+            "p99_ms": _ms(self.quantile(0.99)),
+        }
+
+class _Series:
+    """Everything recorded for one tool or API method."""
+    def __init__(self):
+        self.latency = Histogram()
+        self.errors = 0
+        self.retries = 0
+        # For tools: Drive API calls made while the tool ran
+        self.api_calls = 0
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple[str, str], _Series] = {}
+        self._bytes: Dict[str, int] = {}
+        self.started = time.time()
+
+    def _get(self, kind: str, name: str) -> _Series:
+        series = self._series.get((kind, name))
+        if series is None:
+            series = self._series[(kind, name)] = _Series()
+        return series
+
+    def observe(self, kind: str, name: str, seconds: float, error: bool = False):
+        """Records one call of a tool (kind 'tool') or Drive API method (kind 'api')."""
+        with self._lock:
+            series = self._get(kind, name)
+            series.latency.observe(seconds)
+            if error:
+                series.errors += 1
+            tool = _current_tool.get()
+            if kind == "api" and tool:
+                self._get("tool", tool).api_calls += 1
+
+    def record_retry(self, kind: str, name: str):
+        with self._lock:
+            self._get(kind, name).retries += 1
+
+    def add_bytes(self, direction: str, count: int):
+        """Counts payload bytes; direction is 'download' or 'upload'."""
+        with self._lock:
+            self._bytes[direction] = self._bytes.get(direction, 0) + count
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+            self._bytes.clear()
+            self.started = time.time()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            result: Dict[str, Any] = {"uptime_seconds": round(time.time() - self.started, 1),
+                                      "tools": {}, "api": {}, "bytes": dict(self._bytes)}
+            for (kind, name), series in sorted(self._series.items()):
+                entry = series.latency.summary()
+                entry["errors"] = series.errors
+                entry["retries"] = series.retries
+                if kind == "tool":
+                    entry["api_calls"] = series.api_calls
+                result["tools" if kind == "tool" else "api"][name] = entry
+            return result
+
+    def prometheus(self) -> str:
+        """The metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            for kind, label in (("tool", "tool"), ("api", "method")):
+                prefix = f"gdrive_forge_{kind}"
+                lines += [f"# HELP {prefix}_duration_seconds Call latency.",
+                          f"# TYPE {prefix}_duration_seconds histogram"]
+                for (series_kind, name), series in sorted(self._series.items()):
+                    if series_kind != kind:
+                        continue
+                    histogram = series.latency
+                    cumulative = 0
+                    for bound, n in zip(histogram.buckets, histogram.counts):
+                        cumulative += n
+                        lines.append(f'{prefix}_duration_seconds_bucket{{{label}="{name}",le="{bound}"}} {cumulative}')
+                    lines.append(f'{prefix}_duration_seconds_bucket{{{label}="{name}",le="+Inf"}} {histogram.count}')
+                    lines.append(f'{prefix}_duration_seconds_sum{{{label}="{name}"}} {histogram.sum}')
+                    lines.append(f'{prefix}_duration_seconds_count{{{label}="{name}"}} {histogram.count}')
+                counters = ["errors", "retries"] + (["api_calls"] if kind == "tool" else [])
+                for counter in counters:
+                    lines += [f"# TYPE {prefix}_{counter}_total counter"]
+                    for (series_kind, name), series in sorted(self._series.items()):
+                        if series_kind == kind:
+                            lines.append(f'{prefix}_{counter}_total{{{label}="{name}"}} {getattr(series, counter)}')
+            lines.append("# TYPE gdrive_forge_bytes_total counter")
+            for direction, count in sorted(self._bytes.items()):
+                lines.append(f'gdrive_forge_bytes_total{{direction="{direction}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+METRICS = MetricsRegistry()
+
+class timed:
+    """
+    Context manager that records the duration of a block. The call counts as an error if the
+    block raises or sets `failed` on the returned object.
+    """
+    def __init__(self, kind: str, name: str, registry: MetricsRegistry = METRICS):
+        self.kind = kind
+        self.name = name
+        self.registry = registry
+
+    def __enter__(self):
+        self.failed = False
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.registry.observe(self.kind, self.name, time.perf_counter() - self._started,
+                              error=exc_type is not None or self.failed)
+        return False
+
+def _failed(result: Any) -> bool:
+    # Tools report most failures as an "Error: ..." string rather than raising
+    return isinstance(result, str) and result.startswith("Error")
+
+def instrument_tool(fn: Callable, name: Optional[str] = None, registry: MetricsRegistry = METRICS) -> Callable:
+    """
+    Wraps a tool function so each call is timed and the Drive API calls it makes are counted
+    against it. The signature is kept for FastMCP's schema.
+    """
+    name = name or fn.__name__
+
+    if asyncio.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def async_wrapper(*args, **kwargs):
+            token = _current_tool.set(name)
+            started = time.perf_counter()
+            failed = True
+            try:
+                result = await fn(*args, **kwargs)
+                failed = _failed(result)
+                return result
+            finally:
+                registry.observe("tool", name, time.perf_counter() - started, error=failed)
+                _current_tool.reset(token)
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        token = _current_tool.set(name)
+        started = time.perf_counter()
+        failed = True
+        try:
+            result = fn(*args, **kwargs)
+            failed = _failed(result)
+            return result
+        finally:
+            registry.observe("tool", name, time.perf_counter() - started, error=failed)
+            _current_tool.reset(token)
+    return wrapper
+
+class ContextThreadPoolExecutor(ThreadPoolExecutor):
+    """
+    ThreadPoolExecutor whose tasks run in a copy of the submitting thread's context, so the Drive
+    calls they make are still counted against the tool that started them.
+    """
+    def submit(self, fn, /, *args, **kwargs):
+        return super().submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+def instrument_server(mcp, registry: MetricsRegistry = METRICS):
+    """Makes every tool registered on `mcp` from now on record its calls in the registry."""
+    register = mcp.tool
+
+    def tool(*args, **kwargs):
+        decorator = register(*args, **kwargs)
+
+        def _register(fn):
+            decorator(instrument_tool(fn, kwargs.get("name"), registry))
+            return fn
+        return _register
+
+    mcp.tool = tool
+
+def server_stats(client: Any = None, registry: MetricsRegistry = METRICS) -> Dict[str, Any]:
+    """
+    The registry snapshot plus, once the client exists, its cache hit ratios and scheduler counters.
+    A client behind a Lazy that has not been created yet is not forced into existence.
+    """
+    stats = registry.snapshot()
+    if client is not None and getattr(client, "created", True):
+        stats["caches"] = client.cache_stats()
+        scheduler = getattr(client, "scheduler", None)
+        if scheduler is not None:
+            stats["scheduler"] = scheduler.stats()
+    return stats
+
+def serve_prometheus(port: int, host: str = "127.0.0.1", registry: MetricsRegistry = METRICS):
+    """Serves the registry at http://host:port/metrics from a background thread."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            # Keep scrapes out of the server log (and off stdout, which carries the MCP stream)
+            pass
+
+    server = ThreadingHTTPServer((host, port), _Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    logger.info(f"Prometheus metrics at http://{host}:{port}/metrics")
+    return server
@@ -0,0 +1,423 @@
+import os
+import re
+import json
+import time
+import sqlite3
+import logging
+import threading
+from typing import List, Dict, Any, Optional, Callable
+
+logger = logging.getLogger(__name__)
+
+FILE_FIELDS = "id, name, mimeType, parents, owners, modifiedTime, webViewLink, size"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    mime_type TEXT,
+    modified_time TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_name ON files (name);
+CREATE INDEX IF NOT EXISTS files_modified ON files (modified_time);
+CREATE TABLE IF NOT EXISTS parents (
+    file_id TEXT NOT NULL,
+    parent_id TEXT NOT NULL,
+    PRIMARY KEY (parent_id, file_id)
+);
+CREATE INDEX IF NOT EXISTS parents_file ON parents (file_id);
+CREATE TABLE IF NOT EXISTS state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Full-text index over names, paths and extracted text (needs SQLite built with FTS5)
+SEARCH_SCHEMA = """
+CREATE TABLE IF NOT EXISTS search_docs (
+    id INTEGER PRIMARY KEY,
+    file_id TEXT NOT NULL UNIQUE,
+    text_version TEXT
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS search USING fts5(
+    name, path, content, tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+);
+"""
+# bm25 column weights: a hit in the name outranks one in the path, which outranks one in the text
+SEARCH_WEIGHTS = (10.0, 3.0, 1.0)
+FOLDER_MIME_TYPE = 'application/vnd.google-apps.folder'
+
+_QUERY_TERMS = re.compile(r'"([^"]*)"|(\S+)')
+
+def fts_query(text: str) -> str:
+    """
+    Turns user search text into an FTS5 query that cannot be a syntax error.
+    "Quoted words" stay phrases, a trailing * makes a term a prefix match, and every other
+    term is quoted, so punctuation and FTS operators in the text are matched literally.
+    """
+    terms = []
+    for phrase, word in _QUERY_TERMS.findall(text):
+        term = phrase if phrase else word
+        prefix = not phrase and term.endswith('*')
+        term = term.rstrip('*').replace('"', '""').strip()
+        if term:
+            terms.append(f'"{term}"' + ('*' if prefix else ''))
+    return " ".join(terms)
+
+def _execute(request) -> Any:
+    return request.execute()
+
+class MetadataMirror:
+    """
+    Persistent SQLite copy of Drive file metadata.
+    Filled once by a full crawl, then kept current from the changes feed.
+    """
+    def __init__(self, mirror_dir: str, sync_interval: float = 30.0):
+        os.makedirs(mirror_dir, exist_ok=True)
+        self.db_path = os.path.join(mirror_dir, "metadata.sqlite3")
+        self.sync_interval = sync_interval
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        try:
+            self._conn.executescript(SEARCH_SCHEMA)
+            self.search_enabled = True
+        except sqlite3.OperationalError:
+            logger.warning("SQLite has no FTS5 support; mirror searches fall back to name matching")
+            self.search_enabled = False
+        self._last_sync = 0.0
+        self._stale = False
+        if self.search_enabled and self.is_populated() and self._get_state("search_built") is None:
+            # Mirror created before the search index existed
+            with self._lock:
+                self._rebuild_search()
+                self._conn.commit()
+
+    # --- State ---
+
+    def _get_state(self, key: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_state(self, key: str, value: str):
+        self._conn.execute("INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)", (key, value))
+
+    def is_populated(self) -> bool:
+        """True once a full crawl has completed and a change token is saved."""
+        with self._lock:
+            return self._get_state("start_page_token") is not None
+
+    def mark_stale(self):
+        """Forces a changes feed sync before the next read (e.g. after a write)."""
+        self._stale = True
+
+    def _resolve_parent(self, parent_id: str) -> str:
+        if parent_id == 'root':
+            return self._get_state("root_id") or parent_id
+        return parent_id
+
+    # --- Writes ---
+
+    def _upsert(self, file: Dict[str, Any]) -> bool:
+        """Stores a file. Returns True if it was renamed or moved, which changes the paths below it."""
+        file_id = file['id']
+        old = self._conn.execute("SELECT name FROM files WHERE id = ?", (file_id,)).fetchone()
+        old_parents = {r[0] for r in self._conn.execute("SELECT parent_id FROM parents WHERE file_id = ?", (file_id,))}
+        self._conn.execute(
+            "INSERT OR REPLACE INTO files (id, name, mime_type, modified_time, data) VALUES (?, ?, ?, ?, ?)",
+            (file_id, file.get('name', ''), file.get('mimeType'), file.get('modifiedTime'), json.dumps(file))
+        )
+        self._conn.execute("DELETE FROM parents WHERE file_id = ?", (file_id,))
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO parents (file_id, parent_id) VALUES (?, ?)",
+            [(file_id, p) for p in file.get('parents', [])]
+        )
+        return old is not None and (old[0] != file.get('name', '') or old_parents != set(file.get('parents', [])))
+
+    def _remove(self, file_id: str):
+        self._conn.execute("DELETE FROM files WHERE id = ?", (file_id,))
+        self._conn.execute("DELETE FROM parents WHERE file_id = ?", (file_id,))
+        if self.search_enabled:
+            self._unindex(file_id)
+
+    # --- Search index ---
+
+    def _path(self, file_id: str, memo: Dict[str, str]) -> str:
+        """'/Folder/Sub/name' through each file's (lowest-ID) parent; the root folder is ''."""
+        if file_id in memo:
+            return memo[file_id]
+        chain = []
+        current = file_id
+        while current is not None and current not in memo and len(chain) < 64:
+            row = self._conn.execute("SELECT name FROM files WHERE id = ?", (current,)).fetchone()
+            if row is None:
+                # The root (or a folder outside the mirror)
+                memo[current] = ""
+                break
+            chain.append((current, row[0]))
+            # The same parent _rebuild_search picks for files with several
+            current = self._conn.execute(
+                "SELECT MIN(parent_id) FROM parents WHERE file_id = ?", (current,)
+            ).fetchone()[0]
+        prefix = memo.get(current, "") if current is not None else ""
+        for fid, name in reversed(chain):
+            prefix = f"{prefix}/{name}"
+            memo[fid] = prefix
+        return memo[file_id]
+
+    def _unindex(self, file_id: str):
+        doc = self._conn.execute("SELECT id FROM search_docs WHERE file_id = ?", (file_id,)).fetchone()
+        if doc:
+            self._conn.execute("DELETE FROM search WHERE rowid = ?", (doc[0],))
+            self._conn.execute("DELETE FROM search_docs WHERE id = ?", (doc[0],))
+
+    def _index(self, file_id: str, memo: Dict[str, str], text: Optional[str] = None):
+        """(Re)indexes one file. Extracted text is kept while the file's modifiedTime is unchanged."""
+        row = self._conn.execute("SELECT name, modified_time FROM files WHERE id = ?", (file_id,)).fetchone()
+        if row is None:
+            self._unindex(file_id)
+            return
+        name, modified_time = row
+        doc = self._conn.execute("SELECT id, text_version FROM search_docs WHERE file_id = ?", (file_id,)).fetchone()
+        if text is None:
+            text = ""
+            if doc and doc[1] == modified_time:
+                kept = self._conn.execute("SELECT content FROM search WHERE rowid = ?", (doc[0],)).fetchone()
+                text = kept[0] if kept else ""
+        if doc:
+            doc_id = doc[0]
+            self._conn.execute("DELETE FROM search WHERE rowid = ?", (doc_id,))
+            self._conn.execute("UPDATE search_docs SET text_version = ? WHERE id = ?",
+                               (modified_time if text else None, doc_id))
+        else:
+            doc_id = self._conn.execute(
+                "INSERT INTO search_docs (file_id, text_version) VALUES (?, ?)",
+                (file_id, modified_time if text else None)
+            ).lastrowid
+        self._conn.execute("INSERT INTO search (rowid, name, path, content) VALUES (?, ?, ?, ?)",
+                           (doc_id, name, self._path(file_id, memo), text))
+
+    def _reindex_subtree(self, folder_id: str, memo: Dict[str, str]):
+        queue = [folder_id]
+        while queue:
+            children = [r[0] for r in self._conn.execute(
+                "SELECT file_id FROM parents WHERE parent_id = ?", (queue.pop(),)
+            )]
+            for child in children:
+                self._index(child, memo)
+            queue.extend(children)
+
+    def _rebuild_search(self):
+        """Indexes every mirrored file, keeping extracted text that is still current."""
+        kept = {
+            file_id: (version, content) for file_id, version, content in self._conn.execute(
+                "SELECT d.file_id, d.text_version, s.content FROM search_docs d "
+                "JOIN search s ON s.rowid = d.id WHERE d.text_version IS NOT NULL"
+            )
+        }
+        self._conn.execute("DELETE FROM search")
+        self._conn.execute("DELETE FROM search_docs")
+        files = self._conn.execute("SELECT id, name, modified_time FROM files").fetchall()
+        first_parent = dict(self._conn.execute("SELECT file_id, MIN(parent_id) FROM parents GROUP BY file_id"))
+        names = {fid: name for fid, name, _ in files}
+        memo: Dict[str, str] = {}
+
+        def path(fid: str) -> str:
+            chain = []
+            while fid in names and fid not in memo and len(chain) < 64:
+                chain.append(fid)
+                fid = first_parent.get(fid)
+            prefix = memo.get(fid, "")
+            for item in reversed(chain):
+                prefix = f"{prefix}/{names[item]}"
+                memo[item] = prefix
+            return prefix
+
+        for doc_id, (fid, name, modified_time) in enumerate(files, start=1):
+            version, content = kept.get(fid, (None, ""))
+            if version != modified_time:
+                version, content = None, ""
+            self._conn.execute("INSERT INTO search_docs (id, file_id, text_version) VALUES (?, ?, ?)",
+                               (doc_id, fid, version))
+            self._conn.execute("INSERT INTO search (rowid, name, path, content) VALUES (?, ?, ?, ?)",
+                               (doc_id, name, path(fid), content))
+        self._set_state("search_built", str(time.time()))
+
+    def index_text(self, file_id: str, text: str, modified_time: Optional[str]):
+        """Adds a file's extracted text to the search index for the given revision."""
+        if not self.search_enabled:
+            return
+        with self._lock:
+            row = self._conn.execute("SELECT modified_time FROM files WHERE id = ?", (file_id,)).fetchone()
+            if row is None or row[0] != modified_time:
+                # Not mirrored, or the mirror has not seen this revision yet
+                return
+            self._index(file_id, {}, text=text)
+            self._conn.commit()
+
+    def crawl(self, service, execute: Callable[[Any], Any] = _execute) -> int:
+        """
+        Rebuilds the mirror from a full listing of the drive.
+        The change token is taken before listing so nothing is missed during the crawl.
+        `execute` runs each API request (DriveClient passes its rate-limited executor).
+        """
+        token = execute(service.changes().getStartPageToken())['startPageToken']
+        root_id = execute(service.files().get(fileId='root', fields='id'))['id']
+
+        count = 0
+        page_token = None
+        with self._lock:
+            self._conn.execute("DELETE FROM files")
+            self._conn.execute("DELETE FROM parents")
+            self._conn.execute("DELETE FROM state")
+        while True:
+            results = execute(service.files().list(
+                q="trashed = false",
+                pageSize=1000,
+                pageToken=page_token,
+                fields=f"nextPageToken, files({FILE_FIELDS})"
+            ))
+            files = results.get('files', [])
+            with self._lock:
+                for f in files:
+                    self._upsert(f)
+                self._conn.commit()
+            count += len(files)
+            page_token = results.get('nextPageToken')
+            if not page_token:
+                break
+
+        with self._lock:
+            if self.search_enabled:
+                self._rebuild_search()
+            self._set_state("root_id", root_id)
+            self._set_state("start_page_token", token)
+            self._conn.commit()
+            self._last_sync = time.monotonic()
+            self._stale = False
+        logger.info(f"Metadata mirror crawl complete: {count} files")
+        return count
+
+    def sync(self, service, execute: Callable[[Any], Any] = _execute) -> int:
+        """Applies pending entries from the changes feed. Returns the number of changes."""
+        with self._lock:
+            page_token = self._get_state("start_page_token")
+        if page_token is None:
+            raise RuntimeError("Metadata mirror is not populated. Run a full crawl first.")
+
+        count = 0
+        while page_token:
+            results = execute(service.changes().list(
+                pageToken=page_token,
+                pageSize=1000,
+                includeRemoved=True,
+                spaces='drive',
+                fields=f"nextPageToken, newStartPageToken, changes(fileId, removed, file({FILE_FIELDS}, trashed))"
+            ))
+            with self._lock:
+                memo: Dict[str, str] = {}
+                for change in results.get('changes', []):
+                    file = change.get('file')
+                    if change.get('removed') or not file or file.pop('trashed', False):
+                        self._remove(change['fileId'])
+                    else:
+                        relocated = self._upsert(file)
+                        if self.search_enabled:
+                            memo.clear()
+                            self._index(file['id'], memo)
+                            if relocated and file.get('mimeType') == FOLDER_MIME_TYPE:
+                                self._reindex_subtree(file['id'], memo)
+                    count += 1
+                new_token = results.get('newStartPageToken')
+                page_token = results.get('nextPageToken')
+                self._set_state("start_page_token", new_token or page_token)
+                self._conn.commit()
+
+        self._last_sync = time.monotonic()
+        self._stale = False
+        if count:
+            logger.info(f"Metadata mirror applied {count} changes")
+        return count
+
+    def refresh(self, service, execute: Callable[[Any], Any] = _execute):
+        """Syncs from the changes feed if the mirror is stale or the interval has elapsed."""
+        if self._stale or time.monotonic() - self._last_sync >= self.sync_interval:
+            self.sync(service, execute=execute)
+
+    # --- Reads ---
+
+    def _files(self, sql: str, params: tuple) -> List[Dict[str, Any]]:
+        # SQLite treats a negative LIMIT as unbounded
+        params = tuple(-1 if p is None else p for p in params)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [json.loads(r[0]) for r in rows]
+
+    def get(self, file_id: str) -> Optional[Dict[str, Any]]:
+        files = self._files("SELECT data FROM files WHERE id = ?", (file_id,))
+        return files[0] if files else None
+
+    def recent(self, limit: Optional[int]) -> List[Dict[str, Any]]:
+        return self._files("SELECT data FROM files ORDER BY modified_time DESC LIMIT ?", (limit,))
+
+    def children(self, parent_id: str, limit: Optional[int]) -> List[Dict[str, Any]]:
+        with self._lock:
+            parent_id = self._resolve_parent(parent_id)
+        return self._files(
+            "SELECT f.data FROM parents p JOIN files f ON f.id = p.file_id "
+            "WHERE p.parent_id = ? ORDER BY f.name LIMIT ?",
+            (parent_id, limit)
+        )
+
+    def find_by_name(self, name: str, parent_id: Optional[str] = None, limit: Optional[int] = 10) -> List[Dict[str, Any]]:
+        if parent_id is None:
+            return self._files("SELECT data FROM files WHERE name = ? LIMIT ?", (name, limit))
+        with self._lock:
+            parent_id = self._resolve_parent(parent_id)
+        return self._files(
+            "SELECT f.data FROM parents p JOIN files f ON f.id = p.file_id "
+            "WHERE p.parent_id = ? AND f.name = ? LIMIT ?",
+            (parent_id, name, limit)
+        )
+
+    def search_name(self, text: str, limit: Optional[int]) -> List[Dict[str, Any]]:
+        pattern = "%" + text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        return self._files(
+            "SELECT data FROM files WHERE name LIKE ? ESCAPE '\\' ORDER BY modified_time DESC LIMIT ?",
+            (pattern, limit)
+        )
+
+    def search(self, text: str, limit: Optional[int]) -> List[Dict[str, Any]]:
+        """
+        Ranked full-text search over names, paths and extracted text. Supports "phrases" and
+        prefix* terms. Falls back to a name substring match without FTS5.
+        """
+        if not self.search_enabled:
+            return self.search_name(text, limit)
+        query = fts_query(text)
+        if not query:
+            return []
+        weights = ", ".join(str(w) for w in SEARCH_WEIGHTS)
+        return self._files(
+            "SELECT f.data FROM search JOIN search_docs d ON d.id = search.rowid "
+            f"JOIN files f ON f.id = d.file_id WHERE search MATCH ? ORDER BY bm25(search, {weights}) LIMIT ?",
+            (query, limit)
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+            populated = self._get_state("start_page_token") is not None
+            indexed_text = self._conn.execute(
+                "SELECT COUNT(*) FROM search_docs WHERE text_version IS NOT NULL"
+            ).fetchone()[0] if self.search_enabled else None
+        return {
+            "path": self.db_path,
+            "populated": populated,
+            "files": count,
+            "full_text_search": self.search_enabled,
+            "files_with_text": indexed_text,
+            "seconds_since_sync": round(time.monotonic() - self._last_sync, 1) if self._last_sync else None,
+        }
@@ -0,0 +1,91 @@
+import re
+import heapq
+import difflib
+from collections import Counter, defaultdict
+from operator import itemgetter
+from typing import Any, Dict, List, Optional, Tuple
+
+# Candidates scoring below this are not offered as a match for a missing name
+MATCH_THRESHOLD = 0.6
+# The best candidate must beat the runner-up by this much to be used without asking
+MIN_MARGIN = 0.1
+# Candidates preselected by trigram overlap before the more expensive edit-distance ranking
+CANDIDATES = 50
+
+_SEPARATORS = re.compile(r"[\s_\-.]+")
+
+def normalize(name: str) -> str:
+    """Case-folds a name and treats runs of spaces, dots, dashes and underscores as one space."""
+    return _SEPARATORS.sub(" ", name.casefold()).strip()
+
+def trigrams(text: str) -> set:
+    # Padding gives short names and word starts trigrams of their own
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class NameIndex:
+    """
+    Trigram index over the children of one folder, used to rank names close to a missing one.
+    Built once per folder listing, so each lookup only scores the children sharing trigrams with
+    the query instead of comparing it with every sibling.
+    """
+    def __init__(self, children: List[Dict[str, Any]]):
+        self.children = children
+        self.ids = {c['id'] for c in children}
+        self._by_name: Dict[str, Dict[str, Any]] = {}
+        self._normalized: List[str] = []
+        self._sizes: List[int] = []
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        for pos, child in enumerate(children):
+            self._by_name.setdefault(child['name'], child)
+            name = normalize(child['name'])
+            grams = trigrams(name)
+            self._normalized.append(name)
+            self._sizes.append(len(grams))
+            for gram in grams:
+                self._postings[gram].append(pos)
+
+    def __len__(self) -> int:
+        return len(self.children)
+
+    def __contains__(self, file_id: str) -> bool:
+        return file_id in self.ids
+
+    def exact(self, name: str) -> Optional[Dict[str, Any]]:
+        return self._by_name.get(name)
+
+    def suggest(self, name: str, k: int = 5) -> List[Tuple[float, Dict[str, Any]]]:
+        """The k children most similar to `name` as (score, child), best first. Scores are 0-1."""
+        query = normalize(name)
+        grams = trigrams(query)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self._postings.get(gram, ()))
+        # Dice coefficient of the trigram sets
+        dice = ((pos, 2 * n / (len(grams) + self._sizes[pos])) for pos, n in shared.items())
+
+        scored = []
+        for pos, overlap in heapq.nlargest(CANDIDATES, dice, key=itemgetter(1)):
+            candidate = self._normalized[pos]
+            if candidate == query:
+                score = 1.0
+            else:
+                score = (overlap + difflib.SequenceMatcher(None, query, candidate).ratio()) / 2
+                if query and query in candidate:
+                    # A name typed without its extension or suffix ("budget" for "Budget_2026.xlsx")
+                    score = max(score, 0.7 + 0.3 * len(query) / len(candidate))
+            scored.append((round(score, 3), self.children[pos]))
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return scored[:k]
+
+    def heal(self, name: str, k: int = 5) -> Tuple[Optional[Dict[str, Any]], List[Tuple[float, Dict[str, Any]]]]:
+        """
+        Returns (match, suggestions). The match is the best candidate when it clears
+        MATCH_THRESHOLD and is clearly ahead of the next one; otherwise None.
+        """
+        ranked = self.suggest(name, k=max(k, 2))
+        if not ranked or ranked[0][0] < MATCH_THRESHOLD:
+            return None, ranked[:k]
+        if len(ranked) > 1 and ranked[0][0] - ranked[1][0] < MIN_MARGIN and ranked[0][0] < 1.0:
+            return None, ranked[:k]
+        return ranked[0][1], ranked[:k]
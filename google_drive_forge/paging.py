@@ -0,0 +1,68 @@
+from typing import Optional, Tuple
+
+# Bytes fetched per page when paging by lines without an explicit length
+DEFAULT_PAGE_BYTES = 64 * 1024
+# Longest UTF-8 encoding of one character
+MAX_CHAR_BYTES = 4
+
+def check_page_args(offset: int, length: Optional[int] = None, max_lines: Optional[int] = None):
+    """Raises ValueError for a page that cannot be served."""
+    if offset < 0:
+        raise ValueError(f"offset must be 0 or more, got {offset}")
+    if length is not None and length < 1:
+        raise ValueError(f"length must be at least 1, got {length}")
+    if max_lines is not None and max_lines < 1:
+        raise ValueError(f"max_lines must be at least 1, got {max_lines}")
+
+def _char_boundary(data: bytes) -> int:
+    """Length of the longest prefix of data that does not end inside a UTF-8 sequence."""
+    end = len(data)
+    # Walk back over at most three continuation bytes to the lead byte of the last character
+    for back in range(1, min(MAX_CHAR_BYTES, end) + 1):
+        byte = data[end - back]
+        if byte & 0xC0 != 0x80:
+            if byte >= 0xC0:
+                needed = 2 if byte < 0xE0 else 3 if byte < 0xF0 else 4
+                if back < needed:
+                    return end - back
+            return end
+    return end
+
+def text_page(chunk: bytes, offset: int, max_lines: Optional[int] = None,
+              at_end: bool = False) -> Tuple[str, Optional[int]]:
+    """
+    Decodes a chunk of a file read from byte `offset` as one page of UTF-8 text.
+    With max_lines, the page stops after that many lines. Unless the chunk reaches the end of
+    the file, it is cut at the last newline (or character boundary) so the next page starts
+    cleanly. Returns (text, next_offset); next_offset is None once the file is exhausted.
+    Raises UnicodeDecodeError for binary content, and ValueError if the chunk is too short to
+    hold the character at `offset`.
+    """
+    consumed = len(chunk)
+    if max_lines is not None:
+        position = 0
+        for _ in range(max_lines):
+            newline = chunk.find(b'\n', position)
+            if newline == -1:
+                position = len(chunk)
+                break
+            position = newline + 1
+        consumed = position
+    if consumed == len(chunk) and not at_end:
+        last_newline = chunk.rfind(b'\n')
+        consumed = last_newline + 1 if last_newline != -1 else _char_boundary(chunk)
+    if consumed == 0 and chunk:
+        # Returning an empty page would point the reader back at the same offset forever
+        raise ValueError(f"{len(chunk)} byte(s) at offset {offset} end inside a UTF-8 character; "
+                         f"read at least {MAX_CHAR_BYTES} bytes")
+    text = chunk[:consumed].decode('utf-8')
+    done = at_end and consumed == len(chunk)
+    return text, None if done else offset + consumed
+
+def page_footer(offset: int, text: str, next_offset: Optional[int], total: Optional[int]) -> str:
+    """Trailer telling the agent where a page sits in the file and how to read the next one."""
+    end = offset + len(text.encode('utf-8'))
+    of_total = f" of {total}" if total is not None else ""
+    if next_offset is None:
+        return f"\n[bytes {offset}-{end}{of_total}; end of file]"
+    return f"\n[bytes {offset}-{end}{of_total}; continue with offset={next_offset}]"
@@ -0,0 +1,114 @@
+import logging
+from typing import Any, Dict, Generator, Optional, Tuple
+
+from .audit import AuditLogger
+from .cache import TTLCache
+from .name_index import NameIndex
+
+logger = logging.getLogger(__name__)
+
+# Lookups yielded by PathResolver.resolve; the client sends back the matching files.
+# ("find", name, parent_id): files with exactly that name in the folder, best first.
+FIND = "find"
+# ("children", folder_id): every child of the folder, following all listing pages.
+CHILDREN = "children"
+
+Lookup = Tuple[str, ...]
+Resolution = Generator[Lookup, Any, Dict[str, Any]]
+
+class PathResolver:
+    """
+    Path resolution and its caches, shared by IntelligentDriveClient and AsyncDriveClient.
+    resolve() never calls Drive itself: it yields the lookups it needs and receives their
+    results, so the sync client answers them with blocking calls and the async client with
+    awaits while both fill and invalidate the same caches.
+    """
+    def __init__(self, audit: Optional[AuditLogger] = None, ttl: float = 300.0):
+        self.audit = audit
+        # Path prefix (tuple of components) -> (file_id, parent_id)
+        self.path_cache = TTLCache(maxsize=4096, ttl=ttl)
+        # folder_id -> NameIndex of its children, for healing
+        self.name_indexes = TTLCache(maxsize=256, ttl=ttl)
+
+    def invalidate(self, file_id: Optional[str] = None, parent_id: Optional[str] = None):
+        """Drops cached prefixes that resolve to file_id or live directly in parent_id, and everything below them."""
+        matched = [k for k, (fid, pid) in self.path_cache.items() if fid == file_id or pid == parent_id]
+        if matched:
+            self.path_cache.invalidate_where(lambda k, v: any(k[:len(m)] == m for m in matched))
+        if parent_id:
+            self.name_indexes.pop(parent_id)
+        if file_id:
+            self.name_indexes.invalidate_where(lambda k, index: file_id in index)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"paths": self.path_cache.stats(), "name_indexes": self.name_indexes.stats()}
+
+    def name_index(self, folder_id: str) -> Generator[Lookup, Any, NameIndex]:
+        """Index of every child of a folder, listing the folder only when it is not cached."""
+        index = self.name_indexes.get(folder_id)
+        if index is None:
+            index = NameIndex((yield (CHILDREN, folder_id)))
+            self.name_indexes.set(folder_id, index)
+        return index
+
+    def resolve(self, path: str, suggestions: int = 5, heal: bool = True) -> Resolution:
+        """
+        The steps of IntelligentDriveClient.resolve_path, which documents the result.
+        Components below the longest cached prefix are looked up exactly (from the folder's
+        NameIndex when cached, otherwise or on a miss with a FIND), then healed from the index
+        unless heal=False.
+        """
+        parts = [p for p in path.split('/') if p]
+        current_parent = 'root'
+        resolved_parts = []
+        healed = []
+        start = 0
+
+        for i in range(len(parts), 0, -1):
+            cached = self.path_cache.get(tuple(parts[:i]))
+            if cached:
+                current_parent = cached[0]
+                resolved_parts = parts[:i]
+                start = i
+                break
+
+        for index in range(start, len(parts)):
+            part = parts[index]
+            parent_id = current_parent
+            # Try exact match first, from the folder's index when it is already built
+            name_index = self.name_indexes.get(parent_id)
+            match = name_index.exact(part) if name_index is not None else None
+            if match is None:
+                # Asked even when the index misses: it may predate a file created since
+                results = yield (FIND, part, parent_id)
+                match = results[0] if results else None
+                if match is not None and name_index is not None:
+                    # Stale; rebuilt on the next heal in this folder
+                    self.name_indexes.pop(parent_id)
+
+            if match is None and not heal:
+                ranked = (yield from self.name_index(parent_id)).suggest(part, k=suggestions)
+                return {"id": None, "missing": part, "resolved": "/" + "/".join(resolved_parts),
+                        "suggestions": [{"name": c["name"], "id": c["id"], "score": score} for score, c in ranked]}
+            if match is None:
+                # Exact match failed. Attempt Active Healing.
+                match, ranked = (yield from self.name_index(parent_id)).heal(part, k=suggestions)
+                if match is None:
+                    if self.audit:
+                        self.audit.log_recovery(part, "Ambiguous/Not Found", False)
+                    suggestion_list = [{"name": c["name"], "id": c["id"], "score": score} for score, c in ranked]
+                    logger.warning(f"Path break at '{part}'. Suggestions: {[s['name'] for s in suggestion_list]}")
+                    return {"id": None, "missing": part, "resolved": "/" + "/".join(resolved_parts),
+                            "suggestions": suggestion_list}
+
+                logger.info(f"Active Healing: Resolved '{part}' -> '{match['name']}' in folder {parent_id}")
+                if self.audit:
+                    self.audit.log_recovery(part, match['name'], True)
+                healed.append({"from": part, "to": match['name'], "score": ranked[0][0]})
+
+            current_parent = match['id']
+            resolved_parts.append(match['name'])
+            # Keyed by the real names, so a healed path is never mistaken for an exact one
+            self.path_cache.set(tuple(resolved_parts), (current_parent, parent_id))
+
+        return {"id": current_parent, "path": "/" + "/".join(resolved_parts), "healed": healed}
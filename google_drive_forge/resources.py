@@ -1,9 +1,22 @@
+from typing import TYPE_CHECKING
 from mcp.server.fastmcp import Context, FastMCP
-from .client import DriveClient
 
-def register_resources(mcp: FastMCP, client: DriveClient):
+if TYPE_CHECKING:
+    from .client import DriveClient
+
+def register_resources(mcp: FastMCP, client: "DriveClient"):
     """Registers resource handlers to the MCP server."""
 
+    @mcp.resource("forge://stats")
+    def get_server_stats() -> str:
+        """
+        Server metrics: per-tool and per-Drive-method latency, errors and retries,
+        bytes transferred, cache hit ratios and rate limiter state.
+        """
+        import json
+        from .metrics import server_stats
+        return json.dumps(server_stats(client), indent=2)
+
     @mcp.resource("gdrive://{file_id}/content")
     def get_file_content(file_id: str) -> str:
         """
@@ -27,3 +40,25 @@ def register_resources(mcp: FastMCP, client: DriveClient):
                 return f"<Binary Content: {len(content_bytes)} bytes>"
         except Exception as e:
             return f"Error reading file {file_id}: {str(e)}"
+
+    @mcp.resource("gdrive://{file_id}/content/{offset}/{length}")
+    def get_file_content_range(file_id: str, offset: str, length: str) -> str:
+        """
+        Reads `length` bytes of a file starting at byte `offset`, without downloading the rest.
+        Ends with the offset to continue from.
+        """
+        from .paging import check_page_args, text_page, page_footer
+        start, count = int(offset), int(length)
+        check_page_args(start, count)
+        try:
+            meta = client.get_file_metadata(file_id)
+            chunk = client.download_range(file_id, start, count, mime_type=meta.get('mimeType'))
+            total = int(meta['size']) if meta.get('size') else None
+            at_end = len(chunk) < count or (total is not None and start + len(chunk) >= total)
+            try:
+                text, next_offset = text_page(chunk, start, at_end=at_end)
+            except UnicodeDecodeError:
+                return f"<Binary Content: bytes {start}-{start + len(chunk)}>"
+            return text + page_footer(start, text, next_offset, total)
+        except Exception as e:
+            return f"Error reading file {file_id}: {str(e)}"
@@ -0,0 +1,165 @@
+import time
+import random
+import asyncio
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from googleapiclient.errors import HttpError
+from tenacity import Retrying, retry_if_exception, stop_after_attempt
+
+from .batch import TRANSPORT_ERRORS, is_transient, is_rate_limited, retry_after
+from .metrics import METRICS, timed
+
+logger = logging.getLogger(__name__)
+
+# Drive's default per-user quota: 12,000 queries per 60 seconds
+DEFAULT_QUOTA_PER_MINUTE = 12000
+
+# Quota tokens charged per request. Exports and upload chunks are heavier for Drive's backend
+# and are the first to be throttled, so they draw down the bucket faster than plain calls.
+CALL_COST = 1
+EXPORT_COST = 5
+UPLOAD_COST = 5
+
+MAX_BACKOFF = 64.0
+
+def is_retryable(error: BaseException) -> bool:
+    """Transient HTTP errors and dropped connections; everything else (400, 401, 404, ...) fails fast."""
+    if isinstance(error, HttpError):
+        return is_transient(error)
+    return isinstance(error, TRANSPORT_ERRORS)
+
+def method_name(request) -> str:
+    """The Drive method of a googleapiclient HttpRequest, e.g. 'files.list'."""
+    method_id = getattr(request, "methodId", None) or "request"
+    return method_id[len("drive."):] if method_id.startswith("drive.") else method_id
+
+class RequestScheduler:
+    """
+    Token bucket in front of every Drive API call, sized to the per-user quota.
+    The fill rate adapts: it halves on each rate-limit response and creeps back towards the
+    quota as calls succeed (AIMD), so bulk jobs settle just under the limit instead of
+    hitting it in waves. Only transient errors are retried.
+    """
+    def __init__(self, quota_per_minute: float = DEFAULT_QUOTA_PER_MINUTE, burst: Optional[float] = None,
+                 max_retries: int = 5, min_rate: float = 1.0):
+        self.max_rate = quota_per_minute / 60.0
+        self.min_rate = min(min_rate, self.max_rate)
+        self.rate = self.max_rate
+        self.capacity = burst if burst is not None else max(self.max_rate, UPLOAD_COST)
+        self.max_retries = max_retries
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.retries = 0
+        self.throttled = 0
+        self.waited = 0.0
+
+    # --- Token bucket ---
+
+    def _reserve(self, cost: float) -> float:
+        """Takes `cost` tokens (the balance may go negative) and returns how long the caller must wait."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= cost
+            self.requests += 1
+            delay = max(-self._tokens / self.rate if self._tokens < 0 else 0.0, self._paused_until - now)
+            self.waited += delay
+            return delay
+
+    def acquire(self, cost: float = CALL_COST):
+        """Blocks until the bucket can pay for a request of the given cost."""
+        delay = self._reserve(cost)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self, cost: float = CALL_COST):
+        """Like acquire, but waits without blocking the event loop."""
+        delay = self._reserve(cost)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    # --- Adaptation ---
+
+    def record_success(self):
+        with self._lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate / 100)
+
+    def record_throttle(self, wait: Optional[float] = None):
+        """Halves the fill rate and, if the server asked for a pause, holds every caller until it ends."""
+        with self._lock:
+            self.throttled += 1
+            self.rate = max(self.min_rate, self.rate / 2)
+            if wait:
+                self._paused_until = max(self._paused_until, time.monotonic() + wait)
+        logger.warning(f"Drive rate limit hit; request rate lowered to {self.rate:.1f}/s")
+
+    def retry_delay(self, error: Exception, attempt: int) -> Optional[float]:
+        """
+        Seconds to wait before retrying after `error` on the given attempt (1-based),
+        or None if the error is not worth retrying.
+        """
+        if not is_retryable(error):
+            return None
+        return self.backoff(attempt, rate_limited=is_rate_limited(error), server_wait=retry_after(error))
+
+    def backoff(self, attempt: int, rate_limited: bool = False, server_wait: Optional[float] = None) -> float:
+        """Delay before retry number `attempt`, honouring Retry-After; rate limits also slow the bucket."""
+        with self._lock:
+            self.retries += 1
+        if rate_limited:
+            self.record_throttle(server_wait)
+        if server_wait is not None:
+            return server_wait
+        # Exponential backoff with jitter, as the Drive docs recommend
+        return min(2 ** attempt, MAX_BACKOFF) + random.random()
+
+    # --- Execution ---
+
+    def call(self, func: Callable[[], Any], cost: float = CALL_COST, max_retries: Optional[int] = None,
+             name: Optional[str] = None) -> Any:
+        """
+        Runs func under the rate limit, retrying transient failures.
+        Each attempt is recorded in the metrics under `name` (the Drive method).
+        """
+        name = name or getattr(func, "__name__", "call")
+
+        def _wait(retry_state) -> float:
+            METRICS.record_retry("api", name)
+            return self.retry_delay(retry_state.outcome.exception(), retry_state.attempt_number) or 0.0
+
+        def _attempt():
+            self.acquire(cost)
+            with timed("api", name):
+                result = func()
+            self.record_success()
+            return result
+
+        retrying = Retrying(
+            retry=retry_if_exception(is_retryable),
+            wait=_wait,
+            stop=stop_after_attempt((self.max_retries if max_retries is None else max_retries) + 1),
+            reraise=True,
+        )
+        return retrying(_attempt)
+
+    def execute(self, request, cost: float = CALL_COST, max_retries: Optional[int] = None) -> Any:
+        """Executes a googleapiclient HttpRequest through the scheduler."""
+        return self.call(request.execute, cost=cost, max_retries=max_retries, name=method_name(request))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "rate_per_second": round(self.rate, 2),
+                "max_rate_per_second": round(self.max_rate, 2),
+                "requests": self.requests,
+                "retries": self.retries,
+                "throttled": self.throttled,
+                "seconds_waited": round(self.waited, 2),
+            }
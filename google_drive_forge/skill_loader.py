@@ -1,41 +1,183 @@
 import os
+import json
+import time
 import yaml
 import logging
+import threading
 from typing import List, Dict, Any, Optional
 
 logger = logging.getLogger(__name__)
 
+# Kept in a subdirectory so rewriting it does not change the skills directory's own mtime
+INDEX_DIR = ".index"
+MANIFEST_NAME = "manifest.json"
+
 class SkillMetadata:
-    def __init__(self, name: str, description: str, folder_path: str):
+    def __init__(self, name: str, description: str, folder_path: str, mtime_ns: int = 0):
         self.name = name
         self.description = description
         self.folder_path = folder_path
+        # mtime of SKILL.md when it was parsed
+        self.mtime_ns = mtime_ns
+
+    @property
+    def script_path(self) -> str:
+        return os.path.join(self.folder_path, "script.py")
 
 class SkillLoader:
-    def __init__(self, skills_dir: str):
+    """
+    In-memory registry of skills, keyed by folder name.
+    A stat of the skills directory detects added or removed skills; SKILL.md files are only
+    re-parsed when their mtime changes. The index is persisted to a manifest so a restart
+    does not re-read every SKILL.md. Skills written through save_skill update the index directly;
+    in-place edits made outside the server are picked up by a full mtime sweep every
+    `rescan_interval` seconds.
+    """
+    def __init__(self, skills_dir: str, rescan_interval: float = 60.0):
         self.skills_dir = skills_dir
+        self.rescan_interval = rescan_interval
+        self.manifest_path = os.path.join(skills_dir, INDEX_DIR, MANIFEST_NAME)
+        self._skills: Dict[str, SkillMetadata] = {}
+        self._dir_mtime_ns: Optional[int] = None
+        self._last_scan = 0.0
+        self._lock = threading.RLock()
+        self._load_manifest()
+
+    # --- Manifest ---
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return
+        self._dir_mtime_ns = manifest.get("dir_mtime_ns")
+        self._skills = {
+            key: SkillMetadata(s["name"], s["description"], os.path.join(self.skills_dir, key), s["mtime_ns"])
+            for key, s in manifest.get("skills", {}).items()
+        }
+        self._last_scan = time.monotonic()
+
+    def _save_manifest(self):
+        manifest = {
+            "dir_mtime_ns": self._dir_mtime_ns,
+            "skills": {
+                key: {"name": s.name, "description": s.description, "mtime_ns": s.mtime_ns}
+                for key, s in self._skills.items()
+            },
+        }
+        try:
+            os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+            tmp_path = self.manifest_path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(manifest, f, indent=1)
+            os.replace(tmp_path, self.manifest_path)
+        except OSError as e:
+            logger.warning(f"Could not write skill manifest: {e}")
+
+    # --- Index maintenance ---
+
+    def _scan(self, dir_mtime_ns: int):
+        """Re-lists the directory, re-parsing only SKILL.md files whose mtime changed."""
+        skills = {}
+        for entry in os.scandir(self.skills_dir):
+            if not entry.is_dir() or entry.name.startswith("."):
+                continue
+            skill_md_path = os.path.join(entry.path, "SKILL.md")
+            try:
+                mtime_ns = os.stat(skill_md_path).st_mtime_ns
+            except OSError:
+                continue
+            known = self._skills.get(entry.name)
+            if known and known.mtime_ns == mtime_ns:
+                skills[entry.name] = known
+                continue
+            try:
+                meta = self._parse_skill_md(skill_md_path, entry.path)
+                if meta:
+                    meta.mtime_ns = mtime_ns
+                    skills[entry.name] = meta
+            except Exception as e:
+                logger.error(f"Error parsing {skill_md_path}: {e}")
+
+        changed = skills.keys() != self._skills.keys() or any(skills[k] is not self._skills[k] for k in skills)
+        self._skills = skills
+        self._dir_mtime_ns = dir_mtime_ns
+        self._last_scan = time.monotonic()
+        if changed:
+            self._save_manifest()
+
+    def refresh(self, full: bool = False):
+        """Brings the index up to date: one stat normally, a full sweep if forced or due."""
+        with self._lock:
+            try:
+                dir_mtime_ns = os.stat(self.skills_dir).st_mtime_ns
+            except OSError:
+                if self._skills:
+                    logger.warning(f"Skills directory not found: {self.skills_dir}")
+                self._skills = {}
+                return
+            due = time.monotonic() - self._last_scan >= self.rescan_interval
+            if full or due or dir_mtime_ns != self._dir_mtime_ns:
+                self._scan(dir_mtime_ns)
+
+    # --- Lookup ---
 
     def discover_skills(self) -> List[SkillMetadata]:
         """
-        Scans the skills directory for valid skill folders (containing SKILL.md).
+        Returns all valid skills (folders containing SKILL.md with name and description).
         """
-        skills = []
-        if not os.path.exists(self.skills_dir):
-            logger.warning(f"Skills directory not found: {self.skills_dir}")
-            return skills
+        with self._lock:
+            self.refresh()
+            return sorted(self._skills.values(), key=lambda s: s.name)
 
-        for entry in os.scandir(self.skills_dir):
-            if entry.is_dir():
-                skill_md_path = os.path.join(entry.path, "SKILL.md")
-                if os.path.exists(skill_md_path):
-                    try:
-                        meta = self._parse_skill_md(skill_md_path, entry.path)
-                        if meta:
-                            skills.append(meta)
-                    except Exception as e:
-                        logger.error(f"Error parsing {skill_md_path}: {e}")
-        
-        return skills
+    def get_skill(self, skill_name: str) -> Optional[SkillMetadata]:
+        with self._lock:
+            self.refresh()
+            return self._skills.get(skill_name)
+
+    def get_script_path(self, skill_name: str) -> Optional[str]:
+        """Path of a skill's script.py according to the index, or None for an unknown skill."""
+        skill = self.get_skill(skill_name)
+        return skill.script_path if skill else None
+
+    # --- Writes ---
+
+    def save_skill(self, skill_name: str, code: str, description: Optional[str] = None) -> SkillMetadata:
+        """
+        Writes a skill's script.py and (if a description is given) SKILL.md, and updates the index.
+        A new skill needs a description.
+        """
+        with self._lock:
+            self.refresh()
+            skill_dir = os.path.join(self.skills_dir, skill_name)
+            existing = self._skills.get(skill_name)
+            if existing is None and not description:
+                raise ValueError(f"Skill '{skill_name}' needs a description.")
+            os.makedirs(skill_dir, exist_ok=True)
+
+            with open(os.path.join(skill_dir, "script.py"), "w") as f:
+                f.write(code)
+
+            skill_md_path = os.path.join(skill_dir, "SKILL.md")
+            if description:
+                skill_md_content = f"""---
+name: {skill_name}
+description: {description}
+---
+
+{description}
+"""
+                with open(skill_md_path, "w") as f:
+                    f.write(skill_md_content)
+                meta = SkillMetadata(skill_name, description, skill_dir, os.stat(skill_md_path).st_mtime_ns)
+            else:
+                meta = existing
+
+            self._skills[skill_name] = meta
+            self._dir_mtime_ns = os.stat(self.skills_dir).st_mtime_ns
+            self._save_manifest()
+            return meta
 
     def _parse_skill_md(self, file_path: str, folder_path: str) -> Optional[SkillMetadata]:
         """
@@ -43,7 +185,7 @@ class SkillLoader:
         """
         with open(file_path, "r") as f:
             content = f.read()
-        
+
         if not content.startswith("---"):
             return None
 
@@ -51,15 +193,15 @@ class SkillLoader:
         parts = content.split("---", 2)
         if len(parts) < 3:
             return None
-        
+
         try:
             frontmatter = yaml.safe_load(parts[1])
             name = frontmatter.get("name")
             description = frontmatter.get("description")
-            
+
             if name and description:
                 return SkillMetadata(name, description, folder_path)
         except Exception:
             return None
-            
+
         return None
@@ -0,0 +1,173 @@
+"""
+Runtime API for forged skills.
+
+Skills started by the server should use `get_client()` instead of building their own
+IntelligentDriveClient: it returns a proxy to the server's client, so a skill shares the
+server's caches, metadata mirror, rate limiter and audit log. Run on their own (e.g. from a
+terminal), skills get a regular local client instead.
+
+    from google_drive_forge.skill_runtime import get_client, progress
+
+    client = get_client()
+    files = client.list_folder_children(folder_id, limit=None)
+    for i, f in enumerate(files, 1):
+        progress(i, len(files), f"Processed {f['name']}")
+"""
+import os
+import sys
+import types
+import secrets
+import logging
+import threading
+from multiprocessing.connection import Listener, Client
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Set for skill processes started by ScriptExecutor while a broker is running
+BROKER_ADDRESS_ENV = "GOOGLE_DRIVE_FORGE_BROKER"
+BROKER_AUTHKEY_ENV = "GOOGLE_DRIVE_FORGE_AUTHKEY"
+
+class SkillRuntimeError(RuntimeError):
+    """Raised in a skill when a proxied client call fails in the server. `status` is the HTTP status, if any."""
+    def __init__(self, message: str, error_type: str = "", status: Optional[int] = None):
+        super().__init__(message)
+        self.error_type = error_type
+        self.status = status
+
+# --- Server side ---
+
+class ClientBroker:
+    """
+    Serves a client's public methods to skill processes over a local socket (a named pipe on
+    Windows). Connections must present the broker's random authkey. Each connection is handled
+    on its own thread; the client is already safe to share between threads.
+    """
+    def __init__(self, client: Any):
+        self.client = client
+        self.authkey = secrets.token_bytes(32)
+        self._listener: Optional[Listener] = None
+        self.calls = 0
+
+    @property
+    def address(self) -> Optional[str]:
+        return self._listener.address if self._listener else None
+
+    def env(self) -> Dict[str, str]:
+        """Environment variables that let a skill process connect to this broker."""
+        if not self._listener:
+            return {}
+        return {BROKER_ADDRESS_ENV: self.address, BROKER_AUTHKEY_ENV: self.authkey.hex()}
+
+    def start(self) -> "ClientBroker":
+        self._listener = Listener(authkey=self.authkey)
+        threading.Thread(target=self._accept, name="skill-broker", daemon=True).start()
+        logger.info(f"Skill client broker listening on {self.address}")
+        return self
+
+    def close(self):
+        if self._listener:
+            self._listener.close()
+            self._listener = None
+
+    def _accept(self):
+        while self._listener:
+            try:
+                conn = self._listener.accept()
+            except Exception as e:
+                # Closed listener, or a peer with the wrong authkey
+                if self._listener:
+                    logger.warning(f"Skill broker rejected a connection: {e}")
+                continue
+            threading.Thread(target=self._serve, args=(conn,), name="skill-broker-conn", daemon=True).start()
+
+    def _call(self, method: str, args: tuple, kwargs: dict) -> Any:
+        if method.startswith('_'):
+            raise AttributeError(f"'{method}' is not part of the client API")
+        func = getattr(self.client, method)
+        if not callable(func):
+            raise AttributeError(f"'{method}' is not a client method")
+        result = func(*args, **kwargs)
+        if isinstance(result, types.GeneratorType):
+            # Generators cannot cross the process boundary; send the items instead
+            result = list(result)
+        return result
+
+    def _serve(self, conn):
+        with conn:
+            while True:
+                try:
+                    method, args, kwargs = conn.recv()
+                except (EOFError, OSError):
+                    return
+                self.calls += 1
+                try:
+                    reply = ("ok", self._call(method, args, kwargs))
+                except Exception as e:
+                    status = getattr(getattr(e, 'resp', None), 'status', None)
+                    reply = ("error", type(e).__name__, str(e), status)
+                try:
+                    conn.send(reply)
+                except Exception as e:
+                    # e.g. the result could not be pickled
+                    conn.send(("error", type(e).__name__, str(e), None))
+
+# --- Skill side ---
+
+class RemoteClient:
+    """Proxy whose method calls run on the server's client. Usable from several threads."""
+    def __init__(self, address: str, authkey: bytes):
+        self._address = address
+        self._authkey = authkey
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = Client(self._address, authkey=self._authkey)
+            self._local.conn = conn
+        return conn
+
+    def _invoke(self, method: str, *args, **kwargs) -> Any:
+        conn = self._connection()
+        conn.send((method, args, kwargs))
+        reply = conn.recv()
+        if reply[0] == "ok":
+            return reply[1]
+        _, error_type, message, status = reply
+        raise SkillRuntimeError(f"{error_type}: {message}", error_type=error_type, status=status)
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return lambda *args, **kwargs: self._invoke(name, *args, **kwargs)
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_client():
+    """
+    The Drive client for a skill: a proxy to the server's client when launched by the server,
+    otherwise a local IntelligentDriveClient.
+    """
+    global _client
+    with _client_lock:
+        address = os.environ.get(BROKER_ADDRESS_ENV)
+        if address:
+            # Not cached: each run may talk to a different broker
+            return RemoteClient(address, bytes.fromhex(os.environ[BROKER_AUTHKEY_ENV]))
+        if _client is None:
+            from .intelligent_client import IntelligentDriveClient
+            _client = IntelligentDriveClient()
+        return _client
+
+# Installed by the skill worker to forward progress to the server
+_progress_hook: Optional[Callable[[Dict[str, Any]], None]] = None
+
+def progress(done: float, total: Optional[float] = None, message: str = ""):
+    """Reports progress to the caller of run_skill while the skill is still running."""
+    if _progress_hook:
+        _progress_hook({"done": done, "total": total, "message": message})
+    else:
+        suffix = f"/{total}" if total is not None else ""
+        print(f"[progress] {done}{suffix} {message}".rstrip(), file=sys.stderr, flush=True)
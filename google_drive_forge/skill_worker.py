@@ -0,0 +1,161 @@
+"""
+Long-lived skill runner used by ScriptExecutor's worker pool.
+
+Started as `python -m google_drive_forge.skill_worker`. The Drive stack is imported and the
+credentials loaded once at startup; after that the worker reads one JSON request per line
+({"script": path, "args": [...], "env": {...}}) and answers with a stream of JSON event lines
+while the script runs:
+
+    {"event": "stdout" | "stderr", "data": str}
+    {"event": "progress", "done": ..., "total": ..., "message": str}
+    {"event": "done", "exit_code": int}
+"""
+import io
+import os
+import sys
+import json
+import runpy
+import logging
+import importlib
+import traceback
+import threading
+import contextlib
+from typing import Any, Callable, Dict
+
+def _open_protocol():
+    """
+    Moves the request/response pipes off fds 0 and 1, so a skill (or a C extension or child
+    process it starts) can never read a request or write into the response stream.
+    """
+    requests = os.fdopen(os.dup(0), 'r', encoding='utf-8')
+    responses = os.fdopen(os.dup(1), 'w', encoding='utf-8')
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.close(devnull)
+    # Stray fd-level output ends up in the server's stderr
+    os.dup2(2, 1)
+    return requests, responses
+
+def _warm_up():
+    """
+    Imports the Drive stack and loads credentials so skills start without that cost.
+    Failures only cost speed: the skill will hit (and report) the same problem itself.
+    """
+    try:
+        # Imported only to fill sys.modules: run_script keeps these cached between skills,
+        # so each skill's own imports of them are free
+        for module in ("googleapiclient.discovery", f"{__package__}.intelligent_client",
+                       f"{__package__}.skill_runtime"):
+            importlib.import_module(module)
+        from .auth import get_credentials, TOKEN_PATH
+
+        # Never start an interactive login from a headless worker
+        if os.path.exists(TOKEN_PATH):
+            get_credentials()
+    except Exception as e:
+        print(f"skill worker: warm-up incomplete: {e}", file=sys.stderr)
+
+class _EventStream(io.TextIOBase):
+    """File-like stdout/stderr replacement that forwards each completed line as an event."""
+    def __init__(self, kind: str, send: Callable[[Dict[str, Any]], None]):
+        self.kind = kind
+        self.send = send
+        self._buffer = ""
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        self._buffer += text
+        if "\n" in self._buffer:
+            lines, self._buffer = self._buffer.rsplit("\n", 1)
+            self.send({"event": self.kind, "data": lines + "\n"})
+        return len(text)
+
+    def flush(self):
+        if self._buffer:
+            self.send({"event": self.kind, "data": self._buffer})
+            self._buffer = ""
+
+def _loaded_from(module: Any, directory: str) -> bool:
+    """True if a module (or namespace package) was loaded from below `directory`."""
+    locations = [getattr(module, '__file__', None), *(getattr(module, '__path__', None) or [])]
+    return any(loc and os.path.abspath(loc).startswith(directory + os.sep) for loc in locations)
+
+def run_script(script: str, args: list, send: Callable[[Dict[str, Any]], None], env: Dict[str, str] = None) -> int:
+    """
+    Runs a script as __main__ in a fresh namespace, streaming its output through `send`,
+    and undoes its changes to interpreter state. Returns the exit code.
+    """
+    from . import skill_runtime
+
+    stdout, stderr = _EventStream("stdout", send), _EventStream("stderr", send)
+    saved_argv, saved_path, saved_cwd = sys.argv, list(sys.path), os.getcwd()
+    saved_environ = dict(os.environ)
+    saved_modules = set(sys.modules)
+    root = logging.getLogger()
+    saved_handlers, saved_level = list(root.handlers), root.level
+    exit_code = 0
+
+    sys.argv = [script] + list(args)
+    sys.path.insert(0, os.path.dirname(script))
+    os.environ.update(env or {})
+    skill_runtime._progress_hook = lambda update: send({"event": "progress", **update})
+    try:
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            sys.stdin = io.StringIO()
+            try:
+                runpy.run_path(script, run_name="__main__")
+            except SystemExit as e:
+                if isinstance(e.code, int):
+                    exit_code = e.code
+                elif e.code is not None:
+                    print(e.code, file=sys.stderr)
+                    exit_code = 1
+            except BaseException:
+                traceback.print_exc()
+                exit_code = 1
+    finally:
+        stdout.flush()
+        stderr.flush()
+        skill_runtime._progress_hook = None
+        sys.stdin = sys.__stdin__
+        sys.argv = saved_argv
+        sys.path[:] = saved_path
+        os.chdir(saved_cwd)
+        os.environ.clear()
+        os.environ.update(saved_environ)
+        # The skill's own modules (e.g. its helpers) are not shared with the next run. Libraries it
+        # imported stay loaded: evicting them would break objects still holding on to them (such as
+        # the warm Drive stack) and make every later run import them again.
+        skill_dir = os.path.dirname(os.path.abspath(script))
+        for name in set(sys.modules) - saved_modules:
+            if _loaded_from(sys.modules[name], skill_dir):
+                del sys.modules[name]
+        root.handlers[:] = saved_handlers
+        root.setLevel(saved_level)
+
+    return exit_code
+
+def main():
+    requests, responses = _open_protocol()
+    lock = threading.Lock()
+
+    def send(event: Dict[str, Any]):
+        # Skills may print from several threads
+        with lock:
+            responses.write(json.dumps(event) + "\n")
+            responses.flush()
+
+    _warm_up()
+    send({"event": "ready"})
+
+    for line in requests:
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        exit_code = run_script(request["script"], request.get("args") or [], send, request.get("env"))
+        send({"event": "done", "exit_code": exit_code})
+
+if __name__ == "__main__":
+    main()
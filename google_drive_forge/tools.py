@@ -1,14 +1,60 @@
-from typing import Optional, List
+from typing import Collection, Optional, List, TYPE_CHECKING
 from mcp.server.fastmcp import Context, FastMCP
-from .client import DriveClient
 from .executor import ScriptExecutor
 from .skill_loader import SkillLoader
 from .audit import AuditLogger
+from .lazy import Lazy
+from .paging import DEFAULT_PAGE_BYTES, check_page_args, text_page, page_footer
+from .extract import DEFAULT_CHUNK_CHARS, STRUCTURED_TYPES, check_chunk_args, chunk_text, format_chunk
 
-def register_tools(mcp: FastMCP, client: DriveClient):
-    """Registers tool handlers to the MCP server."""
+if TYPE_CHECKING:
+    # Annotations only: the clients (and the Google API stack behind them) load on first use
+    from .client import DriveClient
+    from .async_client import AsyncDriveClient
 
-    @mcp.tool()
+def _describe_resolution(path: str, result: dict) -> str:
+    """Formats a resolve_path result for the agent, including healed components or suggestions."""
+    if result["id"]:
+        message = f"Resolved '{path}' to ID: {result['id']}"
+        if result["healed"]:
+            fixes = ", ".join(f"'{h['from']}' -> '{h['to']}'" for h in result["healed"])
+            message += f" (healed {fixes}; actual path {result['path']})"
+        return message
+    message = f"Error: Could not resolve path '{path}': no confident match for '{result['missing']}' in '{result['resolved']}'."
+    if result["suggestions"]:
+        lines = [f"- {s['name']} (ID: {s['id']}, score {s['score']})" for s in result["suggestions"]]
+        message += " Closest names:\n" + "\n".join(lines)
+    return message
+
+def _format_page(chunk: bytes, offset: int, requested: int, max_lines: Optional[int], meta: dict) -> str:
+    """Decodes one ranged read for smart_read and appends where to continue."""
+    total = int(meta['size']) if meta.get('size') else None
+    at_end = len(chunk) < requested or (total is not None and offset + len(chunk) >= total)
+    try:
+        text, next_offset = text_page(chunk, offset, max_lines=max_lines, at_end=at_end)
+    except UnicodeDecodeError:
+        return f"<Binary Content: bytes {offset}-{offset + len(chunk)}> (MIME: {meta.get('mimeType')})"
+    return text + page_footer(offset, text, next_offset, total)
+
+def _format_extracted(path: str, extracted: Optional[dict], chunk: int, chunk_chars: int) -> str:
+    if extracted is None:
+        return f"Error: '{path}' has no text form."
+    return format_chunk(chunk_text(extracted["text"], chunk_chars), chunk, extracted["name"] or path)
+
+def _tool_decorator(mcp: FastMCP, skip: Collection[str]):
+    """Like mcp.tool(), but leaves out the tools named in `skip`."""
+    def tool(fn):
+        return fn if fn.__name__ in skip else mcp.tool()(fn)
+    return tool
+
+def register_tools(mcp: FastMCP, client: "DriveClient", skip: Collection[str] = ()):
+    """
+    Registers tool handlers to the MCP server.
+    Tools named in `skip` are left out; pass the names returned by register_async_tools.
+    """
+    tool = _tool_decorator(mcp, skip)
+
+    @tool
     def list_files(limit: int = 20) -> str:
         """
         List the most recent files in Google Drive.
@@ -20,10 +66,12 @@ def register_tools(mcp: FastMCP, client: DriveClient):
         files = client.list_files(limit=limit)
         return json.dumps(files, indent=2)
 
-    @mcp.tool()
+    @tool
     def search_files(query: str, limit: int = 20) -> str:
         """
         Search for files in Google Drive by name.
+        With the metadata mirror enabled, searches names, folder paths and text already read
+        with read_text locally, ranked by relevance; "quoted phrases" and prefix* terms work.
         
         Args:
             query: The search text (e.g. project name).
@@ -33,7 +81,7 @@ def register_tools(mcp: FastMCP, client: DriveClient):
         files = client.search(query, limit=limit)
         return json.dumps(files, indent=2)
 
-    @mcp.tool()
+    @tool
     def list_folder(folder_id: str, limit: int = 50) -> str:
         """
         List all children (files and subfolders) of a specific folder.
@@ -46,7 +94,7 @@ def register_tools(mcp: FastMCP, client: DriveClient):
         files = client.list_folder_children(folder_id, limit=limit)
         return json.dumps(files, indent=2)
 
-    @mcp.tool()
+    @tool
     def get_file_metadata(file_id: str) -> str:
         """
         Get detailed metadata for a file.
@@ -58,7 +106,7 @@ def register_tools(mcp: FastMCP, client: DriveClient):
         meta = client.get_file_metadata(file_id)
         return json.dumps(meta, indent=2)
 
-    @mcp.tool()
+    @tool
     def create_folder(name: str, parent_id: str = 'root') -> str:
         """
         Create a new folder.
@@ -71,7 +119,7 @@ def register_tools(mcp: FastMCP, client: DriveClient):
         res = client.create_folder(name, parent_id)
         return json.dumps(res, indent=2)
 
-    @mcp.tool()
+    @tool
     def upload_file(name: str, content: str, parent_id: str = 'root') -> str:
         """
         Upload a text file to Google Drive.
@@ -85,7 +133,7 @@ def register_tools(mcp: FastMCP, client: DriveClient):
         res = client.upload_file(name, content, parent_id=parent_id)
         return json.dumps(res, indent=2)
 
-    @mcp.tool()
+    @tool
     def trash_file(file_id: str) -> str:
         """
         Move a file to the trash.
@@ -97,8 +145,270 @@ def register_tools(mcp: FastMCP, client: DriveClient):
         res = client.trash_file(file_id)
         return json.dumps(res, indent=2)
 
-def register_intelligent_tools(mcp: FastMCP, client: DriveClient, executor: ScriptExecutor, loader: SkillLoader, audit: AuditLogger):
-    """Registers the 'Forge' and 'Autonomy' tools to the MCP server."""
+    @tool
+    def get_metadata_many(file_ids: List[str]) -> str:
+        """
+        Get metadata for many files at once (batched, 100 per request).
+        
+        Args:
+            file_ids: IDs of the files to inspect.
+        """
+        import json
+        res = client.get_metadata_many(file_ids)
+        return json.dumps(res, indent=2)
+
+    @tool
+    def trash_many(file_ids: List[str]) -> str:
+        """
+        Move many files to the trash at once (batched, 100 per request).
+        
+        Args:
+            file_ids: IDs of the files to trash.
+        """
+        import json
+        res = client.trash_many(file_ids)
+        return json.dumps(res, indent=2)
+
+    @tool
+    def move_many(file_ids: List[str], dest_folder_id: str) -> str:
+        """
+        Move many files into a folder at once (batched, 100 per request).
+        
+        Args:
+            file_ids: IDs of the files to move.
+            dest_folder_id: ID of the destination folder.
+        """
+        import json
+        res = client.move_many(file_ids, dest_folder_id)
+        return json.dumps(res, indent=2)
+
+    @tool
+    def cache_stats() -> str:
+        """
+        Report hit, miss and eviction counters for the client's metadata, listing and path caches.
+        """
+        import json
+        return json.dumps(client.cache_stats(), indent=2)
+
+    @tool
+    def sync_mirror(full: bool = False) -> str:
+        """
+        Updates the local metadata mirror from the Drive changes feed.
+        
+        Args:
+            full: Re-crawl the whole drive instead of applying incremental changes.
+        """
+        import json
+        if not client.mirror:
+            return "Error: Metadata mirror is not enabled. Set GOOGLE_DRIVE_MIRROR_DIR to enable it."
+        res = client.sync_mirror(full=full)
+        res.update(client.mirror.stats())
+        return json.dumps(res, indent=2)
+
+def register_async_tools(mcp: FastMCP, client: "AsyncDriveClient"):
+    """
+    Registers non-blocking versions of the core Drive tools and the path tools.
+    Handlers run on the server's event loop, so concurrent calls do not queue behind each other.
+    Returns the names of the registered tools, for the `skip` argument of the other register_* calls.
+    """
+    registered = []
+
+    def tool(fn):
+        registered.append(fn.__name__)
+        return mcp.tool()(fn)
+
+    @tool
+    async def list_files(limit: int = 20) -> str:
+        """
+        List the most recent files in Google Drive.
+        
+        Args:
+            limit: Number of files to return (default 20, max 100).
+        """
+        import json
+        files = await client.list_files(limit=limit)
+        return json.dumps(files, indent=2)
+
+    @tool
+    async def search_files(query: str, limit: int = 20) -> str:
+        """
+        Search for files in Google Drive by name.
+        
+        Args:
+            query: The search text (e.g. project name).
+            limit: Max results.
+        """
+        import json
+        files = await client.search(query, limit=limit)
+        return json.dumps(files, indent=2)
+
+    @tool
+    async def list_folder(folder_id: str, limit: int = 50) -> str:
+        """
+        List all children (files and subfolders) of a specific folder.
+        
+        Args:
+            folder_id: The ID of the folder to list. Use 'root' for top level.
+            limit: Limit results.
+        """
+        import json
+        files = await client.list_folder_children(folder_id, limit=limit)
+        return json.dumps(files, indent=2)
+
+    @tool
+    async def get_file_metadata(file_id: str) -> str:
+        """
+        Get detailed metadata for a file.
+        
+        Args:
+            file_id: The ID of the file.
+        """
+        import json
+        meta = await client.get_file_metadata(file_id)
+        return json.dumps(meta, indent=2)
+
+    @tool
+    async def create_folder(name: str, parent_id: str = 'root') -> str:
+        """
+        Create a new folder.
+        
+        Args:
+            name: Name of the new folder.
+            parent_id: ID of the parent folder (default 'root').
+        """
+        import json
+        res = await client.create_folder(name, parent_id)
+        return json.dumps(res, indent=2)
+
+    @tool
+    async def upload_file(name: str, content: str, parent_id: str = 'root') -> str:
+        """
+        Upload a text file to Google Drive.
+        
+        Args:
+            name: Name of the file.
+            content: Text content of the file.
+            parent_id: ID of the parent folder.
+        """
+        import json
+        res = await client.upload_file(name, content, parent_id=parent_id)
+        return json.dumps(res, indent=2)
+
+    @tool
+    async def trash_file(file_id: str) -> str:
+        """
+        Move a file to the trash.
+        
+        Args:
+            file_id: ID of the file to trash.
+        """
+        import json
+        res = await client.trash_file(file_id)
+        return json.dumps(res, indent=2)
+
+    @tool
+    async def resolve_path(path: str) -> str:
+        """
+        Intelligently resolves a human-readable path (e.g., '/Projects/2026') to a File ID.
+        Includes autonomous healing if the path is broken.
+        
+        Args:
+            path: The full path to resolve.
+        """
+        return _describe_resolution(path, await client.resolve_path(path))
+
+    @tool
+    async def smart_read(path: str, offset: int = 0, length: Optional[int] = None,
+                         max_lines: Optional[int] = None) -> str:
+        """
+        Resolves a path and reads its content in one step.
+        Autonomously handles path healing and MIME-type conversion.
+        Pass offset, length or max_lines to read a large file a page at a time; the reply then
+        ends with the offset to continue from.
+        
+        Args:
+            path: Path to the file.
+            offset: Byte offset to start reading at.
+            length: Maximum bytes to read (default 64 KB when paging).
+            max_lines: Maximum lines to return.
+        """
+        check_page_args(offset, length, max_lines)
+        file_id = await client.find_and_heal_path(path)
+        if not file_id:
+            return f"Error: Could not resolve path '{path}'"
+
+        try:
+            meta = await client.get_file_metadata(file_id)
+            mime_type = meta.get('mimeType')
+
+            export_mime_type = 'text/plain' if mime_type == 'application/vnd.google-apps.document' else None
+
+            if offset or length is not None or max_lines is not None:
+                requested = DEFAULT_PAGE_BYTES if length is None else length
+                chunk = await client.download_range(file_id, offset, requested,
+                                                    export_mime_type=export_mime_type, mime_type=mime_type)
+                return _format_page(chunk, offset, requested, max_lines, meta)
+
+            if mime_type in STRUCTURED_TYPES:
+                # PDFs, spreadsheets and slides are read as extracted text, a chunk at a time
+                return _format_extracted(path, await client.extract_text(file_id), 1, DEFAULT_CHUNK_CHARS)
+
+            content_bytes = await client.download_file(file_id, export_mime_type=export_mime_type)
+
+            try:
+                return content_bytes.decode('utf-8')
+            except UnicodeDecodeError:
+                return f"<Binary Content: {len(content_bytes)} bytes> (MIME: {mime_type})"
+        except Exception as e:
+            return f"Error reading file at '{path}': {str(e)}"
+
+    @tool
+    async def read_text(path: str, chunk: int = 1, chunk_chars: int = DEFAULT_CHUNK_CHARS) -> str:
+        """
+        Reads a document, PDF, spreadsheet or presentation as plain text, one numbered chunk at a time.
+        The text is extracted once per file revision and cached, so later chunks cost no download.
+        
+        Args:
+            path: Path to the file.
+            chunk: Chunk number, starting at 1.
+            chunk_chars: Characters per chunk.
+        """
+        check_chunk_args(chunk, chunk_chars)
+        file_id = await client.find_and_heal_path(path)
+        if not file_id:
+            return f"Error: Could not resolve path '{path}'"
+        try:
+            return _format_extracted(path, await client.extract_text(file_id), chunk, chunk_chars)
+        except Exception as e:
+            return f"Error reading file at '{path}': {str(e)}"
+
+    return frozenset(registered)
+
+def register_intelligent_tools(mcp: FastMCP, client: "DriveClient", executor: ScriptExecutor, loader: SkillLoader, audit: AuditLogger,
+                               skip: Collection[str] = ()):
+    """
+    Registers the 'Forge' and 'Autonomy' tools to the MCP server.
+    Tools named in `skip` are left out; pass the names returned by register_async_tools.
+    """
+    tool = _tool_decorator(mcp, skip)
+
+    def _exact_folder(value: str):
+        """(folder_id, None), or (None, error message). Paths that would need healing are refused."""
+        # Drive IDs never contain a slash
+        if '/' not in value:
+            return value, None
+        result = client.resolve_path(value, heal=False)
+        if result["id"]:
+            return result["id"], None
+        names = ", ".join(s["name"] for s in result["suggestions"])
+        hint = f" Did you mean: {names}?" if names else ""
+        return None, f"Error: Folder '{value}' does not exist ('{result['missing']}' not found in '{result['resolved']}').{hint}"
+
+    def _transfer_engine():
+        from .transfer import TransferEngine
+        return TransferEngine(client)
+
+    transfers = Lazy(_transfer_engine)
 
     @mcp.tool()
     def create_skill(name: str, code: str, description: str) -> str:
@@ -110,34 +420,16 @@ def register_intelligent_tools(mcp: FastMCP, client: DriveClient, executor: Scri
             code: The Python code for the script.
             description: What this skill does (will be saved in SKILL.md).
         """
-        import os
         import re
         
         # Sanitize name
         safe_name = re.sub(r'[^a-zA-Z0-9_]', '_', name).lower()
-        
-        skill_dir = os.path.join(loader.skills_dir, safe_name)
-        os.makedirs(skill_dir, exist_ok=True)
-        
-        # Write script.py
-        with open(os.path.join(skill_dir, "script.py"), "w") as f:
-            f.write(code)
-            
-        # Write SKILL.md
-        skill_md_content = f"""---
-name: {safe_name}
-description: {description}
----
-
-{description}
-"""
-        with open(os.path.join(skill_dir, "SKILL.md"), "w") as f:
-            f.write(skill_md_content)
+        skill = loader.save_skill(safe_name, code, description)
             
         # Log to Audit
         audit.log_skill_creation(safe_name)
             
-        return f"Skill '{safe_name}' forged successfully in {skill_dir}"
+        return f"Skill '{safe_name}' forged successfully in {skill.folder_path}"
 
     @mcp.tool()
     def list_skills() -> str:
@@ -158,60 +450,99 @@ description: {description}
             code: The new Python code.
             description: Optional updated description.
         """
-        import os
         import re
         
         safe_name = re.sub(r'[^a-zA-Z0-9_]', '_', name).lower()
-        skill_dir = os.path.join(loader.skills_dir, safe_name)
         
-        if not os.path.exists(skill_dir):
+        if loader.get_skill(safe_name) is None:
             return f"Error: Skill '{safe_name}' does not exist. Use create_skill first."
         
-        # Update script.py
-        with open(os.path.join(skill_dir, "script.py"), "w") as f:
-            f.write(code)
-            
-        # Update SKILL.md if description provided
-        if description:
-            skill_md_content = f"""---
-name: {safe_name}
-description: {description}
----
-
-{description}
-"""
-            with open(os.path.join(skill_dir, "SKILL.md"), "w") as f:
-                f.write(skill_md_content)
+        loader.save_skill(safe_name, code, description)
         
         audit.log_event("SKILL_UPDATE", f"Capability updated: {safe_name}")
         return f"Skill '{safe_name}' updated successfully."
 
     @mcp.tool()
-    def run_skill(name: str, args: Optional[List[str]] = None) -> str:
+    def server_stats() -> str:
+        """
+        Reports server metrics: calls, errors, retries and p50/p95/p99 latency per tool and per
+        Drive API method, bytes transferred, cache hit ratios and rate limiter state.
+        """
+        import json
+        from .metrics import server_stats as collect_stats
+        return json.dumps(collect_stats(client), indent=2)
+
+    @mcp.tool()
+    def audit_query(event_type: Optional[str] = None, since: Optional[str] = None, until: Optional[str] = None,
+                    status: Optional[str] = None, limit: int = 50) -> str:
+        """
+        Searches the audit log of autonomous operations (healing, skills, bulk transfers).
+
+        Args:
+            event_type: Only this event type (e.g., 'RECOVERY', 'SKILL_FORGE', 'BULK_DOWNLOAD').
+            since: Only events at or after this ISO 8601 time (e.g., '2024-05-01T09:00:00').
+            until: Only events at or before this ISO 8601 time.
+            status: Only this status (e.g., 'SUCCESS', 'FAILURE', 'INFO').
+            limit: Maximum number of events to return (most recent ones).
+        """
+        import json
+        import datetime
+
+        def _epoch(value: Optional[str]) -> Optional[float]:
+            # Times without an offset are taken as local time, like the log's own timestamps
+            return datetime.datetime.fromisoformat(value).timestamp() if value else None
+
+        if limit < 1:
+            return f"Error: limit must be at least 1, got {limit}."
+        try:
+            since_epoch, until_epoch = _epoch(since), _epoch(until)
+        except ValueError as e:
+            return f"Error: invalid time ({e}). Use ISO 8601, e.g. '2024-05-01T09:00:00'."
+        records = audit.query(event_type=event_type, since=since_epoch, until=until_epoch,
+                              status=status, limit=limit)
+        if not records:
+            return "No matching audit events."
+        return json.dumps([{k: v for k, v in r.items() if k != "epoch"} for r in records], indent=2)
+
+    @mcp.tool()
+    async def run_skill(name: str, args: Optional[List[str]] = None, ctx: Context = None) -> str:
         """
         Executes an AI-forged skill from the library.
+        Output and progress are streamed as log and progress notifications while the skill runs.
         
         Args:
             name: The name of the skill to run.
             args: Optional list of command-line arguments for the script.
         """
         import re
+        import asyncio
         safe_name = re.sub(r'[^a-zA-Z0-9_]', '_', name).lower()
-        return executor.run_skill(safe_name, args)
+        if ctx is None:
+            return await asyncio.to_thread(executor.run_skill, safe_name, args)
 
-    @mcp.tool()
+        loop = asyncio.get_running_loop()
+
+        def on_output(text: str):
+            # Called from the executor thread; hand the notification to the event loop
+            asyncio.run_coroutine_threadsafe(ctx.info(text.rstrip("\n")), loop)
+
+        def on_progress(update: dict):
+            asyncio.run_coroutine_threadsafe(ctx.report_progress(update["done"], update.get("total")), loop)
+            if update.get("message"):
+                on_output(update["message"])
+
+        return await asyncio.to_thread(executor.run_skill, safe_name, args, on_output, on_progress)
+
+    @tool
     def resolve_path(path: str) -> str:
         """
         Intelligently resolves a human-readable path (e.g., '/Projects/2026') to a File ID.
         Includes autonomous healing if the path is broken.
-        
+
         Args:
             path: The full path to resolve.
         """
-        file_id = client.find_and_heal_path(path)
-        if file_id:
-            return f"Resolved '{path}' to ID: {file_id}"
-        return f"Error: Could not resolve path '{path}'. Check logs for suggestions."
+        return _describe_resolution(path, client.resolve_path(path))
 
 
     @mcp.tool()
@@ -251,7 +582,6 @@ description: {description}
             mime_type = meta.get('mimeType')
             
             # 2. Determine conversion (if needed)
-            content = None
             final_path = local_path
             
             # Normalize path: if directory, append filename
@@ -262,63 +592,219 @@ description: {description}
             # Ensure parent dir exists
             os.makedirs(os.path.dirname(final_path), exist_ok=True)
 
+            export_mime_type = None
             if mime_type == 'application/vnd.google-apps.document':
                 # Export as text for Docs
-                content = client.download_file(file_id, export_mime_type='text/plain')
+                export_mime_type = 'text/plain'
                 if not final_path.endswith(('.txt', '.md')):
                     final_path += '.md'
             elif mime_type == 'application/vnd.google-apps.spreadsheet':
                 # Export as CSV for Sheets (easy to read) or Excel
-                 content = client.download_file(file_id, export_mime_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-                 if not final_path.endswith('.xlsx'):
+                export_mime_type = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+                if not final_path.endswith('.xlsx'):
                     final_path += '.xlsx'
-            else:
-                # Binary / Default
-                content = client.download_file(file_id)
             
-            # 3. Write to Disk
-            with open(final_path, 'wb') as f:
-                if isinstance(content, str):
-                    f.write(content.encode('utf-8'))
-                else:
-                    f.write(content)
-                    
+            # 3. Stream to Disk
+            client.download_to_path(file_id, final_path, export_mime_type=export_mime_type)
+
             return f"Successfully downloaded '{name}' to '{final_path}'"
             
         except Exception as e:
             return f"Error downloading file: {str(e)}"
 
     @mcp.tool()
-    def smart_read(path: str) -> str:
+    def download_folder(folder_id: str, local_path: str, workers: int = 8) -> str:
+        """
+        Recursively downloads a Drive folder to the local filesystem using parallel workers.
+        Google Docs/Sheets/Slides are exported (Markdown text, Excel, PDF).
+        
+        Args:
+            folder_id: The ID of the folder to download.
+            local_path: Absolute local directory to mirror the folder into.
+            workers: Number of parallel downloads.
+        """
+        import json
+        summary = transfers.download_folder(folder_id, local_path, workers=workers)
+        audit.log_event("BULK_DOWNLOAD", f"{folder_id} -> {local_path}: {summary['succeeded']}/{summary['files']} files, {summary['bytes']} bytes")
+        return json.dumps(summary, indent=2)
+
+    @mcp.tool()
+    def upload_from_local(local_path: str, parent_id: str = 'root', workers: int = 4) -> str:
+        """
+        Uploads a local file or directory to Google Drive, streaming from disk in resumable chunks.
+        Directories are uploaded recursively with parallel workers; re-running resumes interrupted uploads.
+        
+        Args:
+            local_path: Absolute path of the local file or directory.
+            parent_id: ID of the destination folder (default 'root').
+            workers: Number of parallel uploads for directories.
+        """
+        import os
+        import json
+        try:
+            if os.path.isdir(local_path):
+                res = transfers.upload_directory(local_path, parent_id=parent_id, workers=workers)
+                audit.log_event("BULK_UPLOAD", f"{local_path} -> {res['folder_id']}: {res['succeeded']}/{res['files']} files, {res['bytes']} bytes")
+            else:
+                res = client.upload_from_local(local_path, parent_id=parent_id)
+            return json.dumps(res, indent=2)
+        except Exception as e:
+            return f"Error uploading '{local_path}': {str(e)}"
+
+    @mcp.tool()
+    def sync_folder(folder: str, local_path: str, direction: str = "both", dry_run: bool = False,
+                    workers: int = 8) -> str:
+        """
+        Incrementally syncs a Drive folder with a local directory, transferring only new and changed
+        files. Renames, moves and deletions are carried over; changes are tracked in a
+        .forge-sync.json state file in the local directory.
+        
+        Args:
+            folder: ID or exact path of the Drive folder (paths are never healed).
+            local_path: Absolute local directory to sync with.
+            direction: 'pull' (Drive -> local), 'push' (local -> Drive) or 'both'.
+            dry_run: List the planned actions without changing anything.
+            workers: Number of parallel transfers.
+        """
+        import json
+        folder_id, error = _exact_folder(folder)
+        if error:
+            return error
+        try:
+            res = transfers.sync_folder(folder_id, local_path, direction=direction, dry_run=dry_run, workers=workers)
+        except Exception as e:
+            return f"Error syncing '{folder}': {str(e)}"
+        if dry_run:
+            for action, items in res["plan"].items():
+                if len(items) > 100:
+                    res["plan"][action] = items[:100] + [f"... {len(items) - 100} more"]
+        else:
+            audit.log_event("SYNC", f"{folder_id} <-> {local_path} ({direction}): {res['downloaded']} down, "
+                            f"{res['uploaded']} up, {res['bytes']} bytes",
+                            status="FAILURE" if res["failed"] else "INFO")
+        return json.dumps(res, indent=2)
+
+    @mcp.tool()
+    def move_files(source: str, destination: str, mime_type: Optional[str] = None, name_glob: Optional[str] = None,
+                   older_than_days: Optional[float] = None, newer_than_days: Optional[float] = None,
+                   dry_run: bool = False, workers: int = 4, create_destination: bool = False) -> str:
+        """
+        Moves the files in a folder that match the filters into another folder, in parallel batches.
+        Folder paths must match exactly; they are never healed. Run with dry_run=True first to see what would move.
+        
+        Args:
+            source: ID or path of the folder to move files out of.
+            destination: ID or path of the folder to move them into.
+            mime_type: Only move files of this MIME type.
+            name_glob: Only move files whose name matches this pattern (e.g. '*.pdf').
+            older_than_days: Only move files last modified more than this many days ago.
+            newer_than_days: Only move files modified within this many days.
+            dry_run: List the matching files without moving them.
+            workers: Number of batches sent at once.
+            create_destination: Create the destination path if it does not exist.
+        """
+        import json
+        import datetime
+
+        def _days_ago(days: Optional[float]) -> Optional[str]:
+            if days is None:
+                return None
+            moment = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=days)
+            return moment.strftime('%Y-%m-%dT%H:%M:%S')
+
+        source_id, error = _exact_folder(source)
+        if error:
+            return error
+        dest_id, error = _exact_folder(destination)
+        if error and create_destination and '/' in destination:
+            # Created exactly as given; a dry run only reports that it would be
+            dest_id = None if dry_run else client.ensure_folder_path(destination)
+            error = None
+        if error:
+            return error
+        try:
+            res = client.move_files(source_id, dest_id, mime_type=mime_type, name_glob=name_glob,
+                                    modified_before=_days_ago(older_than_days), modified_after=_days_ago(newer_than_days),
+                                    dry_run=dry_run, workers=workers)
+        except Exception as e:
+            return f"Error moving files: {str(e)}"
+        if dry_run:
+            plan = res.pop("plan")
+            res["plan"] = [{"id": f["id"], "name": f["name"], "modifiedTime": f.get("modifiedTime")} for f in plan[:100]]
+            if len(plan) > 100:
+                res["plan_truncated"] = len(plan) - 100
+        else:
+            audit.log_event("BULK_MOVE", f"{source_id} -> {dest_id}: {res['moved']}/{res['matched']} files",
+                            status="FAILURE" if res["failed"] else "INFO")
+        return json.dumps(res, indent=2)
+
+    @tool
+    def smart_read(path: str, offset: int = 0, length: Optional[int] = None,
+                   max_lines: Optional[int] = None) -> str:
         """
         Resolves a path and reads its content in one step.
         Autonomously handles path healing and MIME-type conversion.
-        
+        Pass offset, length or max_lines to read a large file a page at a time; the reply then
+        ends with the offset to continue from.
+
         Args:
             path: Path to the file.
+            offset: Byte offset to start reading at.
+            length: Maximum bytes to read (default 64 KB when paging).
+            max_lines: Maximum lines to return.
         """
+        check_page_args(offset, length, max_lines)
         file_id = client.find_and_heal_path(path)
         if not file_id:
             return f"Error: Could not resolve path '{path}'"
-        
+
         try:
             # Check if it's a Google Doc that needs text export
             meta = client.get_file_metadata(file_id)
             mime_type = meta.get('mimeType')
-            
-            if mime_type == 'application/vnd.google-apps.document':
-                # Force text export for reading
-                content_bytes = client.download_file(file_id, export_mime_type='text/plain')
-            else:
-                content_bytes = client.download_file(file_id)
+
+            # Force text export for reading Google Docs
+            export_mime_type = 'text/plain' if mime_type == 'application/vnd.google-apps.document' else None
+
+            if offset or length is not None or max_lines is not None:
+                requested = DEFAULT_PAGE_BYTES if length is None else length
+                chunk = client.download_range(file_id, offset, requested,
+                                              export_mime_type=export_mime_type, mime_type=mime_type)
+                return _format_page(chunk, offset, requested, max_lines, meta)
+
+            if mime_type in STRUCTURED_TYPES:
+                # PDFs, spreadsheets and slides are read as extracted text, a chunk at a time
+                return _format_extracted(path, client.extract_text(file_id), 1, DEFAULT_CHUNK_CHARS)
+
+            content_bytes = client.download_file(file_id, export_mime_type=export_mime_type)
 
             # Try to decode
             if isinstance(content_bytes, str):
                 return content_bytes
-            
+
             try:
                 return content_bytes.decode('utf-8')
             except UnicodeDecodeError:
                 return f"<Binary Content: {len(content_bytes)} bytes> (MIME: {mime_type})"
         except Exception as e:
             return f"Error reading file at '{path}': {str(e)}"
+
+    @tool
+    def read_text(path: str, chunk: int = 1, chunk_chars: int = DEFAULT_CHUNK_CHARS) -> str:
+        """
+        Reads a document, PDF, spreadsheet or presentation as plain text, one numbered chunk at a time.
+        The text is extracted once per file revision and cached, so later chunks cost no download.
+
+        Args:
+            path: Path to the file.
+            chunk: Chunk number, starting at 1.
+            chunk_chars: Characters per chunk.
+        """
+        check_chunk_args(chunk, chunk_chars)
+        file_id = client.find_and_heal_path(path)
+        if not file_id:
+            return f"Error: Could not resolve path '{path}'"
+        try:
+            return _format_extracted(path, client.extract_text(file_id), chunk, chunk_chars)
+        except Exception as e:
+            return f"Error reading file at '{path}': {str(e)}"
@@ -0,0 +1,580 @@
+import os
+import json
+import time
+import hashlib
+import functools
+import logging
+import threading
+from concurrent.futures import as_completed
+from typing import List, Dict, Any, Optional, Callable, Tuple
+
+from .client import DriveClient, FOLDER_MIME_TYPE, WALK_FIELDS
+from .content_cache import content_version
+from .metrics import ContextThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# Sync state kept in the synced directory by default; never uploaded
+SYNC_STATE_FILE = ".forge-sync.json"
+SYNC_DIRECTIONS = ("pull", "push", "both")
+
+# Local formats for Google Workspace documents: (export MIME type, file extension)
+LOCAL_EXPORT_FORMATS = {
+    'application/vnd.google-apps.document': ('text/plain', '.md'),
+    'application/vnd.google-apps.spreadsheet': ('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', '.xlsx'),
+    'application/vnd.google-apps.presentation': ('application/pdf', '.pdf'),
+}
+
+def local_name(file: Dict[str, Any]) -> str:
+    """Filesystem-safe local name for a Drive entry, including the export extension if any."""
+    name = file['name'].replace('/', '_').replace(os.sep, '_') or file['id']
+    export = LOCAL_EXPORT_FORMATS.get(file.get('mimeType'))
+    if export and not name.endswith(export[1]):
+        name += export[1]
+    return name
+
+def _local_path(root: str, rel: str) -> str:
+    return os.path.join(root, *rel.split('/')) if rel else root
+
+def _file_md5(path: str) -> str:
+    digest = hashlib.md5()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _scan_local(local_dir: str, state_path: str) -> Tuple[Dict[str, os.stat_result], set]:
+    """Stats every file below local_dir. Returns (stats by relative path, relative directory paths)."""
+    files = {}
+    dirs = set()
+    for current, subdirs, names in os.walk(local_dir):
+        rel_dir = os.path.relpath(current, local_dir).replace(os.sep, '/')
+        rel_dir = '' if rel_dir == '.' else rel_dir
+        dirs.update(f"{rel_dir}/{d}" if rel_dir else d for d in subdirs)
+        for name in names:
+            path = os.path.join(current, name)
+            # Unfinished downloads and the sync state itself are not content
+            if name.endswith('.part') or path == state_path:
+                continue
+            files[f"{rel_dir}/{name}" if rel_dir else name] = os.stat(path)
+    return files, dirs
+
+def _sync_record(meta: Dict[str, Any], stat: os.stat_result) -> Dict[str, Any]:
+    """What sync remembers about a file: the Drive revision and the local file it was synced with."""
+    return {
+        "id": meta['id'],
+        "mimeType": meta.get('mimeType'),
+        "version": content_version(meta),
+        "size": meta.get('size'),
+        "modifiedTime": meta.get('modifiedTime'),
+        "local_size": stat.st_size,
+        "local_mtime_ns": stat.st_mtime_ns,
+    }
+
+def _load_sync_state(path: str, folder_id: str) -> Dict[str, Any]:
+    empty = {"files": {}, "folders": {}}
+    try:
+        with open(path) as f:
+            state = json.load(f)
+    except FileNotFoundError:
+        return empty
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable sync state {path}: {e}")
+        return empty
+    if state.get("folder_id") != folder_id:
+        logger.warning(f"Sync state {path} belongs to folder {state.get('folder_id')}; starting fresh")
+        return empty
+    return state
+
+class _Progress:
+    """Thread-safe counters for a running transfer."""
+    def __init__(self, total: int, callback: Optional[Callable[[Dict[str, Any]], None]] = None):
+        self.total = total
+        self.done = 0
+        self.bytes = 0
+        self.failed: Dict[str, str] = {}
+        self.started = time.monotonic()
+        self.callback = callback
+        self._lock = threading.Lock()
+
+    def record(self, path: str, nbytes: int = 0, error: Optional[str] = None):
+        with self._lock:
+            self.done += 1
+            self.bytes += nbytes
+            if error:
+                self.failed[path] = error
+            snapshot = {"done": self.done, "total": self.total, "bytes": self.bytes, "path": path, "error": error}
+        if error:
+            logger.warning(f"[{snapshot['done']}/{self.total}] Failed {path}: {error}")
+        else:
+            logger.info(f"[{snapshot['done']}/{self.total}] {path} ({nbytes} bytes)")
+        if self.callback:
+            self.callback(snapshot)
+
+    def summary(self) -> Dict[str, Any]:
+        seconds = max(time.monotonic() - self.started, 1e-6)
+        return {
+            "files": self.total,
+            "succeeded": self.done - len(self.failed),
+            "failed": self.failed,
+            "bytes": self.bytes,
+            "seconds": round(seconds, 2),
+            "files_per_second": round(self.done / seconds, 2),
+            "mb_per_second": round(self.bytes / seconds / (1024 * 1024), 2),
+        }
+
+class TransferEngine:
+    """
+    Parallel transfers between Drive and the local filesystem.
+    Workers share the client; each worker thread gets its own Drive service (see DriveClient.service).
+    """
+    def __init__(self, client: DriveClient, workers: int = 8):
+        self.client = client
+        self.workers = workers
+
+    def _remote_tree(self, folder_id: str) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, str], List[str]]:
+        """
+        Lists a folder tree with DriveClient.walk, naming every entry as it will be stored locally.
+        Returns (downloadable files by relative path, folder IDs by relative path, skipped paths).
+        Relative paths use '/'; the top folder is ''.
+        """
+        files = {}
+        folders = {'': folder_id}
+        skipped = []
+        paths = {folder_id: ''}
+        used: Dict[str, set] = {}
+        for entry in self.client.walk(folder_id, fields=WALK_FIELDS):
+            parent = paths[entry['parent_id']]
+            names = used.setdefault(parent, set())
+            name = local_name(entry)
+            if name in names:
+                # Drive allows duplicate names in a folder; keep both copies locally
+                base, ext = os.path.splitext(name)
+                name = f"{base} ({entry['id'][:8]}){ext}"
+            names.add(name)
+            rel = f"{parent}/{name}" if parent else name
+            mime_type = entry.get('mimeType', '')
+            if mime_type == FOLDER_MIME_TYPE:
+                paths[entry['id']] = rel
+                folders[rel] = entry['id']
+            elif mime_type.startswith('application/vnd.google-apps.') and mime_type not in LOCAL_EXPORT_FORMATS:
+                # Forms, shortcuts, sites etc. have no downloadable content
+                skipped.append(rel)
+            else:
+                files[rel] = entry
+        return files, folders, skipped
+
+    def _walk_folder(self, folder_id: str, dest_dir: str) -> Tuple[List[Tuple[Dict[str, Any], str]], List[str]]:
+        """
+        Lists a folder tree. Returns (files with their local paths, skipped entries).
+        Local directories are created for every folder in the tree.
+        """
+        files, folders, skipped = self._remote_tree(folder_id)
+        for rel in folders:
+            os.makedirs(_local_path(dest_dir, rel), exist_ok=True)
+        tasks = [(entry, _local_path(dest_dir, rel)) for rel, entry in files.items()]
+        return tasks, [_local_path(dest_dir, rel) for rel in skipped]
+
+    def _download_one(self, file: Dict[str, Any], path: str) -> int:
+        export = LOCAL_EXPORT_FORMATS.get(file.get('mimeType'))
+        result = self.client.download_to_path(
+            file['id'], path, export_mime_type=export[0] if export else None, mime_type=file.get('mimeType'),
+            version=content_version(file)
+        )
+        return result['bytes']
+
+    def _run_parallel(self, jobs: List[Tuple[str, Callable[[], int]]], workers: Optional[int],
+                      progress: Optional[Callable[[Dict[str, Any]], None]], name: str) -> Dict[str, Any]:
+        """Runs (label, job) pairs on a bounded pool; each job returns the bytes it transferred."""
+        tracker = _Progress(len(jobs), progress)
+        with ContextThreadPoolExecutor(max_workers=workers or self.workers, thread_name_prefix=f"drive-{name}") as pool:
+            futures = {pool.submit(job): label for label, job in jobs}
+            for future in as_completed(futures):
+                label = futures[future]
+                try:
+                    tracker.record(label, future.result())
+                except Exception as e:
+                    tracker.record(label, error=str(e))
+        return tracker.summary()
+
+    def download_folder(self, folder_id: str, dest_dir: str, workers: Optional[int] = None,
+                        progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        Mirrors a Drive folder tree into dest_dir, downloading and exporting files in parallel.
+        `progress` is called after every file with running counters.
+        Returns a summary with counts, failures and throughput.
+        """
+        tasks, skipped = self._walk_folder(folder_id, dest_dir)
+        logger.info(f"Downloading {len(tasks)} files from {folder_id} to {dest_dir}")
+        jobs = [(path, functools.partial(self._download_one, file, path)) for file, path in tasks]
+        summary = self._run_parallel(jobs, workers, progress, "download")
+        summary["skipped"] = skipped
+        logger.info(
+            f"Downloaded {summary['succeeded']}/{summary['files']} files, {summary['bytes']} bytes "
+            f"in {summary['seconds']}s ({summary['mb_per_second']} MB/s)"
+        )
+        return summary
+
+    def _ensure_folder(self, name: str, parent_id: str) -> str:
+        """Returns the ID of the named subfolder of parent_id, creating it if missing."""
+        for entry in self.client.find_by_name(name, parent_id=parent_id):
+            if entry.get('mimeType') == FOLDER_MIME_TYPE:
+                return entry['id']
+        return self.client.create_folder(name, parent_id)['id']
+
+    def _upload_one(self, path: str, parent_id: str) -> int:
+        self.client.upload_from_local(path, parent_id=parent_id)
+        return os.path.getsize(path)
+
+    def upload_directory(self, local_dir: str, parent_id: str = 'root', workers: Optional[int] = None,
+                         progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        Uploads a local directory tree as a folder inside parent_id, sending files in parallel.
+        Existing folders are reused and files already present with the same name and size are
+        skipped, so an interrupted run can simply be repeated.
+        """
+        local_dir = os.path.abspath(local_dir)
+        root_id = self._ensure_folder(os.path.basename(local_dir), parent_id)
+        folder_ids = {local_dir: root_id}
+        jobs = []
+        skipped = []
+
+        for current, dirs, files in os.walk(local_dir):
+            folder_id = folder_ids[current]
+            existing = {
+                (e['name'], e.get('size'))
+                for e in self.client.iter_files(f"'{folder_id}' in parents", fields="name, size")
+            }
+            for d in sorted(dirs):
+                folder_ids[os.path.join(current, d)] = self._ensure_folder(d, folder_id)
+            for fname in sorted(files):
+                path = os.path.join(current, fname)
+                if (fname, str(os.path.getsize(path))) in existing:
+                    skipped.append(path)
+                    continue
+                jobs.append((path, functools.partial(self._upload_one, path, folder_id)))
+
+        logger.info(f"Uploading {len(jobs)} files from {local_dir} to folder {root_id}")
+        summary = self._run_parallel(jobs, workers, progress, "upload")
+        summary["folder_id"] = root_id
+        summary["skipped"] = skipped
+        logger.info(
+            f"Uploaded {summary['succeeded']}/{summary['files']} files, {summary['bytes']} bytes "
+            f"in {summary['seconds']}s ({summary['mb_per_second']} MB/s)"
+        )
+        return summary
+
+    def _plan_sync(self, remote: Dict[str, Dict[str, Any]], local: Dict[str, os.stat_result],
+                   state: Dict[str, Dict[str, Any]], direction: str, local_dir: str) -> Dict[str, Any]:
+        """
+        Decides what sync_folder does with every path, from the Drive listing, the local scan and
+        the records of the last sync. Returns the actions plus the records to keep for each path.
+        """
+        pull = direction in ("pull", "both")
+        push = direction in ("push", "both")
+        remote, local, state = dict(remote), dict(local), dict(state)
+        plan = {"download": [], "upload": [], "rename_local": [], "rename_remote": [],
+                "delete_local": [], "trash_remote": [], "conflicts": [], "kept": []}
+        records = {}
+        unchanged = 0
+
+        def remote_changed(rec, entry) -> bool:
+            return (rec is None or rec['id'] != entry['id'] or rec['version'] != content_version(entry)
+                    or rec['size'] != entry.get('size'))
+
+        def local_changed(rec, stat) -> bool:
+            return rec is None or rec['local_size'] != stat.st_size or rec['local_mtime_ns'] != stat.st_mtime_ns
+
+        def identical(rel) -> bool:
+            # Both sides changed (or neither side was synced before) but may hold the same bytes
+            entry, stat = remote[rel], local[rel]
+            return (bool(entry.get('md5Checksum')) and entry.get('size') == str(stat.st_size)
+                    and _file_md5(_local_path(local_dir, rel)) == entry['md5Checksum'])
+
+        def upload(rel):
+            entry = remote.get(rel)
+            if entry is not None and entry.get('mimeType') in LOCAL_EXPORT_FORMATS:
+                # Edits to an exported Doc/Sheet/Slides copy cannot be written back
+                plan["kept"].append(rel)
+            else:
+                plan["upload"].append(rel)
+
+        if pull:
+            # Renamed or moved on Drive: move the unchanged local copy instead of downloading it again
+            by_id = {rec['id']: rel for rel, rec in state.items()}
+            for rel, entry in remote.items():
+                old = by_id.get(entry['id'])
+                if (old and old != rel and old in local and rel not in local and rel not in state
+                        and not local_changed(state[old], local[old])):
+                    plan["rename_local"].append((old, rel))
+                    local[rel] = local.pop(old)
+                    state[rel] = state.pop(old)
+
+        if push:
+            # Renamed or moved locally: a new local file with the content of a vanished one
+            vanished: Dict[int, List[str]] = {}
+            for rel, rec in state.items():
+                entry = remote.get(rel)
+                if rel not in local and entry and entry.get('md5Checksum') and not remote_changed(rec, entry):
+                    vanished.setdefault(rec['local_size'], []).append(rel)
+            for rel, stat in list(local.items()):
+                candidates = vanished.get(stat.st_size)
+                if not candidates or rel in state or rel in remote:
+                    continue
+                digest = _file_md5(_local_path(local_dir, rel))
+                old = next((c for c in candidates if remote[c]['md5Checksum'] == digest), None)
+                if old:
+                    candidates.remove(old)
+                    plan["rename_remote"].append((old, rel))
+                    remote[rel] = remote.pop(old)
+                    state[rel] = dict(state.pop(old), local_size=stat.st_size, local_mtime_ns=stat.st_mtime_ns)
+
+        for rel in sorted(set(remote) | set(local) | set(state)):
+            rec, entry, stat = state.get(rel), remote.get(rel), local.get(rel)
+            if rec is not None:
+                # Kept until the action succeeds, so a failed transfer is retried next time
+                records[rel] = rec
+            if entry is not None and stat is not None:
+                r_changed, l_changed = remote_changed(rec, entry), local_changed(rec, stat)
+                if not r_changed and not l_changed:
+                    unchanged += 1
+                elif identical(rel):
+                    records[rel] = _sync_record(entry, stat)
+                    unchanged += 1
+                elif pull and push:
+                    # An exported copy cannot be pushed back, so Drive wins for those
+                    if r_changed and (not l_changed or entry.get('mimeType') in LOCAL_EXPORT_FORMATS):
+                        plan["download"].append(rel)
+                    elif r_changed:
+                        plan["conflicts"].append(rel)
+                    else:
+                        upload(rel)
+                elif pull:
+                    plan["download"].append(rel)
+                else:
+                    upload(rel)
+            elif entry is not None:
+                # Only on Drive: new or changed there, or deleted locally
+                if pull and (not push or rec is None or remote_changed(rec, entry)):
+                    plan["download"].append(rel)
+                elif push and rec is not None:
+                    plan["trash_remote"].append(rel)
+            elif stat is not None:
+                # Only local: new or changed here, or deleted on Drive
+                if push and (not pull or rec is None or local_changed(rec, stat)):
+                    upload(rel)
+                elif pull and rec is not None:
+                    if local_changed(rec, stat):
+                        # Deleted on Drive but edited here; never delete local work
+                        plan["kept"].append(rel)
+                        records.pop(rel)
+                    else:
+                        plan["delete_local"].append(rel)
+            else:
+                # Gone on both sides
+                records.pop(rel)
+        plan.update(records=records, remote=remote, unchanged=unchanged)
+        return plan
+
+    def sync_folder(self, folder_id: str, local_dir: str, direction: str = "both",
+                    state_path: Optional[str] = None, dry_run: bool = False, workers: Optional[int] = None,
+                    progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        Incrementally syncs a Drive folder tree with a local directory, transferring only what changed.
+        Drive files are compared by md5Checksum and size (modifiedTime for Docs, Sheets and Slides,
+        which have no checksum), local files by size and mtime, both against the state file written
+        by the previous run (`.forge-sync.json` in local_dir unless state_path is given).
+
+        direction 'pull' makes the local directory a mirror of Drive and 'push' the reverse; files
+        only present on the target side and never synced are left alone. 'both' carries each side's
+        changes to the other and reports files changed on both sides as conflicts without touching
+        them. Renames and moves are applied as renames on the other side rather than re-transferred;
+        deletions are applied too (Drive files go to the trash, local files edited since the last
+        sync are kept). Downloads and uploads run in parallel. Exported Docs/Sheets/Slides are
+        pull-only. With dry_run=True, nothing is changed and the planned actions are returned.
+        """
+        if direction not in SYNC_DIRECTIONS:
+            raise ValueError(f"direction must be one of {', '.join(SYNC_DIRECTIONS)}")
+        started = time.monotonic()
+        pull = direction in ("pull", "both")
+        push = direction in ("push", "both")
+        local_dir = os.path.abspath(local_dir)
+        state_path = os.path.abspath(state_path or os.path.join(local_dir, SYNC_STATE_FILE))
+        state = _load_sync_state(state_path, folder_id)
+
+        remote, remote_folders, skipped = self._remote_tree(folder_id)
+        local, local_dirs = _scan_local(local_dir, state_path) if os.path.isdir(local_dir) else ({}, set())
+        plan = self._plan_sync(remote, local, state["files"], direction, local_dir)
+        records, remote = plan.pop("records"), plan.pop("remote")
+        synced_folders = state["folders"]
+
+        # Folders deleted locally go to the trash whole, unless something on Drive inside them is kept
+        plan["trash_folders"] = []
+        if push:
+            trashing = set(plan["trash_remote"])
+            kept_remote = [rel for rel in remote if rel not in trashing] + skipped
+            for rel in sorted(synced_folders):
+                if rel not in remote_folders or rel in local_dirs:
+                    continue
+                if any(rel.startswith(f"{trashed}/") for trashed in plan["trash_folders"]):
+                    continue
+                if not any(path.startswith(f"{rel}/") for path in kept_remote):
+                    plan["trash_folders"].append(rel)
+            if plan["trash_folders"]:
+                covered = tuple(f"{rel}/" for rel in plan["trash_folders"])
+                plan["trash_remote"] = [rel for rel in plan["trash_remote"] if not rel.startswith(covered)]
+
+        unchanged = plan.pop("unchanged")
+        if dry_run:
+            return {"direction": direction, "dry_run": True, "unchanged": unchanged,
+                    "plan": {action: items for action, items in plan.items()}, "skipped": skipped}
+
+        failed: Dict[str, str] = {}
+        os.makedirs(local_dir, exist_ok=True)
+
+        for old, new in plan["rename_local"]:
+            try:
+                os.makedirs(os.path.dirname(_local_path(local_dir, new)), exist_ok=True)
+                os.replace(_local_path(local_dir, old), _local_path(local_dir, new))
+            except OSError as e:
+                failed[new] = str(e)
+                records.pop(new, None)
+        if pull:
+            doomed = tuple(f"{rel}/" for rel in plan["trash_folders"])
+            for rel in remote_folders:
+                if rel not in plan["trash_folders"] and not (doomed and rel.startswith(doomed)):
+                    os.makedirs(_local_path(local_dir, rel), exist_ok=True)
+
+        folder_errors: Dict[str, str] = {}
+
+        def remote_folder(rel: str, for_path: Optional[str] = None) -> Optional[str]:
+            """
+            ID of the Drive folder for a local directory, created (with its parents) if missing.
+            None if it could not be created: the error is recorded in `failed` under the folder
+            and under `for_path`, the file that needed it, and the folder is not tried again.
+            """
+            if rel not in remote_folders and rel not in folder_errors:
+                parent, _, name = rel.rpartition('/')
+                parent_id = remote_folder(parent)
+                if parent_id is None:
+                    folder_errors[rel] = folder_errors[parent]
+                else:
+                    try:
+                        remote_folders[rel] = self._ensure_folder(name, parent_id)
+                    except Exception as e:
+                        folder_errors[rel] = failed[rel] = str(e)
+            if rel in remote_folders:
+                return remote_folders[rel]
+            if for_path is not None:
+                failed[for_path] = f"Could not create folder '{rel}': {folder_errors[rel]}"
+            return None
+
+        if push:
+            # New local directories, including empty ones; directories deleted on Drive are not recreated
+            for rel in sorted(local_dirs):
+                if rel not in synced_folders or not pull:
+                    remote_folder(rel)
+            updates = {}
+            for old, new in plan["rename_remote"]:
+                old_parent, new_parent = old.rpartition('/')[0], new.rpartition('/')[0]
+                update = {'body': {'name': new.rpartition('/')[2]}}
+                if old_parent != new_parent:
+                    parent_id = remote_folder(new_parent, for_path=new)
+                    if parent_id is None:
+                        records.pop(new, None)
+                        continue
+                    update.update(addParents=parent_id, removeParents=remote_folders[old_parent])
+                updates[remote[new]['id']] = update
+            if updates:
+                result = self.client.update_many(updates)
+                new_paths = {remote[new]['id']: new for _, new in plan["rename_remote"]}
+                for file_id, error in result["failed"].items():
+                    failed[new_paths[file_id]] = str(error)
+                    records.pop(new_paths[file_id], None)
+
+        def download(rel: str) -> int:
+            path = _local_path(local_dir, rel)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            nbytes = self._download_one(remote[rel], path)
+            records[rel] = _sync_record(remote[rel], os.stat(path))
+            return nbytes
+
+        def upload(rel: str, parent_id: str) -> int:
+            path = _local_path(local_dir, rel)
+            stat = os.stat(path)
+            entry = remote.get(rel)
+            result = self.client.upload_from_local(path, parent_id=parent_id, file_id=entry['id'] if entry else None)
+            records[rel] = _sync_record(result, stat)
+            return stat.st_size
+
+        downloads = self._run_parallel(
+            [(rel, functools.partial(download, rel)) for rel in plan["download"]], workers, progress, "sync-pull")
+        # Folders are created here, one at a time, so parallel uploads never race to create the same one
+        parents = {rel: remote_folder(rel.rpartition('/')[0], for_path=rel) for rel in plan["upload"]}
+        uploads = self._run_parallel(
+            [(rel, functools.partial(upload, rel, parent_id)) for rel, parent_id in parents.items() if parent_id],
+            workers, progress, "sync-push")
+        failed.update(downloads["failed"])
+        failed.update(uploads["failed"])
+
+        trash = {remote[rel]['id']: rel for rel in plan["trash_remote"]}
+        trash.update({remote_folders[rel]: rel for rel in plan["trash_folders"]})
+        trashed = 0
+        if trash:
+            result = self.client.trash_many(list(trash))
+            trashed = len(result["succeeded"])
+            for file_id in result["succeeded"]:
+                records.pop(trash[file_id], None)
+                remote_folders.pop(trash[file_id], None)
+            for file_id, error in result["failed"].items():
+                failed[trash[file_id]] = str(error)
+            gone = tuple(f"{trash[file_id]}/" for file_id in result["succeeded"] if trash[file_id] in plan["trash_folders"])
+            if gone:
+                for rel in [rel for rel in [*records, *remote_folders] if rel.startswith(gone)]:
+                    records.pop(rel, None)
+                    remote_folders.pop(rel, None)
+        for rel in plan["delete_local"]:
+            try:
+                os.remove(_local_path(local_dir, rel))
+                records.pop(rel)
+            except FileNotFoundError:
+                records.pop(rel)
+            except OSError as e:
+                failed[rel] = str(e)
+        if pull:
+            # Directories whose Drive folder is gone are removed once empty, deepest first
+            for rel in sorted(synced_folders, reverse=True):
+                if rel not in remote_folders:
+                    try:
+                        os.rmdir(_local_path(local_dir, rel))
+                    except OSError:
+                        pass
+
+        folders = {rel: fid for rel, fid in remote_folders.items()
+                   if rel and os.path.isdir(_local_path(local_dir, rel))}
+        os.makedirs(os.path.dirname(state_path), exist_ok=True)
+        with open(state_path + '.part', 'w') as f:
+            json.dump({"folder_id": folder_id, "files": records, "folders": folders}, f)
+        os.replace(state_path + '.part', state_path)
+
+        summary = {
+            "direction": direction,
+            "downloaded": downloads["succeeded"],
+            "uploaded": uploads["succeeded"],
+            "renamed_local": len(plan["rename_local"]),
+            "renamed_remote": len(plan["rename_remote"]),
+            "deleted_local": len(plan["delete_local"]),
+            "trashed_remote": trashed,
+            "unchanged": unchanged,
+            "bytes": downloads["bytes"] + uploads["bytes"],
+            "conflicts": plan["conflicts"],
+            "kept": plan["kept"],
+            "skipped": skipped,
+            "failed": failed,
+            "seconds": round(time.monotonic() - started, 2),
+        }
+        logger.info(
+            f"Synced {folder_id} <-> {local_dir} ({direction}): {summary['downloaded']} down, "
+            f"{summary['uploaded']} up, {len(failed)} failed, {len(plan['conflicts'])} conflicts in {summary['seconds']}s"
+        )
+        return summary
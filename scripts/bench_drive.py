@@ -0,0 +1,178 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+# Add parent directory to sys.path to access the package
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from google_drive_forge.content_cache import ContentCache
+from google_drive_forge.fake_drive import FakeDrive, FakeDriveServer, fake_credentials
+from google_drive_forge.intelligent_client import IntelligentDriveClient
+from google_drive_forge.scheduler import RequestScheduler
+from google_drive_forge.transfer import TransferEngine
+
+def _client(server, quota, content_cache=None):
+    # The scheduler is sized far above the fake server's capacity unless a quota is being tested
+    return IntelligentDriveClient(creds=fake_credentials(), api_endpoint=server.url,
+                                  scheduler=RequestScheduler(quota_per_minute=quota),
+                                  content_cache=content_cache)
+
+def _timed(func):
+    started = time.perf_counter()
+    result = func()
+    return time.perf_counter() - started, result
+
+def bench_listing(drive, server, quota):
+    client = _client(server, quota)
+    folder = max((f for f in drive.files.values() if f.is_folder), key=lambda f: len(drive.children[f.id]))
+    seconds, files = _timed(lambda: client.list_files(query=f"'{folder.id}' in parents", limit=None))
+    yield "list folder", len(files) / seconds, f"files/s ({len(files)} files)"
+
+    seconds, count = _timed(lambda: sum(1 for _ in client.iter_files(fields="id, name, parents")))
+    yield "list whole drive", count / seconds, f"files/s ({count} files)"
+
+    seconds, count = _timed(lambda: sum(1 for _ in client.walk('root')))
+    yield "walk whole drive", count / seconds, f"files/s ({count} files, paths included)"
+
+def bench_paths(drive, server, quota, count, rng):
+    files = [f for f in drive.files.values() if not f.is_folder and f.parents]
+    paths = [drive.path_of(f.id) for f in rng.sample(files, min(count, len(files)))]
+    client = _client(server, quota)
+
+    def resolve_all(targets):
+        timings = []
+        for path in targets:
+            seconds, _ = _timed(lambda: client.find_and_heal_path(path))
+            timings.append(seconds * 1000)
+        return timings
+
+    yield "resolve path (cold)", statistics.median(resolve_all(paths)), "ms median"
+    yield "resolve path (cached)", statistics.median(resolve_all(paths)), "ms median"
+
+    # Upper-case the file name so the exact lookup fails and the path has to be healed
+    damaged = ['/'.join(p.split('/')[:-1] + [p.split('/')[-1].upper()]) for p in paths]
+    yield "resolve path (healed)", statistics.median(resolve_all(damaged)), "ms median"
+
+def bench_downloads(drive, server, quota, count, rng):
+    client = _client(server, quota)
+    binaries = [f for f in drive.files.values() if f.size and not f.is_google_type]
+    targets = rng.sample(binaries, min(count, len(binaries)))
+    seconds, total = _timed(lambda: sum(len(client.download_file(f.id)) for f in targets))
+    yield "download_file", total / seconds / (1024 * 1024), f"MB/s ({len(targets)} files)"
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cached = _client(server, quota, content_cache=ContentCache(cache_dir))
+        for f in targets:
+            cached.download_file(f.id)
+        seconds, total = _timed(lambda: sum(len(cached.download_file(f.id)) for f in targets))
+    yield "download_file (cached)", total / seconds / (1024 * 1024), "MB/s (repeat reads)"
+
+    # A leaf folder, so the walk does not pull in a large subtree
+    folder = next(f for f in drive.files.values() if f.is_folder and f.parents
+                  and not any(drive.files[c].is_folder for c in drive.children[f.id]))
+    with tempfile.TemporaryDirectory() as dest:
+        summary = TransferEngine(client).download_folder(folder.id, dest)
+    yield "download_folder", summary["mb_per_second"], f"MB/s ({summary['succeeded']} files, 8 workers)"
+
+def bench_uploads(drive, server, quota, count, size_mb):
+    client = _client(server, quota)
+    folder = client.create_folder("bench_uploads")['id']
+    payload = os.urandom(4096)
+    seconds, _ = _timed(lambda: [client.upload_file(f"small_{i}.bin", payload, parent_id=folder,
+                                                    mime_type='application/octet-stream') for i in range(count)])
+    yield "upload_file (4 KB)", count / seconds, "files/s"
+
+    with tempfile.NamedTemporaryFile(suffix=".bin", delete=False) as fh:
+        fh.write(os.urandom(size_mb * 1024 * 1024))
+    try:
+        seconds, _ = _timed(lambda: client.upload_from_local(fh.name, parent_id=folder, chunk_size=1024 * 1024))
+        yield "upload_from_local", size_mb / seconds, f"MB/s ({size_mb} MB in 1 MB chunks)"
+    finally:
+        os.remove(fh.name)
+
+def bench_batch(drive, server, quota, count, rng):
+    client = _client(server, quota)
+    ids = rng.sample([f for f in drive.files if f != drive.resolve('root')], min(count, len(drive.files) - 1))
+    seconds, result = _timed(lambda: client.get_metadata_many(ids))
+    yield "get_metadata_many", len(ids) / seconds, f"files/s ({len(ids)} ids, batches of 100)"
+
+def bench_async(drive, server, quota, concurrency):
+    try:
+        from google_drive_forge.async_client import AsyncDriveClient
+    except ImportError:
+        return
+    folders = [f.id for f in drive.files.values() if f.is_folder and f.parents][:concurrency]
+
+    async def run():
+        client = AsyncDriveClient(creds=fake_credentials(), api_url=f"{server.url}/drive/v3",
+                                  upload_url=f"{server.url}/upload/drive/v3",
+                                  scheduler=RequestScheduler(quota_per_minute=quota))
+        started = time.perf_counter()
+        listings = await asyncio.gather(*(client.list_folder_children(f, limit=None) for f in folders))
+        return time.perf_counter() - started, sum(len(l) for l in listings)
+
+    seconds, count = asyncio.run(run())
+    yield "async list folders", count / seconds, f"files/s ({len(folders)} folders concurrently)"
+
+def bench_drive(args):
+    rng = random.Random(args.seed)
+    drive = FakeDrive()
+    seconds, tree = _timed(lambda: drive.generate_tree(files=args.files, files_per_folder=args.files_per_folder,
+                                                      seed=args.seed))
+    print(f"Synthetic drive: {tree['files']} files in {tree['folders']} folders ({seconds:.1f}s to generate)")
+    print(f"Server latency {args.latency * 1000:.0f} ms, failure rate {args.failure_rate:.1%}\n")
+
+    server = FakeDriveServer(drive, latency=args.latency, jitter=args.jitter, bandwidth=args.bandwidth,
+                             failure_rate=args.failure_rate, rate_limit_rate=args.rate_limit_rate,
+                             seed=args.seed).start()
+    quota = args.quota or 10 ** 9
+    suites = {
+        "listing": lambda: bench_listing(drive, server, quota),
+        "paths": lambda: bench_paths(drive, server, quota, args.paths, rng),
+        "download": lambda: bench_downloads(drive, server, quota, args.downloads, rng),
+        "upload": lambda: bench_uploads(drive, server, quota, args.uploads, args.upload_mb),
+        "batch": lambda: bench_batch(drive, server, quota, args.batch, rng),
+        "async": lambda: bench_async(drive, server, quota, args.concurrency),
+    }
+    results = []
+    try:
+        for name in args.only or suites:
+            for label, value, unit in suites[name]() or ():
+                results.append({"suite": name, "benchmark": label, "value": round(value, 2), "unit": unit})
+                print(f"{label:<24} {value:>10.1f} {unit}")
+    finally:
+        server.stop()
+
+    print(f"\n{server.requests} requests served, {server.injected_failures} injected failures")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.json}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Drive clients against a local fake Drive API.")
+    parser.add_argument("--files", type=int, default=20_000, help="Size of the synthetic drive")
+    parser.add_argument("--files-per-folder", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.005, help="Seconds added to every request")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--bandwidth", type=float, default=None, help="Media throughput limit in bytes/s")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Chance of a 503 per request")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Chance of a 403 rate limit per request")
+    parser.add_argument("--quota", type=float, default=None, help="Client-side quota per minute (default: unlimited)")
+    parser.add_argument("--paths", type=int, default=50, help="Paths to resolve")
+    parser.add_argument("--downloads", type=int, default=100, help="Files to download")
+    parser.add_argument("--uploads", type=int, default=50, help="Small files to upload")
+    parser.add_argument("--upload-mb", type=int, default=16, help="Size of the chunked upload")
+    parser.add_argument("--batch", type=int, default=500, help="IDs for the batched metadata fetch")
+    parser.add_argument("--concurrency", type=int, default=20, help="Folders listed at once by the async client")
+    parser.add_argument("--only", nargs="+", choices=["listing", "paths", "download", "upload", "batch", "async"])
+    parser.add_argument("--json", help="Also write the results to this file")
+    parser.add_argument("--seed", type=int, default=0)
+
+    bench_drive(parser.parse_args())
@@ -0,0 +1,93 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+# Repository root, put on PYTHONPATH for the child interpreters
+PACKAGE_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+def import_profile(module, top):
+    """Imports `module` in a fresh interpreter with -X importtime and returns (total_us, slowest entries)."""
+    env = dict(os.environ, PYTHONPATH=PACKAGE_ROOT)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=env, cwd=PACKAGE_ROOT
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    # Lines look like: "import time:   self [us] | cumulative | imported package"
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line.split(":", 1)[1].split("|")
+        # Nested imports are indented by two spaces per level after the separator space
+        entries.append((int(cumulative_us), int(self_us), name[1:].rstrip()))
+
+    # Top-level imports (no indentation) add up to the total
+    total = sum(c for c, _, name in entries if not name.startswith(" "))
+    slowest = sorted(((c, s, n.strip()) for c, s, n in entries), reverse=True)[:top]
+    return total, slowest
+
+def time_to_tool_list(timeout=30.0):
+    """Starts the stdio server and returns (seconds until the tools/list reply, number of tools)."""
+    env = dict(os.environ, PYTHONPATH=PACKAGE_ROOT)
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "google_drive_forge"],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+        text=True, env=env, cwd=PACKAGE_ROOT
+    )
+
+    def send(message):
+        process.stdin.write(json.dumps(message) + "\n")
+        process.stdin.flush()
+
+    try:
+        send({"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {
+            "protocolVersion": "2024-11-05", "capabilities": {},
+            "clientInfo": {"name": "bench_startup", "version": "1.0"}}})
+        for line in process.stdout:
+            message = json.loads(line)
+            if message.get("id") == 1:
+                send({"jsonrpc": "2.0", "method": "notifications/initialized"})
+                send({"jsonrpc": "2.0", "id": 2, "method": "tools/list"})
+            elif message.get("id") == 2:
+                return time.perf_counter() - started, len(message["result"]["tools"])
+            if time.perf_counter() - started > timeout:
+                break
+        raise RuntimeError("Server exited or timed out before answering tools/list")
+    finally:
+        process.kill()
+        process.wait()
+
+def bench_startup(runs, top):
+    for module in ("google_drive_forge.__main__", "googleapiclient.discovery"):
+        try:
+            total, slowest = import_profile(module, top)
+        except RuntimeError as e:
+            print(f"import {module}: failed ({e})")
+            continue
+        print(f"import {module}: {total / 1000:.1f} ms")
+        for cumulative, own, name in slowest:
+            print(f"  {cumulative / 1000:8.1f} ms cumulative  {own / 1000:7.1f} ms self  {name}")
+
+    timings = []
+    for _ in range(runs):
+        seconds, tools = time_to_tool_list()
+        timings.append(seconds)
+    timings.sort()
+    print(f"\nTime to tool list ({tools} tools, {runs} runs): "
+          f"median {timings[len(timings) // 2] * 1000:.0f} ms, best {timings[0] * 1000:.0f} ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure server import time (-X importtime) and time to the MCP tool list.")
+    parser.add_argument("--runs", type=int, default=5, help="Number of server starts to time")
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest imports to show")
+
+    args = parser.parse_args()
+
+    bench_startup(args.runs, args.top)
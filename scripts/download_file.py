@@ -18,7 +18,7 @@ def download_file(file_id, dest_path):
     print(f"Resolving file ID: {file_id}...")
     try:
         # Check metadata for name and mimeType
-        meta = client.service.files().get(fileId=file_id, fields="name, mimeType").execute()
+        meta = client.scheduler.execute(client.service.files().get(fileId=file_id, fields="name, mimeType"))
         file_name = meta.get('name')
         mime_type = meta.get('mimeType')
         print(f"Found: {file_name} ({mime_type})")
@@ -35,25 +35,21 @@ def download_file(file_id, dest_path):
         os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
         
         # Download logic
+        export_mime_type = None
         if mime_type == 'application/vnd.google-apps.document':
             print("Detected Google Doc. Exporting as plain text...")
-            content = client.download_file(file_id, export_mime_type='text/plain')
+            export_mime_type = 'text/plain'
             # If output filename doesn't have extension, add .md or .txt?
             # Let's trust the user's dest path or append .md if it was auto-generated from name
             if os.path.isdir(dest_path) and not output_file.lower().endswith(('.md', '.txt')):
                  output_file += ".md"
         else:
             print("Downloading binary content...")
-            content = client.download_file(file_id)
 
-        # Write to file
-        with open(output_file, "wb") as f:
-            if isinstance(content, str):
-                f.write(content.encode('utf-8'))
-            else:
-                f.write(content)
+        # Stream to file (resumes from a previous partial download)
+        result = client.download_to_path(file_id, output_file, export_mime_type=export_mime_type)
                 
-        print(f"Successfully saved to: {output_file}")
+        print(f"Successfully saved to: {output_file} ({result['bytes']} bytes)")
         
     except Exception as e:
         print(f"Error downloading file: {e}")
@@ -1,4 +1,3 @@
-
 import argparse
 import logging
 import sys
@@ -12,88 +11,58 @@ from google_drive_forge.intelligent_client import IntelligentDriveClient
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def move_files(source_name, dest_name, create_dest=False):
+def _resolve_folder(client, value):
+    """Folder IDs are used as is; anything with a slash is resolved as a path, exactly (never healed)."""
+    return client.resolve_path(value, heal=False)["id"] if '/' in value else value
+
+def move_files(source, dest, create_dest=False, mime_type=None, name_glob=None, dry_run=False, workers=4):
     client = IntelligentDriveClient()
-    
-    # 1. Find source files or folder
-    print(f"Searching for source: '{source_name}'...")
-    # Logic: If source is a folder, move its CONTENTS. If source is a file/pattern, move THE FILES.
-    # For simplicity in this generic script, we'll assume source is a FOLDER and we move its contents.
-    
-    source_results = client.list_files(query=f"name = '{source_name}' and mimeType = 'application/vnd.google-apps.folder' and trashed = false")
-    
-    if not source_results:
-        print(f"Error: Source folder '{source_name}' not found. Cannot proceed.")
+
+    # 1. Resolve source and destination folders
+    source_id = _resolve_folder(client, source)
+    if not source_id:
+        print(f"Error: Source folder '{source}' not found. Cannot proceed.")
         return
-    
-    source_folder = source_results[0]
-    source_id = source_folder['id']
-    print(f"Found source folder: {source_folder['name']} (ID: {source_id})")
-    
-    # 2. Check for or create destination folder
-    print(f"Searching for destination: '{dest_name}'...")
-    
-    # We look for destination folder ANYWHERE (or should we restrict?)
-    # A generic move usually implies moving TO a specific target.
-    dest_results = client.list_files(query=f"name = '{dest_name}' and mimeType = 'application/vnd.google-apps.folder' and trashed = false")
-    
-    if dest_results:
-        dest_folder = dest_results[0]
-        dest_id = dest_folder['id']
-        print(f"Found existing destination folder: {dest_folder['name']} (ID: {dest_id})")
-    elif create_dest:
-        print(f"Creating destination folder '{dest_name}' inside '{source_name}' (default behavior if parent not specified)...")
-        # NOTE: If we want to create it elsewhere, we'd need a parent argument. 
-        # For now, let's create it as a sibling of source? Or inside source?
-        # If organizing, usually we want it INSIDE source (like 'archive').
-        # Let's default to creating INSIDE source for safety, or asking user to be more specific.
-        # Actually better: Create it in 'root' if not found? No, that's messy.
-        # Let's create it inside the SOURCE folder as a subfolder.
-        dest_folder = client.create_folder(name=dest_name, parent_id=source_id)
-        dest_id = dest_folder['id']
-        print(f"Created destination folder: {dest_folder['name']} (ID: {dest_id})")
-    else:
-        print(f"Error: Destination folder '{dest_name}' not found and --create-dest not specified.")
+    print(f"Source folder: {source} (ID: {source_id})")
+
+    dest_id = _resolve_folder(client, dest)
+    if not dest_id and create_dest and dry_run:
+        print(f"Destination folder {dest} would be created.")
+    elif not dest_id and create_dest:
+        dest_id = client.ensure_folder_path(dest)
+        print(f"Created destination folder: {dest} (ID: {dest_id})")
+    elif not dest_id:
+        print(f"Error: Destination folder '{dest}' not found and --create-dest not specified.")
         return
+    else:
+        print(f"Destination folder: {dest} (ID: {dest_id})")
 
-    # 3. List files in source folder
-    print(f"Listing files in '{source_folder['name']}'...")
-    all_children = client.list_folder_children(source_id)
-    
-    # Filter out the destination folder if it is inside the source (to avoid recursion/errors)
-    files_to_move = [f for f in all_children if f['id'] != dest_id]
-    
-    if not files_to_move:
-        print("No files found to move.")
+    # 2. List every matching child (all pages) and move them in parallel batches
+    result = client.move_files(source_id, dest_id, mime_type=mime_type, name_glob=name_glob,
+                               dry_run=dry_run, workers=workers)
+    if dry_run:
+        for file in result["plan"]:
+            print(f"Would move: {file['name']}")
+        print(f"{result['matched']} files would be moved.")
         return
-        
-    print(f"Found {len(files_to_move)} files to move.")
-    
-    # 4. Move files
-    for file in files_to_move:
-        file_id = file['id']
-        file_name = file['name']
-        print(f"Moving file: {file_name} ({file_id})")
-        
-        try:
-            previous_parents = ",".join(file.get('parents', []))
-            
-            client.service.files().update(
-                fileId=file_id,
-                addParents=dest_id,
-                removeParents=previous_parents,
-                fields='id, parents'
-            ).execute()
-            print(f"Successfully moved: {file_name}")
-        except Exception as e:
-            print(f"Failed to move {file_name}: {str(e)}")
+
+    for name in result["results"]["succeeded"].values():
+        print(f"Successfully moved: {name}")
+    for item in result["results"]["failed"].values():
+        print(f"Failed to move {item['name']}: {item['error']}")
+    print(f"Moved {result['moved']} of {result['matched']} files in {result['seconds']}s.")
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description="Move all files from a source folder to a destination folder on Google Drive.")
-    parser.add_argument("source", help="Name of the source folder")
-    parser.add_argument("dest", help="Name of the destination folder")
-    parser.add_argument("--create-dest", action="store_true", help="Create destination folder if it doesn't exist (created inside source)")
-    
+    parser = argparse.ArgumentParser(description="Move the files of a source folder into a destination folder on Google Drive.")
+    parser.add_argument("source", help="ID or /path of the source folder")
+    parser.add_argument("dest", help="ID or /path of the destination folder")
+    parser.add_argument("--create-dest", action="store_true", help="Create the destination path if it doesn't exist")
+    parser.add_argument("--mime-type", help="Only move files of this MIME type")
+    parser.add_argument("--glob", dest="name_glob", help="Only move files whose name matches this pattern, e.g. '*.pdf'")
+    parser.add_argument("--dry-run", action="store_true", help="List the files that would be moved")
+    parser.add_argument("--workers", type=int, default=4, help="Batches sent at once")
+
     args = parser.parse_args()
-    
-    move_files(args.source, args.dest, args.create_dest)
+
+    move_files(args.source, args.dest, args.create_dest, mime_type=args.mime_type, name_glob=args.name_glob,
+               dry_run=args.dry_run, workers=args.workers)
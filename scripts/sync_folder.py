@@ -0,0 +1,53 @@
+import argparse
+import logging
+import os
+import sys
+
+# Add parent directory to sys.path to access the package
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from google_drive_forge.intelligent_client import IntelligentDriveClient
+from google_drive_forge.transfer import TransferEngine
+
+logging.basicConfig(level=logging.INFO)
+
+def sync_folder(folder, local_dir, direction="both", dry_run=False, workers=8):
+    client = IntelligentDriveClient()
+
+    # Folder IDs are used as is; anything with a slash is resolved as a path, exactly (never healed)
+    result = client.resolve_path(folder, heal=False) if '/' in folder else {"id": folder}
+    folder_id = result["id"]
+    if not folder_id:
+        names = ", ".join(s["name"] for s in result["suggestions"])
+        print(f"Error: Folder '{folder}' not found ('{result['missing']}' is missing)."
+              + (f" Did you mean: {names}?" if names else ""))
+        return
+
+    summary = TransferEngine(client, workers=workers).sync_folder(folder_id, local_dir, direction=direction,
+                                                                   dry_run=dry_run)
+    if dry_run:
+        for action, items in summary["plan"].items():
+            for item in items:
+                print(f"{action}: {item}")
+        print(f"{summary['unchanged']} files unchanged.")
+        return
+
+    print(f"Downloaded {summary['downloaded']}, uploaded {summary['uploaded']} files ({summary['bytes']} bytes); "
+          f"{summary['unchanged']} unchanged, in {summary['seconds']}s")
+    for path in summary['conflicts']:
+        print(f"  Conflict (changed on both sides, left as is): {path}")
+    for path, error in summary['failed'].items():
+        print(f"  Error processing {path}: {error}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Incrementally sync a Google Drive folder with a local directory.")
+    parser.add_argument("folder", help="ID or /path of the Google Drive folder")
+    parser.add_argument("dest", help="Local directory")
+    parser.add_argument("--direction", choices=["pull", "push", "both"], default="both",
+                        help="pull: Drive to local, push: local to Drive, both: each side's changes to the other")
+    parser.add_argument("--dry-run", action="store_true", help="List the planned actions without changing anything")
+    parser.add_argument("--workers", type=int, default=8, help="Number of parallel transfers")
+
+    args = parser.parse_args()
+
+    sync_folder(args.folder, args.dest, args.direction, args.dry_run, args.workers)
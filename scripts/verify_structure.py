@@ -44,12 +44,12 @@ def verify_and_fix():
     if clawdbot_in_skills:
         print("\nFound 'clawdbot' folder inside 'skills'. Moving it back to 'socialMedia'...")
         # Move back
-        client.service.files().update(
+        client.scheduler.execute(client.service.files().update(
             fileId=clawdbot_in_skills['id'],
             addParents=social_id,
             removeParents=skills_id,
             fields='id, parents'
-        ).execute()
+        ))
         print("Moved 'clawdbot' back to 'socialMedia'.")
     else:
         print("\n'clawdbot' is not in 'skills'. Verification passed.")
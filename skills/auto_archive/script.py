@@ -1,16 +1,9 @@
-import os
-import sys
 from datetime import datetime, timedelta, timezone
 
-# Add the mcp/google_drive directory to sys.path to allow importing src
-mcp_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-if mcp_root not in sys.path:
-    sys.path.append(mcp_root)
-
-from src.intelligent_client import IntelligentDriveClient
+from google_drive_forge.skill_runtime import get_client
 
 def run():
-    client = IntelligentDriveClient()
+    client = get_client()
     print("🚀 Initializing Auto-Archive Skill...")
     
     # 1. Target the Archive folder
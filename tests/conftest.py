@@ -0,0 +1,55 @@
+import pytest
+
+from google_drive_forge.fake_drive import FakeDrive, FakeDriveServer, FOLDER_MIME_TYPE, fake_credentials
+from google_drive_forge.intelligent_client import IntelligentDriveClient
+from google_drive_forge.scheduler import RequestScheduler
+
+@pytest.fixture
+def drive():
+    """A small tree: /Projects/Reports/q1.txt, /Projects/Reports/q2.txt, /Projects/notes (a Doc)."""
+    drive = FakeDrive()
+    projects = drive.add('Projects', FOLDER_MIME_TYPE)
+    reports = drive.add('Reports', FOLDER_MIME_TYPE, [projects.id])
+    drive.add('q1.txt', 'text/plain', [reports.id], content=b'first quarter\n')
+    drive.add('q2.txt', 'text/plain', [reports.id], content=b'second quarter\n')
+    drive.add('notes', 'application/vnd.google-apps.document', [projects.id], content=b'meeting notes\n')
+    return drive
+
+@pytest.fixture
+def server(drive):
+    with FakeDriveServer(drive) as server:
+        yield server
+
+@pytest.fixture
+def client(server):
+    # The scheduler is sized far above the fake server's capacity
+    return IntelligentDriveClient(creds=fake_credentials(), api_endpoint=server.url,
+                                  scheduler=RequestScheduler(quota_per_minute=10 ** 9))
+
+def find(drive, name):
+    return next(f for f in drive.files.values() if f.name == name and not f.trashed)
+
+@pytest.fixture
+def tools(client, tmp_path):
+    """The server's sync tools, registered on a fresh FastMCP against the fake drive."""
+    import sys
+    from mcp.server.fastmcp import FastMCP
+    from google_drive_forge.audit import AuditLogger
+    from google_drive_forge.executor import ScriptExecutor
+    from google_drive_forge.skill_loader import SkillLoader
+    from google_drive_forge.tools import register_tools, register_intelligent_tools
+
+    mcp = FastMCP("test")
+    skills_dir = str(tmp_path / "skills")
+    audit = AuditLogger(str(tmp_path / "audit" / "audit.log"))
+    register_tools(mcp, client)
+    register_intelligent_tools(mcp, client, ScriptExecutor(sys.executable, skills_dir, workers=0),
+                               SkillLoader(skills_dir), audit)
+    return mcp
+
+def call(mcp, name, **arguments):
+    """Calls a tool and returns its text reply."""
+    import asyncio
+    result = asyncio.run(mcp.call_tool(name, arguments))
+    content = result[0] if isinstance(result, tuple) else result
+    return content[0].text
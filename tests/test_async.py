@@ -0,0 +1,128 @@
+import asyncio
+import os
+
+import httpx
+import pytest
+
+from conftest import find
+from google_drive_forge import client as client_module
+from google_drive_forge.async_client import AsyncDriveClient
+from google_drive_forge.fake_drive import DriveApiError, fake_credentials
+
+def async_client(server, client):
+    return AsyncDriveClient(creds=fake_credentials(), api_url=f"{server.url}/drive/v3",
+                            upload_url=f"{server.url}/upload/drive/v3", sync_client=client)
+
+def test_async_tools_keep_the_sync_only_tools(client, tmp_path):
+    import sys
+    from mcp.server.fastmcp import FastMCP
+    from google_drive_forge.audit import AuditLogger
+    from google_drive_forge.executor import ScriptExecutor
+    from google_drive_forge.skill_loader import SkillLoader
+    from google_drive_forge.tools import register_tools, register_intelligent_tools, register_async_tools
+
+    mcp = FastMCP("test")
+    skills_dir = str(tmp_path / "skills")
+    async_tools = register_async_tools(mcp, client)
+    register_tools(mcp, client, skip=async_tools)
+    register_intelligent_tools(mcp, client, ScriptExecutor(sys.executable, skills_dir, workers=0),
+                               SkillLoader(skills_dir), AuditLogger(str(tmp_path / "audit.log")), skip=async_tools)
+
+    tools = {t.name: t for t in mcp._tool_manager.list_tools()}
+    for name in ("get_metadata_many", "trash_many", "move_many", "cache_stats", "sync_mirror", "move_files"):
+        assert name in tools and not tools[name].is_async
+    for name in ("list_files", "trash_file", "resolve_path", "smart_read", "read_text"):
+        assert tools[name].is_async
+
+def test_sync_writes_invalidate_async_paths(server, client, drive):
+    async def run():
+        aclient = async_client(server, client)
+        first = await aclient.resolve_path('/Projects/Reports/q1.txt')
+        client.trash_file(first["id"])
+        second = await aclient.resolve_path('/Projects/Reports/q1.txt', heal=False)
+        await aclient.aclose()
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert drive.get(first["id"]).trashed
+    assert second["id"] is None and second["missing"] == 'q1.txt'
+
+def test_async_writes_invalidate_sync_listings(server, client, drive):
+    reports = find(drive, 'Reports').id
+    assert len(client.list_folder_children(reports)) == 2
+
+    async def run():
+        aclient = async_client(server, client)
+        await aclient.upload_file('q3.txt', 'third quarter\n', parent_id=reports)
+        await aclient.aclose()
+
+    asyncio.run(run())
+    assert sorted(f['name'] for f in client.list_folder_children(reports)) == ['q1.txt', 'q2.txt', 'q3.txt']
+
+def run_async(server, client, method, *args, **kwargs):
+    async def run():
+        aclient = async_client(server, client)
+        try:
+            return await getattr(aclient, method)(*args, **kwargs)
+        finally:
+            await aclient.aclose()
+    return asyncio.run(run())
+
+def failing(server, monkeypatch, handler, *errors):
+    """Makes the server's `handler` raise each of `errors` in turn, then behave normally."""
+    original = getattr(server, handler)
+    pending = list(errors)
+
+    def flaky(*args):
+        if pending:
+            raise pending.pop(0)
+        return original(*args)
+    monkeypatch.setattr(server, handler, flaky)
+
+def test_download_to_path_retries_server_errors(server, client, drive, tmp_path, monkeypatch):
+    monkeypatch.setattr(client.scheduler, 'backoff', lambda *args, **kwargs: 0.0)
+    failing(server, monkeypatch, '_media', DriveApiError(503, 'backendError', "Backend Error"),
+            DriveApiError(500, 'backendError', "Backend Error"))
+    dest = tmp_path / 'q1.txt'
+    result = run_async(server, client, 'download_to_path', find(drive, 'q1.txt').id, str(dest))
+    assert dest.read_bytes() == b'first quarter\n' and result['bytes'] == 14
+    assert not os.path.exists(f"{dest}.part")
+
+def test_download_to_path_resumes_a_partial_file(server, client, drive, tmp_path):
+    dest = tmp_path / 'q1.txt'
+    (tmp_path / 'q1.txt.part').write_bytes(b'first ')
+    run_async(server, client, 'download_to_path', find(drive, 'q1.txt').id, str(dest))
+    assert dest.read_bytes() == b'first quarter\n'
+
+def test_download_to_path_discards_a_part_file_longer_than_the_object(server, client, drive, tmp_path):
+    dest = tmp_path / 'q1.txt'
+    (tmp_path / 'q1.txt.part').write_bytes(b'an older, longer revision\n')
+    result = run_async(server, client, 'download_to_path', find(drive, 'q1.txt').id, str(dest))
+    assert dest.read_bytes() == b'first quarter\n' and result['bytes'] == 14
+
+def test_upload_from_local_resumes_a_saved_session(server, client, drive, tmp_path, monkeypatch):
+    monkeypatch.setattr(client_module, 'UPLOAD_SESSION_DIR', str(tmp_path / 'sessions'))
+    source = tmp_path / 'big.bin'
+    payload = os.urandom(2 * 256 * 1024 + 123)
+    source.write_bytes(payload)
+    ranges = []
+    upload_chunk = server._upload_chunk
+
+    def recording(params, headers, body):
+        ranges.append(headers.get('content-range'))
+        if len(ranges) == 2:
+            raise DriveApiError(400, 'badRequest', "Interrupted")
+        return upload_chunk(params, headers, body)
+    monkeypatch.setattr(server, '_upload_chunk', recording)
+
+    projects = find(drive, 'Projects').id
+    with pytest.raises(httpx.HTTPStatusError):
+        run_async(server, client, 'upload_from_local', str(source), parent_id=projects, chunk_size=256 * 1024)
+    assert len(os.listdir(tmp_path / 'sessions')) == 1
+
+    result = run_async(server, client, 'upload_from_local', str(source), parent_id=projects, chunk_size=256 * 1024)
+    assert drive.get(result['id']).data() == payload
+    # The second call asked for the committed range and sent only what was missing
+    assert ranges[2:] == [f"bytes */{len(payload)}", f"bytes {256 * 1024}-{512 * 1024 - 1}/{len(payload)}",
+                          f"bytes {512 * 1024}-{len(payload) - 1}/{len(payload)}"]
+    assert os.listdir(tmp_path / 'sessions') == []
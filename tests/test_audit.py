@@ -0,0 +1,72 @@
+import json
+import os
+
+import pytest
+
+from conftest import call
+from google_drive_forge import audit as audit_module
+from google_drive_forge.audit import AuditLogger
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Gives each record the next whole second from 1000, so time ranges are exact."""
+    ticks = iter(range(1000, 10 ** 6))
+    monkeypatch.setattr(audit_module.time, 'time', lambda: float(next(ticks)))
+
+def write(audit, count):
+    for n in range(count):
+        audit.log_event("COPY", f"record {n}", status="FAILURE" if n % 5 == 0 else "INFO")
+    audit.flush()
+
+def test_records_are_written_by_the_background_writer(tmp_path, clock):
+    audit = AuditLogger(str(tmp_path / "audit.log"))
+    write(audit, 3)
+    with open(audit.audit_log_path, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    assert [r["details"] for r in records] == ["record 0", "record 1", "record 2"]
+    audit.close()
+    assert audit._writer is None
+
+def test_rotation_keeps_the_configured_backups(tmp_path, clock):
+    audit = AuditLogger(str(tmp_path / "audit.log"), max_bytes=1000, backups=2)
+    write(audit, 40)
+    audit.close()
+    log = audit.audit_log_path
+    assert all(os.path.exists(p) for p in (log, f"{log}.1", f"{log}.2", f"{log}.1.idx"))
+    assert not os.path.exists(f"{log}.3")
+    assert os.path.getsize(f"{log}.1") < 1000 + 300
+    # The oldest records went with the dropped backup; the rest are returned in order
+    details = [r["details"] for r in audit.query(limit=100)]
+    assert details == [f"record {n}" for n in range(40 - len(details), 40)]
+
+def test_rotation_by_age(tmp_path, clock):
+    audit = AuditLogger(str(tmp_path / "audit.log"), rotate_interval=5, backups=5)
+    write(audit, 12)
+    audit.close()
+    assert [len(open(p).readlines()) for p in audit._log_files()] == [5, 5, 2]
+
+def test_query_spans_rotated_files_and_seeks_with_the_index(tmp_path, clock, monkeypatch):
+    monkeypatch.setattr(audit_module, "INDEX_INTERVAL_BYTES", 200)
+    audit = AuditLogger(str(tmp_path / "audit.log"), max_bytes=2000, backups=5)
+    write(audit, 60)
+    assert len(audit._log_files()) > 2
+    assert all(len(audit._read_index(audit._index_path(p))) > 1 for p in audit._log_files())
+
+    scanned = []
+    scan = audit._scan
+    monkeypatch.setattr(audit, "_scan", lambda path, offset, *args: scanned.append(offset) or scan(path, offset, *args))
+    records = audit.query(since=1010, until=1045)
+    assert [r["epoch"] for r in records] == [float(e) for e in range(1010, 1046)]
+    # The first file is entered part-way through, and files after `until` are not opened
+    assert scanned[0] > 0
+    assert len(scanned) < len(audit._log_files())
+
+    assert [r["epoch"] for r in audit.query(since=1010, until=1045, status="FAILURE")] == [1010.0, 1015.0, 1020.0,
+                                                                                           1025.0, 1030.0, 1035.0,
+                                                                                           1040.0, 1045.0]
+    assert [r["epoch"] for r in audit.query(limit=3)] == [1057.0, 1058.0, 1059.0]
+
+def test_audit_query_tool_reports_bad_arguments(tools):
+    assert call(tools, "audit_query", since="yesterday").startswith("Error: invalid time")
+    assert call(tools, "audit_query", limit=0) == "Error: limit must be at least 1, got 0."
+    assert call(tools, "audit_query", since="2024-05-01T09:00:00") == "No matching audit events."
@@ -0,0 +1,119 @@
+import os
+
+from conftest import find
+
+def test_list_folder_children(client, drive):
+    names = {f['name'] for f in client.list_folder_children(find(drive, 'Reports').id, limit=None)}
+    assert names == {'q1.txt', 'q2.txt'}
+
+def test_list_files_follows_pages(client, drive):
+    folder = find(drive, 'Reports')
+    for n in range(250):
+        drive.add(f"extra_{n}.txt", 'text/plain', [folder.id], content=b'x')
+    files = list(client.iter_files(f"'{folder.id}' in parents", fields="id, name", page_size=100))
+    assert len(files) == 252
+
+def test_resolve_path(client, drive):
+    assert client.find_and_heal_path('/Projects/Reports/q1.txt') == find(drive, 'q1.txt').id
+
+def test_resolve_path_heals_typos(client, drive):
+    result = client.resolve_path('/Projects/Reprots/q1.txt')
+    assert result['id'] == find(drive, 'q1.txt').id
+    assert result['healed']
+
+def test_download_file(client, drive):
+    assert client.download_file(find(drive, 'q1.txt').id) == b'first quarter\n'
+
+def test_download_range(client, drive):
+    assert client.download_range(find(drive, 'q2.txt').id, 7, 7) == b'quarter'
+
+def test_download_to_path(client, drive, tmp_path):
+    dest = tmp_path / 'q1.txt'
+    result = client.download_to_path(find(drive, 'q1.txt').id, str(dest))
+    assert dest.read_bytes() == b'first quarter\n'
+    assert result['bytes'] == 14
+
+def test_chunked_upload(client, drive, tmp_path):
+    source = tmp_path / 'big.bin'
+    payload = os.urandom(3 * 256 * 1024 + 123)
+    source.write_bytes(payload)
+    result = client.upload_from_local(str(source), parent_id=find(drive, 'Projects').id, chunk_size=256 * 1024)
+    assert drive.get(result['id']).data() == payload
+
+def test_upload_new_revision(client, drive, tmp_path):
+    source = tmp_path / 'q1.txt'
+    source.write_bytes(b'revised\n')
+    target = find(drive, 'q1.txt')
+    result = client.upload_from_local(str(source), file_id=target.id)
+    assert result['id'] == target.id
+    assert drive.get(target.id).data() == b'revised\n'
+
+def test_batched_metadata(client, drive):
+    for n in range(150):
+        drive.add(f"batch_{n}.txt", 'text/plain', content=b'x')
+    ids = [f.id for f in drive.files.values() if f.name.startswith('batch_')]
+    result = client.get_metadata_many(ids + ['missing-id'])
+    assert set(result['succeeded']) == set(ids)
+    assert list(result['failed']) == ['missing-id']
+
+def test_batched_trash(client, drive):
+    ids = [find(drive, 'q1.txt').id, find(drive, 'q2.txt').id]
+    result = client.trash_many(ids)
+    assert set(result['succeeded']) == set(ids)
+    assert all(drive.get(fid).trashed for fid in ids)
+
+def failing_batches(server, monkeypatch, *statuses):
+    """Makes the next batch requests fail as a whole with the given statuses."""
+    from google_drive_forge import batch
+    from google_drive_forge.fake_drive import DriveApiError
+    statuses = list(statuses)
+    answer = server._batch
+
+    def flaky(*args):
+        if statuses:
+            raise DriveApiError(statuses.pop(0), 'batchFailed', "Batch failed")
+        return answer(*args)
+    monkeypatch.setattr(server, '_batch', flaky)
+    monkeypatch.setattr(batch.time, 'sleep', lambda seconds: None)
+
+def test_failed_batch_is_retried(client, drive, server, monkeypatch):
+    ids = [find(drive, 'q1.txt').id, find(drive, 'q2.txt').id]
+    failing_batches(server, monkeypatch, 503)
+    result = client.get_metadata_many(ids, batch_size=1)
+    assert set(result['succeeded']) == set(ids)
+    assert result['failed'] == {}
+
+def test_failed_batch_keeps_other_chunks(client, drive, server, monkeypatch):
+    ids = [find(drive, 'q1.txt').id, find(drive, 'q2.txt').id]
+    failing_batches(server, monkeypatch, 400)
+    result = client.trash_many(ids, batch_size=1)
+    assert list(result['failed']) == ids[:1]
+    assert list(result['succeeded']) == ids[1:]
+    assert drive.get(ids[1]).trashed and not drive.get(ids[0]).trashed
+
+def test_resolve_path_finds_files_missing_from_a_cached_index(client, drive):
+    reports = find(drive, 'Reports')
+    drive.add('report-2025.txt', 'text/plain', [reports.id])
+    # Healing a typo caches the folder's name index
+    assert client.resolve_path('/Projects/Reports/report-2O25.txt')["healed"]
+    created = drive.add('report-2024.txt', 'text/plain', [reports.id])
+    result = client.resolve_path('/Projects/Reports/report-2024.txt')
+    assert result["id"] == created.id and result["healed"] == []
+
+def test_resolve_path_caches_prefixes(client, drive, server):
+    client.resolve_path('/Projects/Reports/q1.txt')
+    assert client.paths.path_cache.get(('Projects', 'Reports')) == (find(drive, 'Reports').id, find(drive, 'Projects').id)
+    before = server.requests
+    assert client.resolve_path('/Projects/Reports/q2.txt')["id"] == find(drive, 'q2.txt').id
+    # Only the last component is looked up
+    assert server.requests - before == 1
+
+def test_update_many_invalidates_source_and_destination_folders(client, drive):
+    projects, reports, q1 = find(drive, 'Projects'), find(drive, 'Reports'), find(drive, 'q1.txt')
+    # Healing caches the name indexes of both folders
+    assert client.resolve_path('/Projects/note')["healed"]
+    assert client.resolve_path('/Projects/Reports/q1.tx')["healed"]
+    client.update_many({q1.id: {'addParents': projects.id, 'removeParents': reports.id}})
+    assert client.resolve_path('/Projects/Reports/q1.txt', heal=False)["id"] is None
+    result = client.resolve_path('/Projects/q1.tx')
+    assert result["id"] == q1.id and result["path"] == '/Projects/q1.txt'
@@ -0,0 +1,93 @@
+import os
+
+import pytest
+
+from conftest import find
+from google_drive_forge.content_cache import ContentCache, content_version
+from google_drive_forge.fake_drive import fake_credentials
+from google_drive_forge.intelligent_client import IntelligentDriveClient
+from google_drive_forge.scheduler import RequestScheduler
+
+@pytest.fixture
+def cached_client(server, tmp_path):
+    return IntelligentDriveClient(creds=fake_credentials(), api_endpoint=server.url,
+                                  scheduler=RequestScheduler(quota_per_minute=10 ** 9),
+                                  content_cache=ContentCache(str(tmp_path / "content")))
+
+def test_entries_are_keyed_by_version_and_format(tmp_path):
+    cache = ContentCache(str(tmp_path))
+    cache.put("f1", "v1", b"binary")
+    cache.put("f1", "v1", b"as text", export_mime_type="text/plain")
+    assert cache.get("f1", "v1") == b"binary"
+    assert cache.get("f1", "v1", "text/plain") == b"as text"
+    assert cache.get("f1", "v2") is None
+    assert cache.get("f1", None) is None
+    assert cache.stats()["hits"] == 2 and cache.stats()["misses"] == 1
+
+def test_a_new_version_replaces_the_old_one(tmp_path):
+    cache = ContentCache(str(tmp_path))
+    cache.put("f1", "v1", b"old")
+    cache.put("f1", "v1", b"old text", export_mime_type="text/plain")
+    cache.put("f1", "v2", b"new")
+    assert cache.get("f1", "v1") is None and cache.get("f1", "v2") == b"new"
+    # Other formats are left alone
+    assert cache.get("f1", "v1", "text/plain") == b"old text"
+    assert len(os.listdir(tmp_path)) == 2
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ContentCache(str(tmp_path), max_bytes=30, max_entry_bytes=20)
+    cache.put("a", "v", b"x" * 10)
+    cache.put("b", "v", b"x" * 10)
+    cache.put("c", "v", b"x" * 10)
+    cache.get("a", "v")
+    cache.put("d", "v", b"x" * 10)
+    assert [f for f in "abcd" if cache.lookup(f, "v")] == ["a", "c", "d"]
+    assert cache.stats()["evictions"] == 1 and cache.stats()["bytes"] == 30
+    cache.put("e", "v", b"x" * 21)
+    assert cache.get("e", "v") is None
+
+def test_recency_survives_a_restart(tmp_path):
+    cache = ContentCache(str(tmp_path), max_bytes=30, max_entry_bytes=10)
+    for n, name in enumerate("abc"):
+        cache.put(name, "v", b"x" * 10)
+        os.utime(cache.lookup(name, "v"), (n, n))
+    os.utime(cache.lookup("a", "v"), (10, 10))
+    cache = ContentCache(str(tmp_path), max_bytes=20, max_entry_bytes=10)
+    assert [f for f in "abc" if cache.lookup(f, "v")] == ["a", "c"]
+
+def test_invalidate_drops_every_version_and_format(tmp_path):
+    cache = ContentCache(str(tmp_path))
+    cache.put("f1", "v1", b"binary")
+    cache.put("f1", "v1", b"as text", export_mime_type="text/plain")
+    cache.put("f10", "v1", b"other file")
+    cache.invalidate("f1")
+    assert cache.get("f1", "v1") is None and cache.get("f1", "v1", "text/plain") is None
+    assert cache.get("f10", "v1") == b"other file"
+    assert cache.stats()["entries"] == 1
+
+def test_content_version_prefers_the_checksum():
+    assert content_version({"md5Checksum": "abc", "modifiedTime": "2024-05-01T09:00:00Z"}) == "abc"
+    assert content_version({"modifiedTime": "2024-05-01T09:00:00Z"}) == "2024-05-01T09:00:00Z"
+    assert content_version({}) is None
+
+def test_rereading_an_unchanged_file_costs_one_metadata_call(cached_client, server, drive):
+    q1 = find(drive, 'q1.txt').id
+    assert cached_client.download_file(q1) == b'first quarter\n'
+    before = server.requests
+    assert cached_client.download_file(q1) == b'first quarter\n'
+    assert server.requests - before == 1
+
+def test_changed_content_misses_the_cache(cached_client, drive):
+    q1 = find(drive, 'q1.txt')
+    assert cached_client.download_file(q1.id) == b'first quarter\n'
+    q1.set_content(b'first quarter, revised\n')
+    assert cached_client.download_file(q1.id) == b'first quarter, revised\n'
+
+def test_a_new_modified_time_misses_the_cache_for_workspace_files(cached_client, drive):
+    notes = find(drive, 'notes')
+    assert cached_client.download_file(notes.id, export_mime_type='text/plain') == b'meeting notes\n'
+    notes.set_content(b'meeting notes, with actions\n')
+    notes.modified += 60
+    assert cached_client.download_file(notes.id, export_mime_type='text/plain') == b'meeting notes, with actions\n'
+    stats = cached_client.content_cache.stats()
+    assert stats["entries"] == 1 and stats["misses"] == 2
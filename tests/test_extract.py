@@ -0,0 +1,30 @@
+import pytest
+from mcp.server.fastmcp.exceptions import ToolError
+
+from conftest import call, find
+from google_drive_forge.extract import chunk_text
+
+def test_chunk_text_prefers_paragraphs():
+    text = "first paragraph\n\nsecond paragraph\n\nthird"
+    chunks = chunk_text(text, 25)
+    assert "".join(chunks) == text
+    assert chunks[0] == "first paragraph\n\n"
+
+@pytest.mark.parametrize("chunk_chars", [0, -1])
+def test_chunk_text_rejects_empty_chunks(chunk_chars):
+    with pytest.raises(ValueError):
+        chunk_text("some text", chunk_chars)
+
+def test_extract_text_from_doc(client, drive):
+    extracted = client.extract_text(find(drive, 'notes').id)
+    assert extracted["text"].strip() == "meeting notes"
+
+def test_read_text_pages_by_chunk(tools):
+    reply = call(tools, "read_text", path="/Projects/Reports/q1.txt", chunk_chars=6)
+    assert reply.startswith("[q1.txt: chunk 1 of 3]\n")
+    assert reply.endswith("[continue with chunk=2]")
+
+@pytest.mark.parametrize("arguments", [{"chunk_chars": 0}, {"chunk_chars": -5}, {"chunk": 0}])
+def test_read_text_rejects_bad_chunking(tools, arguments):
+    with pytest.raises(ToolError, match="chunk"):
+        call(tools, "read_text", path="/Projects/Reports/q1.txt", **arguments)
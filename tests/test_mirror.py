@@ -0,0 +1,94 @@
+from conftest import find
+from google_drive_forge.fake_drive import FOLDER_MIME_TYPE
+from google_drive_forge.mirror import MetadataMirror
+
+def crawled(client, drive, tmp_path, **kwargs):
+    mirror = MetadataMirror(str(tmp_path / "mirror"), **kwargs)
+    assert mirror.crawl(client.service, execute=client._execute) == len(drive.files) - 1
+    return mirror
+
+def names(files):
+    return sorted(f['name'] for f in files)
+
+def test_crawl_mirrors_the_tree(client, drive, tmp_path):
+    mirror = crawled(client, drive, tmp_path)
+    assert mirror.is_populated()
+    assert names(mirror.children(find(drive, 'Reports').id, None)) == ['q1.txt', 'q2.txt']
+    assert names(mirror.children('root', None)) == ['Projects']
+    assert mirror.find_by_name('notes', find(drive, 'Projects').id)[0]['id'] == find(drive, 'notes').id
+
+def test_limit_none_is_unbounded(client, drive, tmp_path):
+    reports = find(drive, 'Reports').id
+    for n in range(12):
+        drive.add(f"extra_{n}.txt", 'text/plain', [reports])
+    mirror = crawled(client, drive, tmp_path)
+    assert len(mirror.children(reports, None)) == 14
+    assert len(mirror.children(reports, 5)) == 5
+
+def test_sync_applies_adds_renames_and_trashes(client, drive, tmp_path):
+    mirror = crawled(client, drive, tmp_path)
+    reports = find(drive, 'Reports').id
+    drive.add('q3.txt', 'text/plain', [reports])
+    drive.update(find(drive, 'q1.txt').id, {'name': 'q1-final.txt'})
+    drive.update(find(drive, 'q2.txt').id, {'trashed': True})
+
+    assert mirror.sync(client.service, execute=client._execute) == 3
+    assert names(mirror.children(reports, None)) == ['q1-final.txt', 'q3.txt']
+    assert mirror.find_by_name('q1.txt', reports) == []
+    assert mirror._get_state("start_page_token") == str(len(drive.changes) + 1)
+    # Nothing new since the saved token
+    assert mirror.sync(client.service, execute=client._execute) == 0
+
+def test_refresh_syncs_only_when_due_or_stale(client, drive, tmp_path):
+    mirror = crawled(client, drive, tmp_path, sync_interval=3600)
+    drive.add('q3.txt', 'text/plain', [find(drive, 'Reports').id])
+    mirror.refresh(client.service, execute=client._execute)
+    assert mirror.find_by_name('q3.txt') == []
+    mirror.mark_stale()
+    mirror.refresh(client.service, execute=client._execute)
+    assert names(mirror.find_by_name('q3.txt')) == ['q3.txt']
+
+def test_sync_follows_change_pages(client, drive, tmp_path):
+    mirror = crawled(client, drive, tmp_path)
+    archive = drive.add('Archive', FOLDER_MIME_TYPE)
+    for n in range(1500):
+        drive.add(f"old_{n}.txt", 'text/plain', [archive.id], record_change=True)
+    assert mirror.sync(client.service, execute=client._execute) == 1501
+    assert len(mirror.children(archive.id, None)) == 1500
+
+def test_fts_query_quotes_operators():
+    from google_drive_forge.mirror import fts_query
+    assert fts_query('budget AND -draft (q1) "annual report" plan* say"hi') == \
+        '"budget" "AND" "-draft" "(q1)" "annual report" "plan"* "say""hi"'
+    assert fts_query('  "" * ') == ""
+
+def test_search_treats_user_input_literally(client, drive, tmp_path):
+    mirror = crawled(client, drive, tmp_path)
+    for text in ['q1 OR NOT', 'NEAR(q1 q2)', 'q1.txt"', '*', 'name:q1', '"unbalanced']:
+        mirror.search(text, 10)
+    assert names(mirror.search('q1.txt', 10)) == ['q1.txt']
+
+def test_folder_rename_reindexes_paths_below_it(client, drive, tmp_path):
+    mirror = crawled(client, drive, tmp_path)
+    drive.update(find(drive, 'Reports').id, {'name': 'Summaries'})
+    mirror.sync(client.service, execute=client._execute)
+    assert names(mirror.search('Summaries', 10)) == ['Summaries', 'q1.txt', 'q2.txt']
+    assert mirror.search('Reports', 10) == []
+
+def test_index_text_makes_content_searchable(client, drive, tmp_path):
+    mirror = crawled(client, drive, tmp_path)
+    q1 = mirror.get(find(drive, 'q1.txt').id)
+    mirror.index_text(q1['id'], "revenue grew in the first quarter", 'an older revision')
+    assert mirror.search('revenue', 10) == []
+    mirror.index_text(q1['id'], "revenue grew in the first quarter", q1['modifiedTime'])
+    assert names(mirror.search('revenue', 10)) == ['q1.txt']
+    assert names(mirror.search('reven*', 10)) == ['q1.txt']
+
+def test_search_ranks_name_over_path_over_content(client, drive, tmp_path):
+    folder = drive.add('budget', FOLDER_MIME_TYPE)
+    drive.add('plan.txt', 'text/plain', [folder.id])
+    drive.add('minutes.txt', 'text/plain')
+    mirror = crawled(client, drive, tmp_path)
+    minutes = mirror.get(find(drive, 'minutes.txt').id)
+    mirror.index_text(minutes['id'], "we discussed the budget", minutes['modifiedTime'])
+    assert [f['name'] for f in mirror.search('budget', 10)] == ['budget', 'plan.txt', 'minutes.txt']
@@ -0,0 +1,50 @@
+import json
+
+from conftest import call, find
+from google_drive_forge.fake_drive import FOLDER_MIME_TYPE
+
+def test_move_files_with_glob(client, drive):
+    source, dest = find(drive, 'Reports'), find(drive, 'Projects')
+    drive.add('chart.png', 'image/png', [source.id], content=b'png')
+    result = client.move_files(source.id, dest.id, name_glob='*.txt')
+    assert result['moved'] == 2
+    assert drive.get(find(drive, 'q1.txt').id).parents == [dest.id]
+    assert drive.get(find(drive, 'chart.png').id).parents == [source.id]
+
+def test_move_files_dry_run_changes_nothing(client, drive):
+    source, dest = find(drive, 'Reports'), find(drive, 'Projects')
+    result = client.move_files(source.id, dest.id, dry_run=True)
+    assert sorted(f['name'] for f in result['plan']) == ['q1.txt', 'q2.txt']
+    assert drive.get(find(drive, 'q1.txt').id).parents == [source.id]
+
+def test_move_files_tool_never_heals_destination(tools, drive):
+    drive.add('Archive 2025', FOLDER_MIME_TYPE, [find(drive, 'Projects').id])
+    reply = call(tools, "move_files", source="/Projects/Reports", destination="/Projects/Archive 2026")
+    assert reply.startswith("Error: Folder '/Projects/Archive 2026' does not exist")
+    assert "Archive 2025" in reply
+    assert drive.get(find(drive, 'q1.txt').id).parents == [find(drive, 'Reports').id]
+
+def test_move_files_tool_creates_destination(tools, drive):
+    drive.add('Archive 2025', FOLDER_MIME_TYPE, [find(drive, 'Projects').id])
+    reply = json.loads(call(tools, "move_files", source="/Projects/Reports",
+                            destination="/Projects/Archive 2026/Q1", create_destination=True))
+    assert reply['moved'] == 2
+    created = find(drive, 'Q1')
+    assert drive.path_of(created.id) == 'Projects/Archive 2026/Q1'
+    assert reply['destination'] == created.id
+
+def test_move_files_from_root_keeps_other_parents(client, drive):
+    reports, dest = find(drive, 'Reports'), drive.add('Inbox', FOLDER_MIME_TYPE)
+    shared = drive.add('shared.txt', 'text/plain', ['root', reports.id], content=b'x')
+    result = client.move_files('root', dest.id, name_glob='shared.txt')
+    assert result['moved'] == 1
+    assert sorted(drive.get(shared.id).parents) == sorted([reports.id, dest.id])
+
+def test_move_files_counts_pool_calls_against_the_tool(client, drive):
+    from google_drive_forge.metrics import METRICS, instrument_tool
+    source, dest = find(drive, 'Reports'), find(drive, 'Projects')
+    METRICS.reset()
+    instrument_tool(client.move_files, name="move_files")(source.id, dest.id)
+    stats = METRICS.snapshot()
+    assert stats["api"]["batch"]["count"] >= 1
+    assert stats["tools"]["move_files"]["api_calls"] == sum(m["count"] for m in stats["api"].values())
@@ -0,0 +1,31 @@
+from google_drive_forge.name_index import NameIndex, normalize
+
+def index(*names):
+    return NameIndex([{"id": f"id-{n}", "name": name} for n, name in enumerate(names)])
+
+def test_normalize_folds_case_and_separators():
+    assert normalize("Budget__2026-Final.xlsx") == "budget 2026 final xlsx"
+
+def test_suggest_ranks_closest_first():
+    ranked = index("Budget_2026.xlsx", "Invoices", "Budget notes").suggest("budget 2026", k=2)
+    assert [c["name"] for _, c in ranked] == ["Budget_2026.xlsx", "Budget notes"]
+    assert ranked[0][0] > ranked[1][0]
+
+def test_heal_fixes_a_typo():
+    match, ranked = index("Projects", "Photos", "Invoices").heal("Projcts")
+    assert match["name"] == "Projects"
+    assert ranked[0][1] is match
+
+def test_heal_matches_names_without_extension():
+    match, _ = index("Budget_2026.xlsx", "Invoices").heal("budget")
+    assert match["name"] == "Budget_2026.xlsx"
+
+def test_heal_rejects_ambiguous_candidates():
+    # Both are one edit away, so neither clears MIN_MARGIN over the other
+    match, ranked = index("report-2025.txt", "report-2023.txt").heal("report-2024.txt")
+    assert match is None
+    assert {c["name"] for _, c in ranked} == {"report-2025.txt", "report-2023.txt"}
+
+def test_heal_rejects_weak_candidates():
+    match, _ = index("Invoices", "Photos").heal("quarterly budget")
+    assert match is None
@@ -0,0 +1,40 @@
+import asyncio
+
+import pytest
+from mcp.server.fastmcp.exceptions import ToolError
+
+from conftest import call, find
+from google_drive_forge.paging import text_page
+
+def test_smart_read_pages_by_lines(tools, drive):
+    drive.add('lines.txt', 'text/plain', [find(drive, 'Reports').id], content=b'one\ntwo\nthree\n')
+    reply = call(tools, "smart_read", path="/Projects/Reports/lines.txt", max_lines=2)
+    assert reply.startswith("one\ntwo\n")
+    assert reply.endswith("continue with offset=8]")
+
+@pytest.mark.parametrize("arguments", [{"offset": -1}, {"length": 0}, {"length": -10}, {"max_lines": 0}, {"max_lines": -2}])
+def test_smart_read_rejects_bad_pages(tools, arguments):
+    name = next(iter(arguments))
+    with pytest.raises(ToolError, match=name):
+        call(tools, "smart_read", path="/Projects/Reports/q1.txt", **arguments)
+
+def test_content_range_resource_rejects_negative_offset(client, drive):
+    from mcp.server.fastmcp import FastMCP
+    from google_drive_forge.resources import register_resources
+
+    mcp = FastMCP("test")
+    register_resources(mcp, client)
+    with pytest.raises(ValueError, match="offset must be 0 or more"):
+        asyncio.run(mcp.read_resource(f"gdrive://{find(drive, 'q1.txt').id}/content/-1/10"))
+
+def test_text_page_never_stalls_inside_a_character():
+    assert text_page('é'.encode(), 10, at_end=False) == ('é', 12)
+    with pytest.raises(ValueError, match="UTF-8 character"):
+        text_page(b'\xe2', 10)
+    with pytest.raises(ValueError, match="UTF-8 character"):
+        text_page('€'.encode()[:2], 0, max_lines=1)
+
+def test_smart_read_reports_a_length_shorter_than_a_character(tools, drive):
+    drive.add('euro.txt', 'text/plain', [find(drive, 'Reports').id], content='€ rate\n'.encode())
+    reply = call(tools, "smart_read", path="/Projects/Reports/euro.txt", length=2)
+    assert reply.startswith("Error reading file") and "read at least 4 bytes" in reply
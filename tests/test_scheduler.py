@@ -0,0 +1,123 @@
+import time
+
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+
+from google_drive_forge.metrics import METRICS
+from google_drive_forge.scheduler import RequestScheduler
+
+class Clock:
+    """Stands in for time.monotonic and time.sleep: sleeping advances the clock instantly."""
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.slept.append(seconds)
+        self.now += seconds
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(time, 'monotonic', clock.monotonic)
+    monkeypatch.setattr(time, 'sleep', clock.sleep)
+    return clock
+
+def http_error(status: int, content: bytes = b'{}', **headers) -> HttpError:
+    return HttpError(httplib2.Response({'status': status, **headers}), content)
+
+RATE_LIMITED = b'{"error": {"errors": [{"reason": "userRateLimitExceeded"}]}}'
+
+def test_bucket_allows_a_burst_then_paces(clock):
+    scheduler = RequestScheduler(quota_per_minute=60, burst=2)
+    scheduler.acquire()
+    scheduler.acquire()
+    assert clock.slept == []
+    scheduler.acquire()
+    assert clock.slept == [pytest.approx(1.0)]
+    clock.now += 5
+    scheduler.acquire()
+    assert len(clock.slept) == 1
+
+def test_rate_halves_on_throttle_and_recovers_additively(clock):
+    scheduler = RequestScheduler(quota_per_minute=600, min_rate=2)
+    scheduler.record_throttle()
+    assert scheduler.rate == pytest.approx(5.0)
+    scheduler.record_success()
+    assert scheduler.rate == pytest.approx(5.1)
+    for _ in range(5):
+        scheduler.record_throttle()
+    assert scheduler.rate == 2
+    for _ in range(200):
+        scheduler.record_success()
+    assert scheduler.rate == 10
+
+def test_retry_after_pauses_every_caller(clock):
+    scheduler = RequestScheduler(quota_per_minute=6000)
+    assert scheduler.retry_delay(http_error(429, **{'retry-after': '7'}), 1) == 7
+    scheduler.acquire()
+    assert clock.slept == [pytest.approx(7.0)]
+    assert scheduler.stats()["throttled"] == 1
+
+@pytest.mark.parametrize("error, retried, throttled", [
+    (http_error(503), True, False),
+    (http_error(429), True, True),
+    (http_error(403, RATE_LIMITED), True, True),
+    (http_error(403, b'{"error": {"errors": [{"reason": "insufficientPermissions"}]}}'), False, False),
+    (http_error(404), False, False),
+    (ConnectionResetError(), True, False),
+    (httplib2.ServerNotFoundError(), True, False),
+    (httplib2.RedirectMissingLocation("no location", None, None), False, False),
+])
+def test_retry_classification(clock, error, retried, throttled):
+    scheduler = RequestScheduler()
+    delay = scheduler.retry_delay(error, 1)
+    assert (delay is not None) == retried
+    assert scheduler.throttled == (1 if throttled else 0)
+
+def test_call_retries_transient_errors(clock):
+    scheduler = RequestScheduler(quota_per_minute=6000)
+    outcomes = [http_error(503), ConnectionResetError(), "done"]
+
+    def flaky():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    assert scheduler.call(flaky) == "done"
+    assert scheduler.retries == 2
+    # Exponential backoff with up to a second of jitter
+    assert 2 <= clock.slept[0] < 3 and 4 <= clock.slept[1] < 5
+
+def test_call_fails_fast_and_gives_up(clock):
+    scheduler = RequestScheduler(quota_per_minute=6000, max_retries=2)
+    calls = []
+
+    def fail(error):
+        def func():
+            calls.append(error)
+            raise error
+        return func
+
+    with pytest.raises(HttpError):
+        scheduler.call(fail(http_error(404)))
+    assert len(calls) == 1
+    with pytest.raises(HttpError):
+        scheduler.call(fail(http_error(500)))
+    assert len(calls) == 1 + 3
+
+def test_execute_records_the_drive_method(clock):
+    class Request:
+        methodId = "drive.files.get"
+
+        def execute(self):
+            return {"id": "abc"}
+
+    METRICS.reset()
+    assert RequestScheduler().execute(Request()) == {"id": "abc"}
+    assert METRICS.snapshot()["api"]["files.get"]["count"] == 1
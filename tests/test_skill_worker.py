@@ -0,0 +1,16 @@
+import sys
+
+from google_drive_forge.skill_worker import run_script
+
+def test_run_script_evicts_only_skill_modules(tmp_path):
+    skill = tmp_path / "skill"
+    skill.mkdir()
+    (skill / "skill_helper.py").write_text("VALUE = 42\n")
+    (skill / "script.py").write_text("import colorsys, skill_helper\nprint(skill_helper.VALUE)\n")
+    sys.modules.pop("colorsys", None)
+    events = []
+
+    assert run_script(str(skill / "script.py"), [], events.append) == 0
+    assert events == [{"event": "stdout", "data": "42\n"}]
+    assert "skill_helper" not in sys.modules
+    assert "colorsys" in sys.modules
@@ -0,0 +1,67 @@
+import json
+import os
+import sys
+
+import pytest
+
+from google_drive_forge.executor import ScriptExecutor
+from google_drive_forge.skill_loader import SkillLoader
+
+def write_skill(skills_dir, name, description, code="print('hi')\n"):
+    folder = skills_dir / name
+    folder.mkdir(parents=True, exist_ok=True)
+    (folder / "SKILL.md").write_text(f"---\nname: {name}\ndescription: {description}\n---\n")
+    (folder / "script.py").write_text(code)
+    return folder
+
+def names(loader):
+    return [s.name for s in loader.discover_skills()]
+
+def test_manifest_survives_a_restart_without_reparsing(tmp_path, monkeypatch):
+    write_skill(tmp_path, "tally", "Counts files")
+    write_skill(tmp_path, "prune", "Trashes old files")
+    assert names(SkillLoader(str(tmp_path))) == ["prune", "tally"]
+    with open(tmp_path / ".index" / "manifest.json") as f:
+        assert sorted(json.load(f)["skills"]) == ["prune", "tally"]
+
+    loader = SkillLoader(str(tmp_path))
+    monkeypatch.setattr(loader, "_parse_skill_md", lambda *args: pytest.fail("SKILL.md re-parsed"))
+    assert [s.description for s in loader.discover_skills()] == ["Trashes old files", "Counts files"]
+
+def test_added_and_removed_skills_are_picked_up(tmp_path):
+    loader = SkillLoader(str(tmp_path))
+    write_skill(tmp_path, "tally", "Counts files")
+    write_skill(tmp_path, "prune", "Trashes old files")
+    assert names(loader) == ["prune", "tally"]
+    (tmp_path / "prune" / "SKILL.md").unlink()
+    (tmp_path / "prune" / "script.py").unlink()
+    (tmp_path / "prune").rmdir()
+    assert names(loader) == ["tally"]
+
+def test_periodic_rescan_picks_up_in_place_edits(tmp_path):
+    folder = write_skill(tmp_path, "tally", "Counts files")
+    loader = SkillLoader(str(tmp_path), rescan_interval=0)
+    assert loader.get_skill("tally").description == "Counts files"
+    (folder / "SKILL.md").write_text("---\nname: tally\ndescription: Counts folders\n---\n")
+    os.utime(folder / "SKILL.md", ns=(1, 1))
+    assert loader.get_skill("tally").description == "Counts folders"
+
+def test_save_skill_updates_the_index_and_manifest(tmp_path):
+    loader = SkillLoader(str(tmp_path))
+    with pytest.raises(ValueError, match="needs a description"):
+        loader.save_skill("tally", "print(1)\n")
+    meta = loader.save_skill("tally", "print(1)\n", description="Counts files")
+    assert meta.script_path == str(tmp_path / "tally" / "script.py")
+
+    loader.save_skill("tally", "print(2)\n")
+    assert (tmp_path / "tally" / "script.py").read_text() == "print(2)\n"
+    assert loader.get_skill("tally").description == "Counts files"
+    assert names(SkillLoader(str(tmp_path))) == ["tally"]
+
+def test_run_skill_falls_back_to_script_without_frontmatter(tmp_path):
+    folder = tmp_path / "legacy"
+    folder.mkdir()
+    (folder / "script.py").write_text("print('legacy ran')\n")
+    executor = ScriptExecutor(sys.executable, str(tmp_path), loader=SkillLoader(str(tmp_path)), workers=0)
+    assert "legacy ran" in executor.run_skill("legacy")
+    assert executor.run_skill("missing").startswith("Error: Skill script not found")
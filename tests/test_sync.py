@@ -0,0 +1,131 @@
+import os
+import json
+
+import pytest
+
+from conftest import call, find
+from google_drive_forge.transfer import TransferEngine, SYNC_STATE_FILE
+
+@pytest.fixture
+def engine(client):
+    return TransferEngine(client, workers=4)
+
+def local_files(root):
+    found = {}
+    for current, _, names in os.walk(root):
+        for name in names:
+            if name != SYNC_STATE_FILE:
+                path = os.path.join(current, name)
+                found[os.path.relpath(path, root).replace(os.sep, '/')] = open(path, 'rb').read()
+    return found
+
+def test_pull_then_nothing_to_do(engine, drive, tmp_path):
+    projects = find(drive, 'Projects').id
+    summary = engine.sync_folder(projects, str(tmp_path), direction='pull')
+    assert summary['downloaded'] == 3
+    assert local_files(tmp_path)['Reports/q1.txt'] == b'first quarter\n'
+    again = engine.sync_folder(projects, str(tmp_path), direction='pull')
+    assert (again['downloaded'], again['unchanged']) == (0, 3)
+
+def test_pull_applies_remote_changes(engine, drive, tmp_path):
+    projects = find(drive, 'Projects')
+    engine.sync_folder(projects.id, str(tmp_path))
+    q1, q2 = find(drive, 'q1.txt'), find(drive, 'q2.txt')
+    drive.update(q1.id, {'name': 'january.txt'}, add_parents=[projects.id], remove_parents=[find(drive, 'Reports').id])
+    q2.set_content(b'revised\n')
+    drive.update(find(drive, 'notes').id, {'trashed': True})
+    summary = engine.sync_folder(projects.id, str(tmp_path))
+    assert (summary['renamed_local'], summary['downloaded'], summary['deleted_local']) == (1, 1, 1)
+    assert local_files(tmp_path) == {'january.txt': b'first quarter\n', 'Reports/q2.txt': b'revised\n'}
+
+def test_push_applies_local_changes(engine, drive, tmp_path):
+    projects = find(drive, 'Projects')
+    engine.sync_folder(projects.id, str(tmp_path))
+    (tmp_path / 'Reports' / 'q2.txt').write_bytes(b'edited locally\n')
+    os.rename(tmp_path / 'Reports' / 'q1.txt', tmp_path / 'q1-renamed.txt')
+    (tmp_path / 'New').mkdir()
+    (tmp_path / 'New' / 'todo.txt').write_bytes(b'todo\n')
+    summary = engine.sync_folder(projects.id, str(tmp_path))
+    assert (summary['uploaded'], summary['renamed_remote'], summary['failed']) == (2, 1, {})
+    q1 = drive.get(find(drive, 'q1-renamed.txt').id)
+    assert q1.parents == [projects.id]
+    assert find(drive, 'q2.txt').data() == b'edited locally\n'
+    assert drive.path_of(find(drive, 'todo.txt').id) == 'Projects/New/todo.txt'
+    # Edits become new revisions, not copies
+    assert sum(1 for f in drive.files.values() if f.name == 'q2.txt') == 1
+
+def test_local_delete_trashes_remote(engine, drive, tmp_path):
+    projects = find(drive, 'Projects')
+    engine.sync_folder(projects.id, str(tmp_path))
+    reports = find(drive, 'Reports')
+    for name in os.listdir(tmp_path / 'Reports'):
+        os.remove(tmp_path / 'Reports' / name)
+    os.rmdir(tmp_path / 'Reports')
+    summary = engine.sync_folder(projects.id, str(tmp_path))
+    assert summary['trashed_remote'] == 1
+    assert drive.get(reports.id).trashed
+
+def test_failed_trashes_are_not_counted(engine, client, drive, tmp_path, monkeypatch):
+    projects = find(drive, 'Projects')
+    engine.sync_folder(projects.id, str(tmp_path))
+    os.remove(tmp_path / 'Reports' / 'q1.txt')
+    os.remove(tmp_path / 'Reports' / 'q2.txt')
+    trash_many = client.trash_many
+
+    def trash_first(file_ids, **kwargs):
+        result = trash_many(file_ids[:1], **kwargs)
+        result["failed"].update({file_id: "Rate limited" for file_id in file_ids[1:]})
+        return result
+    monkeypatch.setattr(client, 'trash_many', trash_first)
+    summary = engine.sync_folder(projects.id, str(tmp_path))
+    assert summary['trashed_remote'] == 1 and len(summary['failed']) == 1
+
+def test_folder_creation_failure_is_recorded(engine, client, drive, tmp_path, monkeypatch):
+    projects = find(drive, 'Projects')
+    engine.sync_folder(projects.id, str(tmp_path))
+    drive.add('q3.txt', 'text/plain', [find(drive, 'Reports').id], content=b'third quarter\n')
+    (tmp_path / 'Reports' / 'q2.txt').write_bytes(b'edited locally\n')
+    (tmp_path / 'New' / 'Deeper').mkdir(parents=True)
+    (tmp_path / 'New' / 'todo.txt').write_bytes(b'todo\n')
+    (tmp_path / 'New' / 'Deeper' / 'later.txt').write_bytes(b'later\n')
+    create_folder = client.create_folder
+
+    def refuse(name, parent_id='root'):
+        raise RuntimeError("Drive said no")
+    monkeypatch.setattr(client, 'create_folder', refuse)
+    summary = engine.sync_folder(projects.id, str(tmp_path))
+    assert (summary['downloaded'], summary['uploaded']) == (1, 1)
+    assert summary['failed'] == {
+        'New': "Drive said no",
+        'New/todo.txt': "Could not create folder 'New': Drive said no",
+        'New/Deeper/later.txt': "Could not create folder 'New/Deeper': Drive said no",
+    }
+
+    # The state file kept what did transfer, so only the new folder's files are left
+    monkeypatch.setattr(client, 'create_folder', create_folder)
+    summary = engine.sync_folder(projects.id, str(tmp_path))
+    assert (summary['downloaded'], summary['uploaded'], summary['failed']) == (0, 2, {})
+    assert drive.path_of(find(drive, 'later.txt').id) == 'Projects/New/Deeper/later.txt'
+
+def test_conflicts_are_left_alone(engine, drive, tmp_path):
+    projects = find(drive, 'Projects')
+    engine.sync_folder(projects.id, str(tmp_path))
+    find(drive, 'q1.txt').set_content(b'remote edit\n')
+    (tmp_path / 'Reports' / 'q1.txt').write_bytes(b'local edit\n')
+    summary = engine.sync_folder(projects.id, str(tmp_path))
+    assert summary['conflicts'] == ['Reports/q1.txt']
+    assert (tmp_path / 'Reports' / 'q1.txt').read_bytes() == b'local edit\n'
+    assert find(drive, 'q1.txt').data() == b'remote edit\n'
+
+def test_sync_tool_never_heals_target(tools, client, tmp_path):
+    assert client.resolve_path('/Projets')['healed']
+    local = tmp_path / 'local'
+    reply = call(tools, "sync_folder", folder="/Projets", local_path=str(local), direction="push")
+    assert reply.startswith("Error: Folder '/Projets' does not exist")
+    assert not local.exists()
+
+def test_sync_tool_dry_run(tools, tmp_path):
+    local = tmp_path / 'local'
+    reply = json.loads(call(tools, "sync_folder", folder="/Projects", local_path=str(local), dry_run=True))
+    assert sorted(reply['plan']['download']) == ['Reports/q1.txt', 'Reports/q2.txt', 'notes.md']
+    assert not local.exists()